@@ -0,0 +1 @@
+"""Benchmarks of the data stream serializer, run with `python -m benchmarks`."""
@@ -0,0 +1,96 @@
+"""
+Benchmark of the `str` serializer against its bytes-native counterpart, per kind of part.
+
+Every case is a stream dominated by one kind of part. The `str` serializer is measured including
+the UTF-8 encode the ASGI server performs on every frame, which is the cost the bytes serializer
+removes.
+
+Run with:
+
+    python -m benchmarks.bench_frame_encoding
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncGenerator, Callable
+
+from langchain_core.messages import AIMessageChunk
+
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    serialize_to_data_stream_protocol,
+    serialize_to_data_stream_protocol_bytes,
+)
+
+RUN_ID = "run-23a4d42d-cd75-4569-82d7-6893b9ad3820"
+
+
+def _text(text: str, count: int) -> list[AIMessageChunk]:
+    return [AIMessageChunk(content=text, id=RUN_ID) for _ in range(count)]
+
+
+def _steps(count: int) -> list[AIMessageChunk]:
+    return [
+        AIMessageChunk(content="", id=f"{RUN_ID}-{i}", response_metadata={"finish_reason": "stop"})
+        for i in range(count)
+    ]
+
+
+def _tool_calls(count: int) -> list[AIMessageChunk]:
+    chunks = []
+    for i in range(count):
+        for name, args in [("StartDriving", '{"car_name": "BM'), (None, 'W"}')]:
+            chunks.append(
+                AIMessageChunk(
+                    content="",
+                    id=RUN_ID,
+                    tool_call_chunks=[
+                        {
+                            "name": name,
+                            "args": args,
+                            "id": f"call_{i}" if name else None,
+                            "index": i,
+                            "type": "tool_call_chunk",
+                        }
+                    ],
+                )
+            )
+    return chunks
+
+
+CASES: dict[str, Callable[[int], list[AIMessageChunk]]] = {
+    "text (token)": lambda count: _text(" outstanding", count),
+    "text (unicode)": lambda count: _text(" héllo wörld 🚗", count),
+    "text (paragraph)": lambda count: _text("The quick brown fox jumps. " * 20, count),
+    "tool calls": _tool_calls,
+    "steps": _steps,
+}
+
+
+async def _frames_per_second(
+    serialize: Callable[[AsyncGenerator[AIMessageChunk, None]], AsyncGenerator[Any, None]],
+    chunks: list[AIMessageChunk],
+) -> float:
+    async def chunk_generator():
+        for chunk in chunks:
+            yield chunk
+
+    frames = 0
+    start = time.perf_counter()
+    async for frame in serialize(chunk_generator()):
+        if isinstance(frame, str):
+            frame.encode()
+        frames += 1
+    return frames / (time.perf_counter() - start)
+
+
+async def bench_parts(count: int = 20_000) -> None:
+    print(f"{'stream':<20}{'str + encode':>16}{'bytes':>16}{'speedup':>10}")
+    for label, build in CASES.items():
+        chunks = build(count)
+        str_fps = await _frames_per_second(serialize_to_data_stream_protocol, chunks)
+        bytes_fps = await _frames_per_second(serialize_to_data_stream_protocol_bytes, chunks)
+        print(f"{label:<20}{str_fps:>14,.0f}/s{bytes_fps:>14,.0f}/s{bytes_fps / str_fps:>9.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(bench_parts())
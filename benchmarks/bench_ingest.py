@@ -0,0 +1,126 @@
+"""
+Benchmark of ingesting a 10 MB `ChatMessages` request body.
+
+The body is a long conversation with tool results and file parts. Full pydantic validation of
+every message is compared with `parse_chat_messages`, which only validates the newest messages,
+alone and followed by a `MessageConverter` that has seen the history on the previous turn (against
+full validation followed by a plain conversion). The previous body is an exact prefix of the
+current one, so the converter only converts the last turn, and the cost of recognizing the other
+messages (hashing their JSON) is reported on its own.
+
+Run with:
+
+    python -m benchmarks.bench_ingest
+"""
+
+import base64
+import json
+import random
+import time
+from typing import Any, Callable
+
+from langchain_vercel_adapters.messages.convert import MessageConverter, convert_messages
+from langchain_vercel_adapters.messages.ingest import parse_chat_messages
+from langchain_vercel_adapters.types import ChatMessages
+
+BODY_SIZE = 10 * 1024 * 1024
+TURNS = 400
+
+
+def _turn(i: int, file_size: int) -> list[dict[str, Any]]:
+    # seeded per turn, every body is an exact prefix of the bodies of later turns
+    rng = random.Random(i)
+    words = ["lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing"]
+    text = " ".join(rng.choice(words) for _ in range(60))
+    user_parts: list[dict[str, Any]] = [{"type": "text", "text": text}]
+    if i % 4 == 0:
+        data = base64.b64encode(rng.randbytes(file_size)).decode()
+        user_parts.append({"type": "file", "mimeType": "application/pdf", "data": data})
+    return [
+        {"id": f"user-{i}", "role": "user", "content": text, "parts": user_parts},
+        {
+            "id": f"assistant-{i}",
+            "role": "assistant",
+            "content": text,
+            "parts": [
+                {"type": "step-start"},
+                {
+                    "type": "tool-invocation",
+                    "toolInvocation": {
+                        "state": "result",
+                        "step": 0,
+                        "toolCallId": f"call_{i}",
+                        "toolName": "Search",
+                        "args": {"query": text[:40]},
+                        "result": [{"title": w, "snippet": text} for w in words],
+                    },
+                },
+                {"type": "step-start"},
+                {"type": "text", "text": text},
+            ],
+        },
+    ]
+
+
+# a file part every 4 turns makes up most of the body
+FILE_SIZE = BODY_SIZE * 3 // 4 // (TURNS // 4) * 3 // 4
+
+
+def _body(turns: int) -> bytes:
+    messages = [message for i in range(turns) for message in _turn(i, FILE_SIZE)]
+    return json.dumps({"id": "chat-1", "messages": messages}).encode()
+
+
+def _timed(fn: Callable[[], Any], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _next_turn(previous: bytes, body: bytes, repeat: int = 5) -> tuple[float, float, int]:
+    """
+    Best seconds to parse and convert `body` with a converter that has seen `previous`, best
+    seconds of the conversion alone, and the number of messages that missed the cache.
+    """
+    best = best_convert = float("inf")
+    misses = 0
+    for _ in range(repeat):
+        converter = MessageConverter()
+        converter.convert(parse_chat_messages(previous).messages)
+        seen = len(converter)
+        start = time.perf_counter()
+        messages = parse_chat_messages(body).messages
+        parsed = time.perf_counter()
+        converter.convert(messages)
+        end = time.perf_counter()
+        best = min(best, end - start)
+        best_convert = min(best_convert, end - parsed)
+        misses = len(converter) - seen
+    return best, best_convert, misses
+
+
+def main() -> None:
+    previous = _body(TURNS - 1)
+    body = _body(TURNS)
+
+    full = _timed(lambda: ChatMessages.model_validate_json(body))
+    lazy = _timed(lambda: parse_chat_messages(body))
+    full_convert = _timed(lambda: convert_messages(ChatMessages.model_validate_json(body).messages))
+    lazy_convert, hits, misses = _next_turn(previous, body)
+
+    print(f"{len(body) / 1024 / 1024:.1f} MiB body, {TURNS * 2} messages")
+    print(f"{'full validation':<36}{full * 1000:>10.1f} ms")
+    print(f"{'parse_chat_messages':<36}{lazy * 1000:>10.1f} ms{full / lazy:>9.2f}x")
+    print(f"{'full validation + convert_messages':<36}{full_convert * 1000:>10.1f} ms")
+    print(
+        f"{'parse_chat_messages + converter':<36}{lazy_convert * 1000:>10.1f} ms"
+        f"{full_convert / lazy_convert:>9.2f}x"
+    )
+    print(f"{f'  of which converter ({misses} misses)':<36}{hits * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
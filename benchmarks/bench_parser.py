@@ -0,0 +1,78 @@
+"""
+Benchmark of the data stream parser against the bytes serializer, over the suite's scenarios.
+
+Every scenario is serialized once, then the resulting stream is parsed in chunks of a typical
+network read size and of a size that splits most parts. Parsing only locates the parts, decoding
+and validating their payloads is reported separately since it is opt-in per part.
+
+Run with:
+
+    python -m benchmarks.bench_parser
+"""
+
+import asyncio
+import time
+from typing import Any, Callable
+
+from benchmarks.streams import SCENARIOS, SIZES
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    serialize_to_data_stream_protocol_bytes,
+)
+from langchain_vercel_adapters.stream_protocol.parser import DataStreamParser
+
+READ_SIZES = (16 * 1024, 64)
+
+
+async def _serialize(scenario: str) -> tuple[bytes, float]:
+    chunks = SCENARIOS[scenario](SIZES["medium"], 0)
+
+    async def chunk_generator():
+        for chunk in chunks:
+            yield chunk
+
+    start = time.perf_counter()
+    stream = b"".join([x async for x in serialize_to_data_stream_protocol_bytes(chunk_generator())])
+    return stream, time.perf_counter() - start
+
+
+def _timed(fn: Callable[[], Any]) -> float:
+    return min(_once(fn) for _ in range(5))
+
+
+def _once(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _parse(reads: list[bytes], decode: bool) -> int:
+    parser = DataStreamParser()
+    parts = 0
+    for read in reads:
+        for part in parser.feed(read):
+            if decode:
+                part.parse()
+            parts += 1
+    parser.close()
+    return parts
+
+
+async def main() -> None:
+    print(f"{'scenario':<28}{'read':>8}{'write':>14}{'parse':>14}{'parse + decode':>18}")
+    for scenario in SCENARIOS:
+        stream, write_seconds = await _serialize(scenario)
+        for read_size in READ_SIZES:
+            reads = [stream[i : i + read_size] for i in range(0, len(stream), read_size)]
+            parts = _parse(reads, decode=False)
+            parse_seconds = _timed(lambda: _parse(reads, decode=False))  # noqa: B023
+            decode_seconds = _timed(lambda: _parse(reads, decode=True))  # noqa: B023
+            print(
+                f"{scenario:<28}{read_size:>8}"
+                f"{parts / write_seconds:>12,.0f}/s"
+                f"{parts / parse_seconds:>12,.0f}/s"
+                f"{parts / decode_seconds:>16,.0f}/s"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""
+Benchmark of the synchronous serializer against the async one driven by `asyncio.run`.
+
+Thread-based WSGI workers have no running event loop, so without the synchronous serializer every
+request pays for creating, running and closing one just to drive the async generator. Each
+request here serializes one provider-shaped stream, both ways.
+
+Run with:
+
+    python -m benchmarks.bench_sync
+"""
+
+import asyncio
+import time
+from typing import Callable
+
+from langchain_core.messages import AIMessageChunk
+
+from benchmarks.streams import SCENARIOS, SIZES
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    serialize_to_data_stream_protocol_bytes,
+    serialize_to_data_stream_protocol_bytes_sync,
+)
+
+
+def _sync_request(chunks: list[AIMessageChunk]) -> None:
+    for _ in serialize_to_data_stream_protocol_bytes_sync(iter(chunks)):
+        pass
+
+
+def _asyncio_run_request(chunks: list[AIMessageChunk]) -> None:
+    async def chunk_generator():
+        for chunk in chunks:
+            yield chunk
+
+    async def serialize():
+        async for _ in serialize_to_data_stream_protocol_bytes(chunk_generator()):
+            pass
+
+    asyncio.run(serialize())
+
+
+def _seconds_per_request(
+    request: Callable[[list[AIMessageChunk]], None], chunks: list[AIMessageChunk], requests: int
+) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        request(chunks)
+    return (time.perf_counter() - start) / requests
+
+
+def bench_requests(size: str = "small", requests: int = 500) -> None:
+    print(f"{size} streams, {requests} requests each")
+    print(f"{'scenario':<28}{'asyncio.run':>14}{'sync':>12}{'overhead':>12}")
+    for scenario, build in SCENARIOS.items():
+        chunks = build(SIZES[size], 0)
+        with_loop = _seconds_per_request(_asyncio_run_request, chunks, requests)
+        without_loop = _seconds_per_request(_sync_request, chunks, requests)
+        print(
+            f"{scenario:<28}{with_loop * 1e6:>12,.0f}us{without_loop * 1e6:>10,.0f}us"
+            f"{(with_loop - without_loop) * 1e6:>10,.0f}us"
+        )
+
+
+if __name__ == "__main__":
+    bench_requests()
@@ -0,0 +1,106 @@
+"""
+Benchmark of accumulating a 1 MB streamed tool call argument.
+
+Compares the previous accumulation, `+=` on a pydantic model field (quadratic, every delta copies
+the whole argument string), with the fragment buffer `ToolCall` uses now, and reports the
+end-to-end serializer time for the same stream.
+
+Run with:
+
+    python -m benchmarks.bench_tool_call_args
+"""
+
+import asyncio
+import json
+import time
+import tracemalloc
+
+from langchain_core.messages import AIMessageChunk
+from pydantic import BaseModel
+
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    ToolCall,
+    serialize_to_data_stream_protocol_bytes,
+)
+
+ARGS_SIZE = 1024 * 1024
+DELTA_SIZE = 16
+RUN_ID = "run-8d7c6b5a-4f3e-2d1c-0b9a-887766554433"
+
+
+class _PydanticToolCall(BaseModel):
+    id: str
+    name: str
+    args: str = ""
+
+
+def _deltas() -> list[str]:
+    args = json.dumps({"path": "main.py", "content": "x" * (ARGS_SIZE - 40)})
+    return [args[i : i + DELTA_SIZE] for i in range(0, len(args), DELTA_SIZE)]
+
+
+def _measure(label: str, accumulate) -> None:
+    deltas = _deltas()
+    tracemalloc.start()
+    start = time.perf_counter()
+    args = accumulate(deltas)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(args) == sum(len(x) for x in deltas)
+    print(f"{label:<28}{elapsed * 1000:>10.1f} ms{peak / 1024 / 1024:>10.1f} MiB peak")
+
+
+def _pydantic_concatenation(deltas: list[str]) -> str:
+    tool_call = _PydanticToolCall(id="call_1", name="WriteFile")
+    for delta in deltas:
+        tool_call.args += delta
+    return tool_call.args
+
+
+def _fragment_buffer(deltas: list[str]) -> str:
+    tool_call = ToolCall(id="call_1", name="WriteFile")
+    for delta in deltas:
+        tool_call.fragments.append(delta)
+    return tool_call.args
+
+
+async def _serialize() -> None:
+    deltas = _deltas()
+    chunks = [
+        AIMessageChunk(
+            content="",
+            id=RUN_ID,
+            tool_call_chunks=[
+                {
+                    "name": "WriteFile" if i == 0 else None,
+                    "args": delta,
+                    "id": "call_1" if i == 0 else None,
+                    "index": 0,
+                    "type": "tool_call_chunk",
+                }
+            ],
+        )
+        for i, delta in enumerate(deltas)
+    ]
+    chunks.append(
+        AIMessageChunk(content="", id=RUN_ID, response_metadata={"finish_reason": "tool_calls"})
+    )
+
+    async def chunk_generator():
+        for chunk in chunks:
+            yield chunk
+
+    start = time.perf_counter()
+    frames = 0
+    async for _ in serialize_to_data_stream_protocol_bytes(chunk_generator()):
+        frames += 1
+    elapsed = time.perf_counter() - start
+    print(f"{'serializer (end-to-end)':<28}{elapsed * 1000:>10.1f} ms{frames:>10,} frames")
+
+
+if __name__ == "__main__":
+    print(f"1 MiB argument streamed in {len(_deltas()):,} deltas of {DELTA_SIZE} characters")
+    _measure("pydantic += (previous)", _pydantic_concatenation)
+    _measure("fragment buffer", _fragment_buffer)
+    asyncio.run(_serialize())
@@ -0,0 +1,301 @@
+"""
+Synthetic `AIMessageChunk` streams shaped like the ones real providers produce.
+
+Every scenario is a plain list of chunks built up front, so benchmarks measure the serializer
+and not the construction of the chunks.
+"""
+
+import json
+import random
+import uuid
+from dataclasses import dataclass
+from typing import Callable
+
+from langchain_core.messages import AIMessageChunk
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog stream protocol tool call reasoning step token "
+    "latency throughput provider response message café naïve 你好 🚗"
+).split()
+
+
+@dataclass(frozen=True)
+class StreamSize:
+    """How much content a synthetic stream carries."""
+
+    text_tokens: int = 500
+    tool_calls: int = 2
+    args_bytes: int = 2_000
+    args_delta_bytes: int = 16
+    reasoning_tokens: int = 2_000
+
+
+SIZES = {
+    "small": StreamSize(text_tokens=50, tool_calls=1, args_bytes=200, reasoning_tokens=200),
+    "medium": StreamSize(),
+    "large": StreamSize(
+        text_tokens=5_000, tool_calls=8, args_bytes=100_000, reasoning_tokens=20_000
+    ),
+}
+
+
+def _run_id() -> str:
+    return f"run-{uuid.uuid4()}"
+
+
+def _tokens(rng: random.Random, count: int) -> list[str]:
+    return [(" " if i else "") + rng.choice(WORDS) for i in range(count)]
+
+
+def _args(rng: random.Random, size: int) -> str:
+    content = "".join(_tokens(rng, max(size // 6, 1)))[: max(size - 30, 0)]
+    return json.dumps({"path": "notes.md", "content": content})
+
+
+def _split(value: str, size: int) -> list[str]:
+    return [value[i : i + size] for i in range(0, len(value), size)] or [""]
+
+
+def _text_chunks(rng: random.Random, run_id: str, size: StreamSize) -> list[AIMessageChunk]:
+    chunks = [AIMessageChunk(content="", id=run_id)]
+    chunks += [AIMessageChunk(content=x, id=run_id) for x in _tokens(rng, size.text_tokens)]
+    return chunks
+
+
+def openai_text(size: StreamSize, seed: int = 0) -> list[AIMessageChunk]:
+    """Token-by-token string content, as streamed by OpenAI chat completions."""
+    rng = random.Random(seed)
+    run_id = _run_id()
+    chunks = _text_chunks(rng, run_id, size)
+    chunks.append(
+        AIMessageChunk(content="", id=run_id, response_metadata={"finish_reason": "stop"})
+    )
+    return chunks
+
+
+def openai_tool_calls(size: StreamSize, seed: int = 0) -> list[AIMessageChunk]:
+    """Text followed by chunked `tool_call_chunks`, one index after the other."""
+    rng = random.Random(seed)
+    run_id = _run_id()
+    chunks = _text_chunks(rng, run_id, size)
+    for index in range(size.tool_calls):
+        deltas = _split(_args(rng, size.args_bytes), size.args_delta_bytes)
+        for i, delta in enumerate(["", *deltas]):
+            chunks.append(
+                AIMessageChunk(
+                    content="",
+                    id=run_id,
+                    tool_call_chunks=[
+                        {
+                            "name": "write_file" if i == 0 else None,
+                            "args": delta,
+                            "id": f"call_{index}" if i == 0 else None,
+                            "index": index,
+                            "type": "tool_call_chunk",
+                        }
+                    ],
+                )
+            )
+    chunks.append(
+        AIMessageChunk(content="", id=run_id, response_metadata={"finish_reason": "tool_calls"})
+    )
+    return chunks
+
+
+def openai_parallel_tool_calls(size: StreamSize, seed: int = 0) -> list[AIMessageChunk]:
+    """Parallel tool calls whose argument deltas are interleaved across indexes."""
+    rng = random.Random(seed)
+    run_id = _run_id()
+    calls = [
+        _split(_args(rng, size.args_bytes), size.args_delta_bytes) for _ in range(size.tool_calls)
+    ]
+    chunks = [AIMessageChunk(content="", id=run_id)]
+    for index in range(size.tool_calls):
+        chunks.append(
+            AIMessageChunk(
+                content="",
+                id=run_id,
+                tool_call_chunks=[
+                    {
+                        "name": "write_file",
+                        "args": "",
+                        "id": f"call_{index}",
+                        "index": index,
+                        "type": "tool_call_chunk",
+                    }
+                ],
+            )
+        )
+    for position in range(max((len(x) for x in calls), default=0)):
+        for index, deltas in enumerate(calls):
+            if position < len(deltas):
+                chunks.append(
+                    AIMessageChunk(
+                        content="",
+                        id=run_id,
+                        tool_call_chunks=[
+                            {
+                                "name": None,
+                                "args": deltas[position],
+                                "id": None,
+                                "index": index,
+                                "type": "tool_call_chunk",
+                            }
+                        ],
+                    )
+                )
+    chunks.append(
+        AIMessageChunk(content="", id=run_id, response_metadata={"finish_reason": "tool_calls"})
+    )
+    return chunks
+
+
+def groq_tool_calls(size: StreamSize, seed: int = 0) -> list[AIMessageChunk]:
+    """Text followed by tool calls whose arguments arrive in a single chunk each."""
+    rng = random.Random(seed)
+    run_id = _run_id()
+    chunks = _text_chunks(rng, run_id, size)
+    for index in range(size.tool_calls):
+        chunks.append(
+            AIMessageChunk(
+                content="",
+                id=run_id,
+                tool_call_chunks=[
+                    {
+                        "name": "write_file",
+                        "args": _args(rng, size.args_bytes),
+                        "id": f"call_{index}",
+                        "index": index,
+                        "type": "tool_call_chunk",
+                    }
+                ],
+            )
+        )
+    chunks.append(
+        AIMessageChunk(
+            content="",
+            id=run_id,
+            response_metadata={"finish_reason": "tool_calls"},
+            usage_metadata={"input_tokens": 287, "output_tokens": 57, "total_tokens": 344},
+        )
+    )
+    return chunks
+
+
+def _anthropic_usage(input_tokens: int, output_tokens: int) -> dict:
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+        "input_token_details": {"cache_creation": 0, "cache_read": input_tokens // 2},
+    }
+
+
+def _anthropic_tool_use(
+    rng: random.Random, size: StreamSize, run_id: str, first_index: int
+) -> list[AIMessageChunk]:
+    chunks = []
+    for n in range(size.tool_calls):
+        index = first_index + n
+        tool_id = f"toolu_{index:024d}"
+        chunks.append(
+            AIMessageChunk(
+                content=[
+                    {
+                        "id": tool_id,
+                        "input": {},
+                        "name": "write_file",
+                        "type": "tool_use",
+                        "index": index,
+                    }
+                ],
+                id=run_id,
+                tool_call_chunks=[
+                    {
+                        "name": "write_file",
+                        "args": "",
+                        "id": tool_id,
+                        "index": index,
+                        "type": "tool_call_chunk",
+                    }
+                ],
+            )
+        )
+        for delta in _split(_args(rng, size.args_bytes), size.args_delta_bytes):
+            chunks.append(
+                AIMessageChunk(
+                    content=[{"partial_json": delta, "type": "tool_use", "index": index}],
+                    id=run_id,
+                    tool_call_chunks=[
+                        {
+                            "name": None,
+                            "args": delta,
+                            "id": None,
+                            "index": index,
+                            "type": "tool_call_chunk",
+                        }
+                    ],
+                )
+            )
+    return chunks
+
+
+def anthropic_tool_calls(size: StreamSize, seed: int = 0) -> list[AIMessageChunk]:
+    """Anthropic content-list blocks: text, then `tool_use` blocks with partial JSON."""
+    rng = random.Random(seed)
+    run_id = _run_id()
+    chunks = [AIMessageChunk(content="", id=run_id, usage_metadata=_anthropic_usage(479, 1))]
+    chunks += [
+        AIMessageChunk(content=[{"text": x, "type": "text", "index": 0}], id=run_id)
+        for x in _tokens(rng, size.text_tokens)
+    ]
+    chunks += _anthropic_tool_use(rng, size, run_id, first_index=1)
+    chunks.append(
+        AIMessageChunk(
+            content="",
+            id=run_id,
+            response_metadata={"stop_reason": "tool_use", "stop_sequence": None},
+            usage_metadata=_anthropic_usage(0, size.text_tokens),
+        )
+    )
+    return chunks
+
+
+def anthropic_reasoning(size: StreamSize, seed: int = 0) -> list[AIMessageChunk]:
+    """A long extended-thinking block followed by the answer."""
+    rng = random.Random(seed)
+    run_id = _run_id()
+    chunks = [AIMessageChunk(content="", id=run_id, usage_metadata=_anthropic_usage(1_200, 1))]
+    chunks += [
+        AIMessageChunk(content=[{"thinking": x, "type": "thinking", "index": 0}], id=run_id)
+        for x in _tokens(rng, size.reasoning_tokens)
+    ]
+    chunks.append(
+        AIMessageChunk(
+            content=[{"signature": "EuYBCkQYAiJA" * 8, "type": "thinking", "index": 0}],
+            id=run_id,
+        )
+    )
+    chunks += [
+        AIMessageChunk(content=[{"text": x, "type": "text", "index": 1}], id=run_id)
+        for x in _tokens(rng, size.text_tokens)
+    ]
+    chunks.append(
+        AIMessageChunk(
+            content="",
+            id=run_id,
+            response_metadata={"stop_reason": "end_turn", "stop_sequence": None},
+            usage_metadata=_anthropic_usage(0, size.reasoning_tokens + size.text_tokens),
+        )
+    )
+    return chunks
+
+
+SCENARIOS: dict[str, Callable[[StreamSize, int], list[AIMessageChunk]]] = {
+    "openai_text": openai_text,
+    "openai_tool_calls": openai_tool_calls,
+    "openai_parallel_tool_calls": openai_parallel_tool_calls,
+    "groq_tool_calls": groq_tool_calls,
+    "anthropic_tool_calls": anthropic_tool_calls,
+    "anthropic_reasoning": anthropic_reasoning,
+}
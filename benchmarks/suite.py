@@ -0,0 +1,165 @@
+"""
+Benchmark suite of `serialize_to_data_stream_protocol` over provider-shaped synthetic streams.
+
+For every scenario and serializer variant it reports frames/sec, bytes/sec, the p50/p99 time the
+serializer spends on a single chunk and the peak memory allocated while serializing. Results are
+printed as JSON so runs of different releases can be diffed:
+
+    python -m benchmarks --size large --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Any, AsyncGenerator, Callable
+
+from langchain_core.messages import AIMessageChunk
+
+from benchmarks.streams import SCENARIOS, SIZES, StreamSize
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    serialize_to_data_stream_protocol,
+    serialize_to_data_stream_protocol_bytes,
+)
+
+Serializer = Callable[[AsyncGenerator[AIMessageChunk, None]], AsyncGenerator[Any, None]]
+
+VARIANTS: dict[str, Serializer] = {
+    "str": serialize_to_data_stream_protocol,
+    "bytes": serialize_to_data_stream_protocol_bytes,
+}
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[int(percentile) - 1]
+
+
+async def _timed_run(
+    serializer: Serializer, chunks: list[AIMessageChunk]
+) -> tuple[float, int, int, list[float]]:
+    """Returns total seconds, frames, bytes and the per-chunk serializer latencies."""
+    latencies: list[float] = []
+
+    async def chunk_generator():
+        # the time between handing out a chunk and being asked for the next one is the time the
+        # serializer (and its no-op consumer) spent on that chunk
+        for chunk in chunks:
+            handed_out = time.perf_counter()
+            yield chunk
+            latencies.append(time.perf_counter() - handed_out)
+
+    frames = 0
+    size = 0
+    start = time.perf_counter()
+    async for frame in serializer(chunk_generator()):
+        frames += 1
+        size += len(frame.encode() if isinstance(frame, str) else frame)
+    return time.perf_counter() - start, frames, size, latencies
+
+
+async def _peak_allocations(serializer: Serializer, chunks: list[AIMessageChunk]) -> int:
+    async def chunk_generator():
+        for chunk in chunks:
+            yield chunk
+
+    tracemalloc.start()
+    try:
+        async for _ in serializer(chunk_generator()):
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+async def run_scenario(
+    scenario: str, variant: str, size: StreamSize, repeat: int = 5
+) -> dict[str, Any]:
+    chunks = SCENARIOS[scenario](size, 0)
+    serializer = VARIANTS[variant]
+
+    runs = [await _timed_run(serializer, chunks) for _ in range(repeat)]
+    seconds, frames, size_bytes, _ = min(runs, key=lambda x: x[0])
+    latencies = [latency for run in runs for latency in run[3]]
+
+    return {
+        "scenario": scenario,
+        "variant": variant,
+        "chunks": len(chunks),
+        "frames": frames,
+        "bytes": size_bytes,
+        "seconds": seconds,
+        "frames_per_sec": frames / seconds,
+        "bytes_per_sec": size_bytes / seconds,
+        "chunk_latency_us": {
+            "p50": _percentile(latencies, 50) * 1e6,
+            "p99": _percentile(latencies, 99) * 1e6,
+        },
+        "peak_alloc_bytes": await _peak_allocations(serializer, chunks),
+    }
+
+
+async def run_suite(
+    scenarios: list[str], variants: list[str], size_name: str, repeat: int
+) -> dict[str, Any]:
+    size = SIZES[size_name]
+    results = [
+        await run_scenario(scenario, variant, size, repeat)
+        for scenario in scenarios
+        for variant in variants
+    ]
+    try:
+        version = metadata.version("langchain-vercel-adapters")
+    except metadata.PackageNotFoundError:
+        version = None
+    return {
+        "package_version": version,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "size": size_name,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="scenario to run, may be repeated (default: all)",
+    )
+    parser.add_argument(
+        "--variant",
+        action="append",
+        choices=sorted(VARIANTS),
+        help="serializer variant to run, may be repeated (default: all)",
+    )
+    parser.add_argument("--size", choices=sorted(SIZES), default="medium")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(
+        run_suite(
+            args.scenario or list(SCENARIOS),
+            args.variant or list(VARIANTS),
+            args.size,
+            args.repeat,
+        )
+    )
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
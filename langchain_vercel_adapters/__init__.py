@@ -1,7 +1,101 @@
 import langchain_vercel_adapters.types as VercelTypes
-from langchain_vercel_adapters.stream_protocol.data_stream import serialize_to_data_stream_protocol
+from langchain_vercel_adapters.messages.attachments import (
+    AttachmentData,
+    decode_base64,
+    decode_data_url,
+    load_attachments,
+)
+from langchain_vercel_adapters.messages.convert import (
+    MessageConverter,
+    convert_message,
+    convert_messages,
+)
+from langchain_vercel_adapters.messages.ingest import (
+    LazyChatMessages,
+    LazyChatRequest,
+    LazyMessage,
+    parse_chat_messages,
+    parse_chat_request,
+)
+from langchain_vercel_adapters.messages.window import HistoryWindow
+from langchain_vercel_adapters.stream_protocol.agent import (
+    serialize_agent_to_data_stream_protocol,
+    serialize_agent_to_data_stream_protocol_bytes,
+)
+from langchain_vercel_adapters.stream_protocol.broadcast import (
+    DataStreamBroadcast,
+    FrameOffsetError,
+)
+from langchain_vercel_adapters.stream_protocol.buffering import BufferOverflow, buffer_data_stream
+from langchain_vercel_adapters.stream_protocol.cache import ResponseCache, request_key
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    TextCoalescing,
+    serialize_to_data_stream_protocol,
+    serialize_to_data_stream_protocol_bytes,
+    serialize_to_data_stream_protocol_bytes_sync,
+    serialize_to_data_stream_protocol_sync,
+)
+from langchain_vercel_adapters.stream_protocol.events import (
+    serialize_events_to_data_stream_protocol,
+    serialize_events_to_data_stream_protocol_bytes,
+)
+from langchain_vercel_adapters.stream_protocol.files import file_part, stream_file_part
+from langchain_vercel_adapters.stream_protocol.observer import StreamObserver, StreamTimings
+from langchain_vercel_adapters.stream_protocol.parser import (
+    DataStreamParser,
+    DataStreamPart,
+    parse_data_stream,
+)
+from langchain_vercel_adapters.stream_protocol.partial_json import PartialJSON
+from langchain_vercel_adapters.stream_protocol.recording import (
+    DataStreamRecorder,
+    DataStreamRecording,
+)
+from langchain_vercel_adapters.stream_protocol.resume import ResumableStreams
+from langchain_vercel_adapters.stream_protocol.tools import execute_tool_calls
+from langchain_vercel_adapters.stream_protocol.usage import StreamUsage
 
 __all__ = [
+    "AttachmentData",
+    "BufferOverflow",
+    "DataStreamBroadcast",
+    "DataStreamParser",
+    "DataStreamPart",
+    "DataStreamRecorder",
+    "DataStreamRecording",
+    "FrameOffsetError",
+    "HistoryWindow",
+    "LazyChatMessages",
+    "LazyChatRequest",
+    "LazyMessage",
+    "MessageConverter",
+    "PartialJSON",
+    "ResponseCache",
+    "ResumableStreams",
+    "StreamObserver",
+    "StreamTimings",
+    "StreamUsage",
+    "TextCoalescing",
     "VercelTypes",
+    "buffer_data_stream",
+    "convert_message",
+    "convert_messages",
+    "decode_base64",
+    "decode_data_url",
+    "execute_tool_calls",
+    "file_part",
+    "load_attachments",
+    "parse_chat_messages",
+    "parse_chat_request",
+    "parse_data_stream",
+    "request_key",
+    "serialize_agent_to_data_stream_protocol",
+    "serialize_agent_to_data_stream_protocol_bytes",
+    "serialize_events_to_data_stream_protocol",
+    "serialize_events_to_data_stream_protocol_bytes",
     "serialize_to_data_stream_protocol",
+    "serialize_to_data_stream_protocol_bytes",
+    "serialize_to_data_stream_protocol_bytes_sync",
+    "serialize_to_data_stream_protocol_sync",
+    "stream_file_part",
 ]
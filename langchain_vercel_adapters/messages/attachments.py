@@ -0,0 +1,174 @@
+import binascii
+import contextlib
+import io
+import mmap
+import tempfile
+from typing import IO, Any, Iterator, cast
+from urllib.parse import unquote_to_bytes
+
+from langchain_vercel_adapters.types import FileUIPart, Message
+
+# characters decoded at once, a multiple of 4 so every block holds whole base64 quads
+_BLOCK_CHARS = 256 * 1024
+_WHITESPACE = str.maketrans("", "", " \t\r\n")
+
+
+class AttachmentData:
+    """
+    The decoded payload of an attachment, in memory below `max_memory` bytes, on disk above.
+
+    Read it like a binary file, or get a `memoryview` of the whole payload with `getbuffer()`,
+    which maps the file instead of reading it when the payload was spilled to disk.
+    """
+
+    def __init__(
+        self, mime_type: str | None = None, name: str | None = None, max_memory: int = 1024 * 1024
+    ) -> None:
+        self.mime_type = mime_type
+        self.name = name
+        self.max_memory = max_memory
+        self.file: IO[bytes] = io.BytesIO()
+        self._mmap: mmap.mmap | None = None
+
+    @property
+    def on_disk(self) -> bool:
+        return not isinstance(self.file, io.BytesIO)
+
+    @property
+    def size(self) -> int:
+        position = self.file.tell()
+        size = self.file.seek(0, io.SEEK_END)
+        self.file.seek(position)
+        return size
+
+    def write(self, data: bytes) -> None:
+        if not self.on_disk and self.file.tell() + len(data) > self.max_memory:
+            # spill what was decoded so far and continue on disk
+            buffer = cast(io.BytesIO, self.file)
+            self.file = tempfile.TemporaryFile()
+            self.file.write(buffer.getbuffer())
+        self.file.write(data)
+
+    def read(self, size: int = -1) -> bytes:
+        return self.file.read(size)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self.file.seek(offset, whence)
+
+    def getbuffer(self) -> memoryview:
+        """A read-only view of the whole payload, release it before closing."""
+        if not self.on_disk:
+            return cast(io.BytesIO, self.file).getbuffer().toreadonly()
+        if self._mmap is None:
+            self.file.flush()
+            self._mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mmap)
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self.file.close()
+
+    def __enter__(self) -> "AttachmentData":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+@contextlib.contextmanager
+def _closed_on_error(attachment: AttachmentData) -> Iterator[None]:
+    # a payload spilled to disk before the error would leak its temporary file otherwise
+    try:
+        yield
+    except BaseException:
+        attachment.close()
+        raise
+
+
+def _decode_base64(data: str, start: int, out: AttachmentData) -> None:
+    """Decodes `data[start:]` block by block, never holding more than a block decoded."""
+    leftover = ""
+    for i in range(start, len(data), _BLOCK_CHARS):
+        block = leftover + data[i : i + _BLOCK_CHARS].translate(_WHITESPACE)
+        usable = len(block) - len(block) % 4
+        out.write(binascii.a2b_base64(block[:usable]))
+        leftover = block[usable:]
+    if leftover:
+        raise ValueError("Invalid base64 payload, its length is not a multiple of 4")
+
+
+def decode_base64(
+    data: str,
+    mime_type: str | None = None,
+    *,
+    name: str | None = None,
+    max_memory: int = 1024 * 1024,
+) -> AttachmentData:
+    """Decodes a base64 payload, like the `data` of a `FileUIPart`, into an `AttachmentData`."""
+    attachment = AttachmentData(mime_type, name, max_memory)
+    with _closed_on_error(attachment):
+        _decode_base64(data, 0, attachment)
+        attachment.seek(0)
+    return attachment
+
+
+def decode_data_url(
+    url: str, *, name: str | None = None, max_memory: int = 1024 * 1024
+) -> AttachmentData:
+    """
+    Decodes a `data:` URL, like the `url` of an `Attachment`, into an `AttachmentData`.
+
+    The payload is decoded incrementally, straight from the URL string, so a multi-megabyte
+    upload costs its decoded size once, on disk above `max_memory` bytes, rather than several
+    full copies in memory.
+
+    Raises:
+        ValueError: If `url` is not a valid data URL.
+    """
+    if not url.startswith("data:"):
+        raise ValueError(f"Not a data URL: {url[:32]!r}")
+    comma = url.find(",")
+    if comma == -1:
+        raise ValueError(f"Invalid data URL: {url[:32]!r}")
+    media_type, _, encoding = url[5:comma].rpartition(";")
+    if encoding != "base64":
+        media_type = url[5:comma]
+    mime_type = media_type.split(";")[0] or "text/plain"
+
+    attachment = AttachmentData(mime_type, name, max_memory)
+    with _closed_on_error(attachment):
+        if encoding == "base64":
+            _decode_base64(url, comma + 1, attachment)
+        else:
+            attachment.write(unquote_to_bytes(url[comma + 1 :]))
+        attachment.seek(0)
+    return attachment
+
+
+def load_attachments(message: Message, *, max_memory: int = 1024 * 1024) -> list[AttachmentData]:
+    """
+    Decodes the data URL attachments and file parts of a message.
+
+    Attachments that reference a remote URL are skipped. The caller owns the returned handles and
+    should close them once the request is handled. If one attachment fails to decode, the ones
+    decoded before it are closed.
+
+    Raises:
+        ValueError: If an attachment is not valid base64 or a valid data URL.
+    """
+    with contextlib.ExitStack() as stack:
+        attachments = [
+            stack.enter_context(decode_data_url(x.url, name=x.name, max_memory=max_memory))
+            for x in message.experimental_attachments or []
+            if x.url.startswith("data:")
+        ]
+        attachments += [
+            stack.enter_context(decode_base64(part.data, part.mime_type, max_memory=max_memory))
+            for part in getattr(message, "parts", None) or []
+            if isinstance(part, FileUIPart)
+        ]
+        # every attachment decoded, ownership goes to the caller
+        stack.pop_all()
+    return attachments
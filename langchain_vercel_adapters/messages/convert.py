@@ -0,0 +1,208 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Iterable, Sequence
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+
+from langchain_vercel_adapters.messages.ingest import LazyMessage
+from langchain_vercel_adapters.types import (
+    Attachment,
+    FileUIPart,
+    Message,
+    StepStartUIPart,
+    TextUIPart,
+    ToolInvocation,
+    ToolInvocationState,
+    ToolInvocationUIPart,
+)
+
+
+def _file_block(mime_type: str | None, url: str) -> dict[str, Any]:
+    """A LangChain content block for a file, images in the OpenAI format most models accept."""
+    if mime_type is not None and mime_type.startswith("image/"):
+        return {"type": "image_url", "image_url": {"url": url}}
+    if url.startswith("data:"):
+        header, _, data = url.partition(",")
+        return {
+            "type": "file",
+            "source_type": "base64",
+            "mime_type": mime_type or header[5:].split(";")[0],
+            "data": data,
+        }
+    block: dict[str, Any] = {"type": "file", "source_type": "url", "url": url}
+    if mime_type is not None:
+        block["mime_type"] = mime_type
+    return block
+
+
+def _attachment_block(attachment: Attachment) -> dict[str, Any]:
+    return _file_block(attachment.content_type, attachment.url)
+
+
+def _file_part_block(part: FileUIPart) -> dict[str, Any]:
+    if part.mime_type.startswith("image/"):
+        return _file_block(part.mime_type, f"data:{part.mime_type};base64,{part.data}")
+    # the payload is passed on as is, without copying it into a data URL first
+    return {"type": "file", "source_type": "base64", "mime_type": part.mime_type, "data": part.data}
+
+
+def _content(text: str, blocks: list[dict[str, Any]]) -> str | list[str | dict[str, Any]]:
+    if not blocks:
+        return text
+    content: list[str | dict[str, Any]] = [{"type": "text", "text": text}] if text else []
+    return content + blocks
+
+
+def _tool_args(args: Any) -> dict[str, Any]:
+    if isinstance(args, str):
+        return json.loads(args) if args else {}
+    return args or {}
+
+
+def _tool_result(result: Any) -> str:
+    return result if isinstance(result, str) else json.dumps(result)
+
+
+def _convert_user(message: Message) -> list[BaseMessage]:
+    parts = getattr(message, "parts", None)
+    blocks: list[dict[str, Any]] = []
+    if parts:
+        text = "".join(part.text for part in parts if isinstance(part, TextUIPart))
+        blocks += [_file_part_block(part) for part in parts if isinstance(part, FileUIPart)]
+    else:
+        text = message.content
+    blocks += [_attachment_block(x) for x in message.experimental_attachments or []]
+    return [HumanMessage(content=_content(text, blocks), id=message.id)]
+
+
+def _step_messages(
+    message_id: str | None, text: str, invocations: list[ToolInvocation]
+) -> list[BaseMessage]:
+    messages: list[BaseMessage] = [
+        AIMessage(
+            content=text,
+            id=message_id,
+            tool_calls=[
+                {"id": x.tool_call_id, "name": x.tool_name, "args": _tool_args(x.args)}
+                for x in invocations
+            ],
+        )
+    ]
+    messages += [
+        ToolMessage(content=_tool_result(x.result), tool_call_id=x.tool_call_id, name=x.tool_name)
+        for x in invocations
+    ]
+    return messages
+
+
+def _convert_assistant(message: Message) -> list[BaseMessage]:
+    parts = getattr(message, "parts", None)
+    steps: list[tuple[str, list[ToolInvocation]]] = []
+    if not parts:
+        steps.append((message.content, message.tool_invocations or []))
+    else:
+        # every step (one LLM call) becomes an AI message followed by its tool results
+        text: list[str] = []
+        invocations: list[ToolInvocation] = []
+        for part in parts:
+            if isinstance(part, StepStartUIPart):
+                steps.append(("".join(text), invocations))
+                text, invocations = [], []
+            elif isinstance(part, TextUIPart):
+                text.append(part.text)
+            elif isinstance(part, ToolInvocationUIPart):
+                invocations.append(part.tool_invocation)
+        steps.append(("".join(text), invocations))
+
+    # tool calls without a result are still running or were abandoned, providers reject them
+    steps = [
+        (text, [x for x in invocations if x.state == ToolInvocationState.RESULT])
+        for text, invocations in steps
+    ]
+    steps = [(text, invocations) for text, invocations in steps if text or invocations]
+    if len(steps) == 1:
+        return _step_messages(message.id, *steps[0])
+    # id-keyed stores (e.g. LangGraph's `add_messages`) would merge steps sharing an id
+    messages: list[BaseMessage] = []
+    for step, (text, invocations) in enumerate(steps):
+        step_id = f"{message.id}-{step}" if message.id is not None else None
+        messages += _step_messages(step_id, text, invocations)
+    return messages
+
+
+def convert_message(message: Message) -> list[BaseMessage]:
+    """
+    Converts one Vercel AI SDK message into LangChain messages.
+
+    An assistant message becomes one `AIMessage` per step, each followed by the `ToolMessage`s of
+    its tool results. When there are several steps, their ids are the message id suffixed with the
+    step position (`-0`, `-1`...) so id-keyed stores keep them apart. Tool calls without a result
+    and data messages are dropped. Attachments and file parts become LangChain content blocks.
+    """
+    if message.role == "system":
+        return [SystemMessage(content=message.content, id=message.id)]
+    if message.role == "user":
+        return _convert_user(message)
+    if message.role == "assistant":
+        return _convert_assistant(message)
+    return []
+
+
+def convert_messages(messages: Iterable[Message]) -> list[BaseMessage]:
+    """Converts Vercel AI SDK messages into LangChain messages, see `convert_message`."""
+    return [x for message in messages for x in convert_message(message)]
+
+
+def _content_hash(message: Message | LazyMessage[Any]) -> bytes:
+    if isinstance(message, LazyMessage):
+        # hashed from the request JSON, without validating the message
+        return message.content_hash
+    return hashlib.blake2b(message.model_dump_json().encode(), digest_size=16).digest()
+
+
+class MessageConverter:
+    """
+    Converts Vercel AI SDK messages into LangChain messages, memoizing converted messages.
+
+    Clients post the whole history on every turn, so converted messages are cached by message id
+    and content hash, and a long conversation only converts the messages appended since the
+    previous request. A message edited in place has a new hash and is converted again.
+
+    The returned messages are shared between calls and must not be modified.
+
+    Args:
+        max_messages: Number of Vercel messages whose conversion is cached, least recently used
+            ones are evicted first.
+    """
+
+    def __init__(self, max_messages: int = 10_000) -> None:
+        self.max_messages = max_messages
+        self._cache: OrderedDict[tuple[str | None, bytes], list[BaseMessage]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def convert_message(self, message: Message | LazyMessage[Any]) -> list[BaseMessage]:
+        """Converts a message, or a `LazyMessage` validated only if it was not converted yet."""
+        key = (message.id, _content_hash(message))
+        converted = self._cache.get(key)
+        if converted is not None:
+            self._cache.move_to_end(key)
+            return converted
+        converted = convert_message(
+            message.message if isinstance(message, LazyMessage) else message
+        )
+        self._cache[key] = converted
+        if len(self._cache) > self.max_messages:
+            self._cache.popitem(last=False)
+        return converted
+
+    def convert(self, messages: Sequence[Message | LazyMessage[Any]]) -> list[BaseMessage]:
+        return [x for message in messages for x in self.convert_message(message)]
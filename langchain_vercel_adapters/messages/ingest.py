@@ -0,0 +1,133 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+from typing_extensions import NotRequired, TypedDict
+
+from langchain_vercel_adapters.types import Message, UIMessage
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class _RawChatMessages(TypedDict):
+    id: str
+    messages: list[dict[str, Any]]
+
+
+class _RawChatRequest(TypedDict):
+    headers: NotRequired[dict[str, str] | None]
+    body: NotRequired[dict[str, Any] | None]
+    messages: list[dict[str, Any]]
+    data: NotRequired[Any]
+
+
+# compiled once, they only check the envelope and leave messages as parsed JSON objects
+_CHAT_MESSAGES = TypeAdapter(_RawChatMessages)
+_CHAT_REQUEST = TypeAdapter(_RawChatRequest)
+_ADAPTERS: dict[type[BaseModel], TypeAdapter[Any]] = {
+    UIMessage: TypeAdapter(UIMessage),
+    Message: TypeAdapter(Message),
+}
+
+
+class LazyMessage(Generic[M]):
+    """
+    A message kept as parsed JSON and only validated on first attribute access.
+
+    Behaves like the model it wraps for reading, `message.role` validates the whole message once
+    and returns the attribute of the validated model. `id` and `content_hash` are read from the
+    JSON without validating, so converters can recognize messages they have already seen.
+    """
+
+    __slots__ = ("raw", "_adapter", "_message", "_hash")
+
+    def __init__(self, raw: dict[str, Any], adapter: TypeAdapter[M], message: M | None = None):
+        self.raw = raw
+        self._adapter = adapter
+        self._message = message
+        self._hash: bytes | None = None
+
+    @property
+    def validated(self) -> bool:
+        return self._message is not None
+
+    @property
+    def message(self) -> M:
+        """The validated message."""
+        if self._message is None:
+            self._message = self._adapter.validate_python(self.raw)
+        return self._message
+
+    @property
+    def id(self) -> str | None:
+        """The message id, read without validating the message."""
+        return self.raw.get("id")
+
+    @property
+    def content_hash(self) -> bytes:
+        if self._hash is None:
+            self._hash = hashlib.blake2b(to_json(self.raw), digest_size=16).digest()
+        return self._hash
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.message, name)
+
+    def __repr__(self) -> str:
+        state = "validated" if self.validated else "lazy"
+        return f"LazyMessage({self.raw.get('id')!r}, {state})"
+
+
+@dataclass(slots=True)
+class LazyChatMessages:
+    """A `ChatMessages` body parsed by `parse_chat_messages`."""
+
+    id: str
+    messages: list[LazyMessage[UIMessage]]
+
+
+@dataclass(slots=True)
+class LazyChatRequest:
+    """A `ChatRequest` body parsed by `parse_chat_request`."""
+
+    messages: list[LazyMessage[Message]]
+    headers: dict[str, str] | None = None
+    body: dict[str, Any] | None = None
+    data: Any = None
+
+
+def _messages(
+    raw_messages: list[dict[str, Any]], model: type[M], validate_last: int
+) -> list[LazyMessage[M]]:
+    adapter = _ADAPTERS.get(model) or TypeAdapter(model)
+    eager = len(raw_messages) - validate_last
+    return [
+        LazyMessage(raw, adapter, adapter.validate_python(raw) if i >= eager else None)
+        for i, raw in enumerate(raw_messages)
+    ]
+
+
+def parse_chat_messages(body: bytes | str, *, validate_last: int = 2) -> LazyChatMessages:
+    """
+    Parses a `ChatMessages` request body, validating only its newest messages.
+
+    The body is parsed and its envelope validated straight from the raw bytes, the last
+    `validate_last` messages are validated as `UIMessage`s and older ones are kept as
+    `LazyMessage`s, validated on first attribute access. Every message is a `LazyMessage`, the
+    newest already validated, `message.message` is the validated `UIMessage`.
+
+    Raises:
+        pydantic.ValidationError: If the body or one of the newest messages is invalid.
+    """
+    raw = _CHAT_MESSAGES.validate_json(body)
+    return LazyChatMessages(
+        id=raw["id"], messages=_messages(raw["messages"], UIMessage, validate_last)
+    )
+
+
+def parse_chat_request(body: bytes | str, *, validate_last: int = 2) -> LazyChatRequest:
+    """`parse_chat_messages` for `ChatRequest` bodies, whose messages are `Message`s."""
+    raw = _CHAT_REQUEST.validate_json(body)
+    raw["messages"] = _messages(raw["messages"], Message, validate_last)
+    return LazyChatRequest(**raw)
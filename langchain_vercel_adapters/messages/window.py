@@ -0,0 +1,101 @@
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from pydantic_core import to_json
+
+TokenCounter = Callable[[BaseMessage], int]
+
+
+def _approximate_tokens(message: BaseMessage) -> int:
+    return count_tokens_approximately([message])
+
+
+def _content_hash(message: BaseMessage) -> bytes:
+    tool_calls = message.tool_calls if isinstance(message, AIMessage) else None
+    tool_call_id = message.tool_call_id if isinstance(message, ToolMessage) else None
+    data = to_json((message.type, message.name, message.content, tool_calls, tool_call_id))
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _groups(messages: Sequence[BaseMessage]) -> list[list[int]]:
+    """
+    Indexes of the non-system messages to keep or drop together, tool results with their call.
+    """
+    groups: list[list[int]] = []
+    for i, message in enumerate(messages):
+        if isinstance(message, SystemMessage):
+            continue
+        if isinstance(message, ToolMessage) and groups:
+            groups[-1].append(i)
+        else:
+            groups.append([i])
+    return groups
+
+
+class HistoryWindow:
+    """
+    Trims a conversation to the largest suffix that fits in a token budget.
+
+    System messages are always kept and count against the budget. A tool call is kept or dropped
+    together with its tool results, so the window never starts with an orphan tool result.
+
+    Token counts are cached by message id and content hash, so each turn only counts the messages
+    appended since the previous one, which matters with exact (tokenizer based) counters.
+
+    Args:
+        max_tokens: The token budget of the returned messages.
+        count_tokens: Counts the tokens of one message, defaults to LangChain's approximate count.
+            Wrap a model's counter to be exact, e.g.
+            `lambda m: llm.get_num_tokens_from_messages([m])`.
+        max_cached: Number of message counts cached, least recently used ones are evicted first.
+
+    Example:
+        window = HistoryWindow(max_tokens=100_000)
+        messages = window(converter.convert(request.messages))
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        count_tokens: TokenCounter = _approximate_tokens,
+        max_cached: int = 100_000,
+    ) -> None:
+        self.max_tokens = max_tokens
+        self.count_tokens = count_tokens
+        self.max_cached = max_cached
+        self._counts: OrderedDict[tuple[str | None, bytes], int] = OrderedDict()
+
+    def tokens(self, message: BaseMessage) -> int:
+        """The token count of a message, from the cache when it was counted before."""
+        key = (message.id, _content_hash(message))
+        count = self._counts.get(key)
+        if count is not None:
+            self._counts.move_to_end(key)
+            return count
+        count = self.count_tokens(message)
+        self._counts[key] = count
+        if len(self._counts) > self.max_cached:
+            self._counts.popitem(last=False)
+        return count
+
+    def __call__(self, messages: Sequence[BaseMessage]) -> list[BaseMessage]:
+        """Returns the system messages and the largest suffix of the others within budget."""
+        system = [message for message in messages if isinstance(message, SystemMessage)]
+        budget = self.max_tokens - sum(self.tokens(message) for message in system)
+
+        start = len(messages)
+        for group in reversed(_groups(messages)):
+            tokens = sum(self.tokens(messages[i]) for i in group)
+            if tokens > budget:
+                break
+            budget -= tokens
+            start = group[0]
+
+        return [
+            message
+            for i, message in enumerate(messages)
+            if i >= start or isinstance(message, SystemMessage)
+        ]
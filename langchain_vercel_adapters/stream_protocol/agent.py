@@ -0,0 +1,220 @@
+import asyncio
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Sequence, cast
+
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    ToolMessage,
+    message_chunk_to_message,
+)
+from langchain_core.messages.ai import add_ai_message_chunks
+from langchain_core.runnables import Runnable
+
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    _BYTES_ENCODER,
+    _STR_ENCODER,
+    TextCoalescing,
+    _finish_reason,
+    _FrameEncoder,
+    _serialize,
+)
+from langchain_vercel_adapters.stream_protocol.observer import StreamObserver
+from langchain_vercel_adapters.stream_protocol.tools import Tool, execute_tool_calls
+from langchain_vercel_adapters.stream_protocol.usage import StreamUsage
+
+ChatModel = Runnable[LanguageModelInput, BaseMessage]
+
+# what follows a step: nothing, a step answering its tool calls, or a step continuing its text
+_DONE = "done"
+_TOOL_RESULT = "tool-result"
+_CONTINUE = "continue"
+
+
+def _continued(frame: Any) -> Any:
+    """Marks a finish step part as continued by the next step."""
+    if isinstance(frame, bytes):
+        return frame.replace(b'"isContinued":false', b'"isContinued":true')
+    return frame.replace('"isContinued":false', '"isContinued":true')
+
+
+async def _tee(
+    stream: AsyncIterator[Any], chunks: list[AIMessageChunk]
+) -> AsyncGenerator[AIMessageChunk, None]:
+    """Yields the chunks of one LLM call, keeping them to build the message of the step."""
+    async for chunk in stream:
+        chunks.append(chunk)
+        yield chunk
+
+
+def _stop_reason(chunks: list[AIMessageChunk]) -> str | None:
+    for chunk in reversed(chunks):
+        metadata = chunk.response_metadata
+        stop_reason = metadata.get("finish_reason") or metadata.get("stop_reason")
+        if stop_reason is not None:
+            return stop_reason
+    return None
+
+
+async def _serialize_agent(
+    model: ChatModel,
+    messages: Sequence[BaseMessage],
+    tools: Sequence[Tool],
+    encoder: _FrameEncoder,
+    max_steps: int,
+    max_duration: float | None,
+    continue_on_length: bool,
+    max_concurrency: int,
+    coalesce: TextCoalescing | None,
+    observer: StreamObserver | None,
+    usage: StreamUsage | None,
+    on_message: Callable[[BaseMessage], Any] | None,
+) -> AsyncGenerator[Any, None]:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_duration if max_duration is not None else None
+    usage = usage if usage is not None else StreamUsage()
+    history = list(messages)
+    stop_reason = "unknown"
+
+    for step in range(max_steps):
+        chunks: list[AIMessageChunk] = []
+        results: list[ToolMessage] = []
+        frames = _serialize(
+            _tee(model.astream(history), chunks), encoder, coalesce, observer, usage
+        )
+        if tools:
+            frames = execute_tool_calls(
+                frames, tools, max_concurrency=max_concurrency, on_result=results.append
+            )
+
+        # the finish step part is written once the next step is known
+        end_step = None
+        async for frame in frames:
+            if frame[:2] in ("e:", b"e:"):
+                end_step = frame
+            else:
+                yield frame
+
+        message = (
+            cast(AIMessage, message_chunk_to_message(add_ai_message_chunks(*chunks)))
+            if chunks
+            else AIMessage(content="")
+        )
+        stop_reason = _stop_reason(chunks) or stop_reason
+        answered = {result.tool_call_id for result in results}
+        if message.tool_calls:
+            # tool calls left to the client end the response, the client answers them
+            next_step = (
+                _TOOL_RESULT if all(x["id"] in answered for x in message.tool_calls) else _DONE
+            )
+        elif continue_on_length and _finish_reason(stop_reason) == "length":
+            next_step = _CONTINUE
+        else:
+            next_step = _DONE
+        if step + 1 == max_steps or (deadline is not None and loop.time() >= deadline):
+            next_step = _DONE
+
+        if end_step is not None:
+            yield _continued(end_step) if next_step == _CONTINUE else end_step
+
+        # results in tool call order, they were collected in completion order
+        order = {x["id"]: i for i, x in enumerate(message.tool_calls)}
+        results.sort(key=lambda result: order.get(result.tool_call_id, len(order)))
+        for new_message in [message, *results]:
+            history.append(new_message)
+            if on_message is not None:
+                on_message(new_message)
+        if next_step == _DONE:
+            break
+
+    yield encoder.finish_message(stop_reason, usage.total)
+
+
+def serialize_agent_to_data_stream_protocol(
+    model: ChatModel,
+    messages: Sequence[BaseMessage],
+    tools: Sequence[Tool] = (),
+    *,
+    max_steps: int = 10,
+    max_duration: float | None = None,
+    continue_on_length: bool = False,
+    max_concurrency: int = 8,
+    coalesce: TextCoalescing | None = None,
+    observer: StreamObserver | None = None,
+    usage: StreamUsage | None = None,
+    on_message: Callable[[BaseMessage], Any] | None = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Runs an LLM -> tools -> LLM loop and serializes every step into one data stream response.
+
+    Each step streams one LLM call with its start step and finish step parts. Its tool calls are
+    executed as soon as they are complete (see `execute_tool_calls`), and once they all have a
+    result the LLM is called again with the results, until it answers without tool calls. The
+    response ends with a finish message part holding the usage of all the steps.
+
+    Args:
+        model: The chat model to call, with the tools bound, e.g. `llm.bind_tools(tools)`.
+        messages: The conversation so far.
+        tools: The tools executed on the server. Tool calls of other tools end the response, to be
+            answered by the client.
+        max_steps: Maximum number of LLM calls.
+        max_duration: Seconds after which no new step is started.
+        continue_on_length: Whether a step stopped by the output token limit is continued by the
+            next one, marking its finish step part `isContinued`.
+        max_concurrency: Maximum number of tools running at once.
+        coalesce: See `serialize_to_data_stream_protocol`.
+        observer: See `serialize_to_data_stream_protocol`, every step is observed as a stream.
+        usage: Accumulates the token usage of all the steps.
+        on_message: Called with each message added to the conversation, the `AIMessage` of a
+            step then its `ToolMessage`s, e.g. to persist them.
+
+    Example:
+        stream = serialize_agent_to_data_stream_protocol(llm.bind_tools(tools), messages, tools)
+        return StreamingResponse(stream, media_type="text/event-stream")
+    """
+    return _serialize_agent(
+        model,
+        messages,
+        tools,
+        _STR_ENCODER,
+        max_steps,
+        max_duration,
+        continue_on_length,
+        max_concurrency,
+        coalesce,
+        observer,
+        usage,
+        on_message,
+    )
+
+
+def serialize_agent_to_data_stream_protocol_bytes(
+    model: ChatModel,
+    messages: Sequence[BaseMessage],
+    tools: Sequence[Tool] = (),
+    *,
+    max_steps: int = 10,
+    max_duration: float | None = None,
+    continue_on_length: bool = False,
+    max_concurrency: int = 8,
+    coalesce: TextCoalescing | None = None,
+    observer: StreamObserver | None = None,
+    usage: StreamUsage | None = None,
+    on_message: Callable[[BaseMessage], Any] | None = None,
+) -> AsyncGenerator[bytes, None]:
+    """Bytes-native variant of `serialize_agent_to_data_stream_protocol`."""
+    return _serialize_agent(
+        model,
+        messages,
+        tools,
+        _BYTES_ENCODER,
+        max_steps,
+        max_duration,
+        continue_on_length,
+        max_concurrency,
+        coalesce,
+        observer,
+        usage,
+        on_message,
+    )
@@ -0,0 +1,167 @@
+import asyncio
+from typing import Any, AsyncGenerator, AsyncIterator, Callable
+
+
+class FrameOffsetError(LookupError):
+    """The requested part is no longer retained by a bounded frame log."""
+
+
+class DataStreamBroadcast:
+    """
+    Fans one serialized data stream out to any number of subscribers.
+
+    The upstream stream is consumed once, by a background task, into a shared append-only log of
+    parts. Every subscriber iterates the log independently at its own pace, and subscribers that
+    join late catch up from the beginning, so a second viewer of a response never costs a second
+    LLM call. Subscribers leaving does not stop the upstream stream, use `aclose` for that.
+
+    Every part has an offset, its position in the stream. With `max_frames` the log becomes a
+    ring buffer retaining only the latest parts, and reading an offset that was overwritten
+    raises `FrameOffsetError`.
+
+    Example:
+        broadcast = DataStreamBroadcast(serialize_to_data_stream_protocol(stream))
+        response = StreamingResponse(broadcast.subscribe(), media_type="text/event-stream")
+    """
+
+    def __init__(self, frames: AsyncIterator[Any], max_frames: int | None = None) -> None:
+        self._upstream = frames
+        self._max_frames = max_frames
+        # with max_frames, the part at offset `i` lives at `i % max_frames`, the list grows as
+        # parts arrive until it is full and is overwritten in place from then on
+        self._frames: list[Any] = []
+        # number of parts received, i.e. the offset of the next part
+        self._total = 0
+        self._done = False
+        self._error: BaseException | None = None
+        # resolved (and replaced) whenever the log grows, only created when someone waits
+        self._waiter: asyncio.Future[None] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._done_callbacks: list[Callable[["DataStreamBroadcast"], Any]] = []
+
+    @property
+    def frames(self) -> list[Any]:
+        """The parts retained so far, in order."""
+        if self._max_frames is None:
+            return list(self._frames)
+        return [self._frame_at(i) for i in range(self.first_offset, self._total)]
+
+    @property
+    def first_offset(self) -> int:
+        """The offset of the oldest retained part."""
+        if self._max_frames is None:
+            return 0
+        return max(self._total - self._max_frames, 0)
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def __len__(self) -> int:
+        """The number of parts received so far, retained or not."""
+        return self._total
+
+    def _frame_at(self, offset: int) -> Any:
+        if self._max_frames is None:
+            return self._frames[offset]
+        if offset < self._total - self._max_frames:
+            raise FrameOffsetError(
+                f"Part {offset} is no longer retained, the oldest one is {self.first_offset}"
+            )
+        return self._frames[offset % self._max_frames]
+
+    def start(self) -> None:
+        """Starts consuming the upstream stream, subscribing does it implicitly."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._consume())
+
+    async def _consume(self) -> None:
+        try:
+            async for frame in self._upstream:
+                if self._max_frames is None or self._total < self._max_frames:
+                    self._frames.append(frame)
+                else:
+                    self._frames[self._total % self._max_frames] = frame
+                self._total += 1
+                self._notify()
+        except asyncio.CancelledError:
+            self._error = RuntimeError("The broadcast was closed before the stream ended")
+            raise
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done = True
+            self._notify()
+            for callback in self._done_callbacks:
+                callback(self)
+            self._done_callbacks.clear()
+
+    def add_done_callback(self, callback: Callable[["DataStreamBroadcast"], Any]) -> None:
+        """
+        Calls `callback` with the broadcast once the upstream stream ended, failed or was closed.
+
+        It is called right away if the stream already ended.
+        """
+        if self._done:
+            callback(self)
+        else:
+            self._done_callbacks.append(callback)
+
+    def _notify(self) -> None:
+        if self._waiter is not None:
+            if not self._waiter.done():
+                self._waiter.set_result(None)
+            self._waiter = None
+
+    async def _wait(self) -> None:
+        if self._waiter is None:
+            self._waiter = asyncio.get_running_loop().create_future()
+        await asyncio.shield(self._waiter)
+
+    async def subscribe(self, offset: int = 0) -> AsyncGenerator[Any, None]:
+        """
+        Iterates the parts of the stream, starting at the part at `offset`.
+
+        Args:
+            offset: Index of the first part to receive, 0 (the default) replays the stream from
+                its beginning.
+
+        Raises:
+            ValueError: If `offset` is negative.
+            FrameOffsetError: If the log is bounded and the subscriber needs a part that was
+                overwritten, either because `offset` is too old or because it fell behind.
+        """
+        if offset < 0:
+            raise ValueError(f"Offset must be positive or zero, got {offset}")
+        self.start()
+        position = offset
+        while True:
+            if position < self._total:
+                # read before yielding, a ring buffer may overwrite the part while we are suspended
+                frame = self._frame_at(position)
+                position += 1
+                yield frame
+                continue
+            if self._done:
+                if self._error is not None:
+                    raise self._error
+                return
+            await self._wait()
+
+    async def wait_closed(self) -> None:
+        """Waits until the upstream stream is exhausted."""
+        self.start()
+        assert self._task is not None
+        await asyncio.shield(self._task)
+
+    async def aclose(self) -> None:
+        """Stops consuming the upstream stream. Subscribers still reading get an error."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        aclose = getattr(self._upstream, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,204 @@
+import asyncio
+import struct
+import tempfile
+from collections import deque
+from enum import Enum
+from typing import IO, Any, AsyncGenerator, AsyncIterator
+
+_LENGTH = struct.Struct(">I")
+
+
+class BufferOverflow(str, Enum):
+    """What `buffer_data_stream` does with a part that arrives while its buffer is full."""
+
+    # wait for the client to read, which stalls the upstream stream like a plain generator
+    WAIT = "wait"
+    # merge text, reasoning and tool call argument deltas into the last buffered part of the same
+    # kind, only other parts wait for the client
+    MERGE = "merge"
+    # write parts to a temporary file and read them back once the client caught up
+    SPILL = "spill"
+
+
+def _merge_head(frame: str | bytes) -> str | bytes | None:
+    """
+    Returns the head a part must share with another one to be merged with it, if mergeable.
+
+    Text (`0:`) and reasoning (`g:`) parts are a JSON string, tool call deltas (`c:`) end with
+    one, so two of them merge by splicing the escaped strings together.
+    """
+    if isinstance(frame, str):
+        if frame.startswith(("0:", "g:")):
+            return frame[:3]
+        if frame.startswith("c:"):
+            end = frame.find(',"argsTextDelta":')
+            return frame[: end + 18] if end != -1 else None
+        return None
+    if frame.startswith((b"0:", b"g:")):
+        return frame[:3]
+    if frame.startswith(b"c:"):
+        end = frame.find(b',"argsTextDelta":')
+        return frame[: end + 18] if end != -1 else None
+    return None
+
+
+def _merge(left: Any, right: Any, head: Any) -> Any:
+    # drop the closing quote (and brace) of the left part and the head of the right one
+    tail = 3 if left[:1] in ("c", b"c") else 2
+    return left[:-tail] + right[len(head) :]
+
+
+class _FrameBuffer:
+    """A bounded FIFO of encoded parts between the upstream producer and the client."""
+
+    def __init__(self, max_bytes: int, overflow: BufferOverflow, spill_dir: str | None) -> None:
+        self.max_bytes = max_bytes
+        self.overflow = overflow
+        self.spill_dir = spill_dir
+        self.frames: deque[Any] = deque()
+        self.size = 0
+        self.spill: IO[bytes] | None = None
+        self.spilled = 0
+        self.spill_read_at = 0
+        self.spill_write_at = 0
+        self.binary = True
+        self.closed = False
+        self.error: BaseException | None = None
+        self.readable = asyncio.Event()
+        self.writable = asyncio.Event()
+
+    async def put(self, frame: Any) -> None:
+        self.binary = isinstance(frame, bytes)
+        while True:
+            if self.spilled:
+                # once parts are on disk, later ones follow them there to keep the order
+                self._spill(frame)
+            elif not self.frames or self.size + len(frame) <= self.max_bytes:
+                self.frames.append(frame)
+                self.size += len(frame)
+            elif self.overflow is BufferOverflow.SPILL:
+                self._spill(frame)
+            elif self.overflow is BufferOverflow.MERGE and self._merge(frame):
+                pass
+            else:
+                self.writable.clear()
+                await self.writable.wait()
+                continue
+            self.readable.set()
+            return
+
+    def _merge(self, frame: Any) -> bool:
+        head = _merge_head(frame)
+        if head is None:
+            return False
+        last = self.frames[-1]
+        if not last.startswith(head):
+            return False
+        merged = self.frames[-1] = _merge(last, frame, head)
+        self.size += len(merged) - len(last)
+        return True
+
+    def _spill(self, frame: Any) -> None:
+        if self.spill is None:
+            self.spill = tempfile.TemporaryFile(dir=self.spill_dir)
+        data = frame if self.binary else frame.encode()
+        self.spill.seek(self.spill_write_at)
+        self.spill.write(_LENGTH.pack(len(data)))
+        self.spill.write(data)
+        self.spill_write_at = self.spill.tell()
+        self.spilled += 1
+
+    def _unspill(self) -> Any:
+        assert self.spill is not None
+        self.spill.seek(self.spill_read_at)
+        (length,) = _LENGTH.unpack(self.spill.read(_LENGTH.size))
+        data = self.spill.read(length)
+        self.spill_read_at = self.spill.tell()
+        self.spilled -= 1
+        if not self.spilled:
+            # the client caught up, reuse the file from the start
+            self.spill.truncate(0)
+            self.spill_read_at = self.spill_write_at = 0
+        return data if self.binary else data.decode()
+
+    async def get(self) -> Any:
+        """Returns the next part, or None once the upstream stream is exhausted."""
+        while True:
+            if self.frames:
+                frame = self.frames.popleft()
+                self.size -= len(frame)
+                self.writable.set()
+                return frame
+            if self.spilled:
+                return self._unspill()
+            if self.closed:
+                if self.error is not None:
+                    raise self.error
+                return None
+            self.readable.clear()
+            await self.readable.wait()
+
+    def close(self, error: BaseException | None = None) -> None:
+        self.closed = True
+        self.error = error
+        self.readable.set()
+
+    def discard(self) -> None:
+        if self.spill is not None:
+            self.spill.close()
+            self.spill = None
+
+
+async def _drain(frames: AsyncIterator[Any], buffer: _FrameBuffer) -> None:
+    try:
+        async for frame in frames:
+            await buffer.put(frame)
+    except Exception as e:
+        buffer.close(e)
+    else:
+        buffer.close()
+
+
+async def buffer_data_stream(
+    frames: AsyncIterator[Any],
+    *,
+    max_bytes: int = 256 * 1024,
+    overflow: BufferOverflow = BufferOverflow.MERGE,
+    spill_dir: str | None = None,
+) -> AsyncGenerator[Any, None]:
+    """
+    Decouples a serialized data stream from the speed of the client reading it.
+
+    The upstream stream (typically `serialize_to_data_stream_protocol` over an LLM response) is
+    drained by a background task at provider speed into a bounded per-stream buffer, so a slow
+    client no longer holds the provider connection and its rate limit slot open.
+
+    Args:
+        frames: Encoded parts, `str` or `bytes`, in data stream protocol format.
+        max_bytes: Size of the in-memory buffer.
+        overflow: What to do with parts that arrive while the buffer is full, see
+            `BufferOverflow`.
+        spill_dir: Directory of the temporary file used by `BufferOverflow.SPILL`.
+
+    Returns:
+        An async generator yielding the same parts, in the same order (merged parts aside).
+    """
+    buffer = _FrameBuffer(max_bytes, overflow, spill_dir)
+    producer = asyncio.create_task(_drain(frames, buffer))
+    try:
+        while True:
+            frame = await buffer.get()
+            if frame is None:
+                break
+            yield frame
+    finally:
+        if not producer.done():
+            producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
+        aclose = getattr(frames, "aclose", None)
+        if aclose is not None:
+            await aclose()
+        buffer.discard()
@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, AsyncIterator, Callable
+
+from pydantic import BaseModel
+
+from langchain_vercel_adapters.stream_protocol.data_stream import message_id, with_message_id
+
+
+def request_key(request: BaseModel | dict[str, Any], **params: Any) -> str:
+    """
+    Returns a canonical hash of a chat request and the model parameters it is answered with.
+
+    Chat and message ids and message timestamps are ignored, so the same conversation sent from
+    two chats maps to the same key. Pass everything else that changes the response (model name,
+    temperature, system prompt, tools...) as `params`.
+    """
+    if isinstance(request, BaseModel):
+        payload = request.model_dump(mode="json", by_alias=True, exclude_none=True)
+    else:
+        payload = dict(request)
+    payload.pop("id", None)
+    payload["messages"] = [
+        {k: v for k, v in message.items() if k not in ("id", "createdAt", "created_at")}
+        for message in payload.get("messages", [])
+    ]
+    canonical = json.dumps(
+        {"request": payload, "params": params},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@dataclass(slots=True)
+class _CachedResponse:
+    frames: list[Any]
+    # seconds between each part and the previous one (the start of the stream for the first)
+    delays: list[float]
+    size: int
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    Caches serialized responses to replay repeated requests without calling the LLM.
+
+    Responses are stored as their sequence of encoded parts, in memory, evicted least recently
+    used first once their total size exceeds `max_bytes`, and after `ttl` seconds. Only streams
+    consumed to their end without error are stored.
+
+    Replayed start step (`f:`) parts carry fresh message ids, so the client never sees two
+    messages with the same id.
+
+    Args:
+        max_bytes: Total size of the cached parts (characters for `str` parts).
+        ttl: Seconds a response stays cached, None to keep it until it is evicted.
+
+    Example:
+        cache = ResponseCache()
+        key = request_key(request, model="claude-3-sonnet-20240229", temperature=0)
+        stream = cache.stream(key, lambda: serialize_to_data_stream_protocol(stream_joke(topic)))
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float | None = 3600.0) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._responses: OrderedDict[str, _CachedResponse] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def __contains__(self, key: str) -> bool:
+        return self._get(key) is not None
+
+    def _get(self, key: str) -> _CachedResponse | None:
+        response = self._responses.get(key)
+        if response is None:
+            return None
+        if response.expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._responses.move_to_end(key)
+        return response
+
+    def _remove(self, key: str) -> None:
+        self.size -= self._responses.pop(key).size
+
+    def _put(self, key: str, frames: list[Any], delays: list[float]) -> None:
+        size = sum(len(frame) for frame in frames)
+        if size > self.max_bytes:
+            return
+        if key in self._responses:
+            self._remove(key)
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        self._responses[key] = _CachedResponse(frames, delays, size, expires_at)
+        self.size += size
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._responses)))
+
+    def invalidate(self, key: str) -> None:
+        if key in self._responses:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._responses.clear()
+        self.size = 0
+
+    def stream(
+        self,
+        key: str,
+        frames: Callable[[], AsyncIterator[Any]],
+        *,
+        pace: bool = False,
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Returns the cached response of `key`, or the response produced by `frames` on a miss.
+
+        Args:
+            key: The cache key, typically from `request_key`.
+            frames: Returns the serialized response, only called on a miss.
+            pace: Replay hits with the delays between parts of the original response instead of
+                all at once.
+        """
+        response = self._get(key)
+        if response is not None:
+            return _replay(response, pace)
+        return self._record(key, frames())
+
+    async def _record(self, key: str, frames: AsyncIterator[Any]) -> AsyncGenerator[Any, None]:
+        recorded: list[Any] = []
+        delays: list[float] = []
+        last = time.monotonic()
+        try:
+            async for frame in frames:
+                # the time upstream took to produce the part, the consumer applying backpressure
+                # while the previous one was yielded is not part of the response's pace
+                delays.append(time.monotonic() - last)
+                recorded.append(frame)
+                yield frame
+                last = time.monotonic()
+        finally:
+            aclose = getattr(frames, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        # not reached when the upstream stream failed or the client disconnected
+        self._put(key, recorded, delays)
+
+
+def _fresh_start_step(frame: Any, message_ids: dict[str, str]) -> Any:
+    original = message_id(frame)
+    if original is None:
+        return frame
+    fresh = message_ids.get(original)
+    if fresh is None:
+        fresh = message_ids[original] = f"run-{uuid.uuid4()}"
+    return with_message_id(frame, fresh)
+
+
+async def _replay(response: _CachedResponse, pace: bool) -> AsyncGenerator[Any, None]:
+    message_ids: dict[str, str] = {}
+    for frame, delay in zip(response.frames, response.delays, strict=True):
+        if pace and delay > 0:
+            await asyncio.sleep(delay)
+        yield _fresh_start_step(frame, message_ids)
@@ -1,14 +1,99 @@
+import asyncio
 import json
-from typing import Any, AsyncGenerator, cast
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from json.encoder import encode_basestring_ascii  # type: ignore[attr-defined]
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    cast,
+)
 
 from langchain_core.messages import AIMessageChunk, ToolCallChunk
+from langchain_core.messages.ai import UsageMetadata
 from pydantic import BaseModel
+from pydantic_core import to_json
 
+from langchain_vercel_adapters.stream_protocol.observer import StreamObserver
+from langchain_vercel_adapters.stream_protocol.partial_json import PartialJSON
+from langchain_vercel_adapters.stream_protocol.recording import DataStreamRecorder
+from langchain_vercel_adapters.stream_protocol.usage import StreamUsage
+from langchain_vercel_adapters.types import DataStreamStringPrefixes
+
+
+@dataclass(slots=True)
+class ToolCall:
+    """
+    A tool call being streamed.
+
+    Argument deltas are appended to `fragments` and only joined once, when the tool call part is
+    written, so accumulating large arguments stays linear in their length. They are parsed as they
+    arrive as well, `parser.value` is the partial arguments at any point.
+    """
 
-class ToolCall(BaseModel):
     id: str
     name: str
-    args: str = ""
+    fragments: list[str] = field(default_factory=list)
+    parser: PartialJSON = field(default_factory=PartialJSON)
+    # set once a delta made the arguments invalid, the tool call is then never written
+    error: ValueError | None = None
+
+    @property
+    def args(self) -> str:
+        if len(self.fragments) > 1:
+            self.fragments[:] = ["".join(self.fragments)]
+        return self.fragments[0] if self.fragments else ""
+
+    def add(self, delta: str) -> None:
+        self.fragments.append(delta)
+        try:
+            self.parser.feed(delta)
+        except ValueError as e:
+            raise self._invalid(e) from e
+
+    def end(self) -> str:
+        """
+        The complete arguments, `{}` for a tool call streamed without any.
+
+        Raises:
+            ValueError: If the arguments are not a valid JSON document, they would otherwise
+                corrupt the tool call part. `add` raises it as well, as soon as a delta makes the
+                arguments invalid.
+        """
+        args = self.args
+        if not args:
+            return "{}"
+        try:
+            if self.parser.size < len(args):
+                # fragments appended directly rather than with `add`
+                self.parser.feed(args[self.parser.size :])
+            self.parser.close()
+        except ValueError as e:
+            raise self._invalid(e) from e
+        return args
+
+    def _invalid(self, error: ValueError) -> ValueError:
+        return ValueError(f"Invalid arguments for tool call {self.id} ({self.name}): {error}")
+
+
+class TextCoalescing(BaseModel):
+    """
+    Opt-in merging of consecutive text deltas into a single text part.
+
+    Buffered text is written as one `0:` part once it reaches `max_bytes` UTF-8 bytes, once the
+    oldest buffered delta has waited `max_latency` seconds, or right before any other part is
+    written. Text is therefore never reordered past a tool call, step or finish part.
+    """
+
+    max_bytes: int = 16 * 1024
+    max_latency: float | None = 0.02
 
 
 def _start_step_part(run_id: str) -> str:
@@ -33,42 +118,53 @@ def _tool_call_delta_part(id: str, delta: str) -> str:
 
 def _tool_call_end(tool_call: ToolCall | None) -> str:
     if tool_call is None:
-        raise ValueError(
-            "Attempting to add a tool call end part without a tool call start part"
-        )
+        raise ValueError("Attempting to add a tool call end part without a tool call start part")
     return '9:{{"toolCallId":{id},"toolName":{name},"args":{args}}}\n'.format(
         id=json.dumps(tool_call.id),
         name=json.dumps(tool_call.name),
-        args=tool_call.args,
+        args=tool_call.end(),
     )
 
 
-def _end_step_part(stop_reason: str, usage_metadata) -> str:
+def _reasoning(text: str) -> str:
+    return "g:{text}\n".format(text=json.dumps(text))
+
+
+def _redacted_reasoning(data: str) -> str:
+    return 'i:{{"data":{data}}}\n'.format(data=json.dumps(data))
+
+
+def _reasoning_signature(signature: str) -> str:
+    return 'j:{{"signature":{signature}}}\n'.format(signature=json.dumps(signature))
+
+
+def _finish_reason(stop_reason: str) -> str:
+    """Maps a provider stop reason onto the finish reasons allowed by the protocol."""
+    if stop_reason in ["tool_use", "tool_calls"]:
+        return "tool-calls"
+    elif stop_reason == "stop":
+        return "stop"
+    elif stop_reason in ["length", "max_tokens"]:
+        return "length"
+    elif stop_reason == "content_filter":
+        return "content-filter"
+    elif stop_reason == "error":
+        return "error"
+    elif stop_reason == "end_turn":
+        return "other"
+    return "unknown"
+
+
+def _end_step_part(stop_reason: str, usage_metadata: UsageMetadata | None) -> str:
     """
     The finish step part needs to come at the end of a step.
 
     Format: e:{finishReason:'stop' | 'length' | 'content-filter' | 'tool-calls' | 'error' | 'other' | 'unknown';
     usage:{promptTokens:number; completionTokens:number;},isContinued:boolean}\n
     """
-    allowed = {
-        "stop",
-        "length",
-        "content-filter",
-        "tool-calls",
-        "error",
-        "other",
-        "unknown",
-    }
-    if stop_reason in ["tool_use", "tool_calls"]:
-        stop_reason = "tool-calls"
-    elif stop_reason == "stop":
-        stop_reason = "stop"
-    elif stop_reason == "end_turn":
-        stop_reason = "other"
-    else:
-        stop_reason = "unknown"
-    prompt_tokens = 0
-    completion_tokens = 0
+    stop_reason = _finish_reason(stop_reason)
+    prompt_tokens = usage_metadata["input_tokens"] if usage_metadata else 0
+    completion_tokens = usage_metadata["output_tokens"] if usage_metadata else 0
     return 'e:{{"finishReason":{stop_reason},"usage":{{"promptTokens":{prompt_tokens},"completionTokens":{completion_tokens}}},"isContinued":false}}\n'.format(
         stop_reason=json.dumps(stop_reason),
         prompt_tokens=json.dumps(prompt_tokens),
@@ -76,8 +172,208 @@ def _end_step_part(stop_reason: str, usage_metadata) -> str:
     )
 
 
-async def serialize_to_data_stream_protocol(
+def _error(message: str) -> str:
+    return "3:{message}\n".format(message=json.dumps(message))
+
+
+def _tool_result(id: str, result: Any) -> str:
+    return 'a:{{"toolCallId":{id},"result":{result}}}\n'.format(
+        id=json.dumps(id), result=to_json(result, fallback=str).decode()
+    )
+
+
+def _finish_message_part(stop_reason: str, usage_metadata: UsageMetadata | None) -> str:
+    """The finish message part ends a response made of one or more steps."""
+    prompt_tokens = usage_metadata["input_tokens"] if usage_metadata else 0
+    completion_tokens = usage_metadata["output_tokens"] if usage_metadata else 0
+    return 'd:{{"finishReason":{stop_reason},"usage":{{"promptTokens":{prompt_tokens},"completionTokens":{completion_tokens}}}}}\n'.format(
+        stop_reason=json.dumps(_finish_reason(stop_reason)),
+        prompt_tokens=json.dumps(prompt_tokens),
+        completion_tokens=json.dumps(completion_tokens),
+    )
+
+
+# Bytes-native counterparts of the part helpers above. Every part is assembled from pre-encoded
+# prefix/suffix constants and strings escaped by the C accelerated JSON string encoder, whose
+# output is pure ASCII, so each helper performs a single formatting allocation per part instead
+# of a `str.format`, several `json.dumps` calls and a final UTF-8 encode in the ASGI server.
+
+
+def _head(prefix: DataStreamStringPrefixes, head: str = "") -> bytes:
+    return f"{prefix.value}:{head}".encode()
+
+
+_START_STEP_HEAD = _head(DataStreamStringPrefixes.START_STEP, '{"messageId":')
+_TEXT_HEAD = _head(DataStreamStringPrefixes.TEXT)
+_ERROR_HEAD = _head(DataStreamStringPrefixes.ERROR)
+_TOOL_CALL_START_HEAD = _head(DataStreamStringPrefixes.TOOL_CALL_STREAMING_START, '{"toolCallId":')
+_TOOL_CALL_DELTA_HEAD = _head(DataStreamStringPrefixes.TOOL_CALL_DELTA, '{"toolCallId":')
+_TOOL_CALL_HEAD = _head(DataStreamStringPrefixes.TOOL_CALL, '{"toolCallId":')
+_TOOL_RESULT_HEAD = _head(DataStreamStringPrefixes.TOOL_RESULT, '{"toolCallId":')
+_FINISH_STEP_HEAD = _head(DataStreamStringPrefixes.FINISH_STEP, '{"finishReason":')
+_FINISH_MESSAGE_HEAD = _head(DataStreamStringPrefixes.FINISH_MESSAGE, '{"finishReason":')
+_REASONING_HEAD = _head(DataStreamStringPrefixes.REASONING)
+_REDACTED_REASONING_HEAD = _head(DataStreamStringPrefixes.REDACTED_REASONING, '{"data":')
+_REASONING_SIGNATURE_HEAD = _head(DataStreamStringPrefixes.REASONING_SIGNATURE, '{"signature":')
+
+
+def _json_string(value: str) -> bytes:
+    return encode_basestring_ascii(value).encode("ascii")
+
+
+@lru_cache(maxsize=1024)
+def _tool_call_delta_head(id: str) -> bytes:
+    # deltas of one tool call share everything up to the delta itself
+    return b'%b%b,"argsTextDelta":' % (_TOOL_CALL_DELTA_HEAD, _json_string(id))
+
+
+def _start_step_part_bytes(run_id: str) -> bytes:
+    return b"%b%b}\n" % (_START_STEP_HEAD, _json_string(run_id))
+
+
+def _text_bytes(text: str) -> bytes:
+    return b"%b%b\n" % (_TEXT_HEAD, _json_string(text))
+
+
+def _tool_call_start_bytes(id: str, name: str) -> bytes:
+    return b'%b%b,"toolName":%b}\n' % (
+        _TOOL_CALL_START_HEAD,
+        _json_string(id),
+        _json_string(name),
+    )
+
+
+def _tool_call_delta_part_bytes(id: str, delta: str) -> bytes:
+    return b"%b%b}\n" % (_tool_call_delta_head(id), _json_string(delta))
+
+
+def _tool_call_end_bytes(tool_call: ToolCall | None) -> bytes:
+    if tool_call is None:
+        raise ValueError("Attempting to add a tool call end part without a tool call start part")
+    return b'%b%b,"toolName":%b,"args":%b}\n' % (
+        _TOOL_CALL_HEAD,
+        _json_string(tool_call.id),
+        _json_string(tool_call.name),
+        tool_call.end().encode(),
+    )
+
+
+def _error_bytes(message: str) -> bytes:
+    return b"%b%b\n" % (_ERROR_HEAD, _json_string(message))
+
+
+def _tool_result_bytes(id: str, result: Any) -> bytes:
+    return b'%b%b,"result":%b}\n' % (
+        _TOOL_RESULT_HEAD,
+        _json_string(id),
+        to_json(result, fallback=str),
+    )
+
+
+def _reasoning_bytes(text: str) -> bytes:
+    return b"%b%b\n" % (_REASONING_HEAD, _json_string(text))
+
+
+def _redacted_reasoning_bytes(data: str) -> bytes:
+    return b"%b%b}\n" % (_REDACTED_REASONING_HEAD, _json_string(data))
+
+
+def _reasoning_signature_bytes(signature: str) -> bytes:
+    return b"%b%b}\n" % (_REASONING_SIGNATURE_HEAD, _json_string(signature))
+
+
+def _end_step_part_bytes(stop_reason: str, usage_metadata: UsageMetadata | None) -> bytes:
+    prompt_tokens = usage_metadata["input_tokens"] if usage_metadata else 0
+    completion_tokens = usage_metadata["output_tokens"] if usage_metadata else 0
+    return b'%b%b,"usage":{"promptTokens":%d,"completionTokens":%d},"isContinued":false}\n' % (
+        _FINISH_STEP_HEAD,
+        _json_string(_finish_reason(stop_reason)),
+        prompt_tokens,
+        completion_tokens,
+    )
+
+
+def _finish_message_part_bytes(stop_reason: str, usage_metadata: UsageMetadata | None) -> bytes:
+    prompt_tokens = usage_metadata["input_tokens"] if usage_metadata else 0
+    completion_tokens = usage_metadata["output_tokens"] if usage_metadata else 0
+    return b'%b%b,"usage":{"promptTokens":%d,"completionTokens":%d}}\n' % (
+        _FINISH_MESSAGE_HEAD,
+        _json_string(_finish_reason(stop_reason)),
+        prompt_tokens,
+        completion_tokens,
+    )
+
+
+def message_id(frame: str | bytes) -> str | None:
+    """Returns the message id of a start step (`f:`) part, None for any other part."""
+    if frame[:2] not in ("f:", b"f:"):
+        return None
+    return json.loads(frame[2:])["messageId"]
+
+
+def with_message_id(frame: str | bytes, message_id: str) -> str | bytes:
+    """Returns a start step part encoded like `frame` (`str` or `bytes`) with another message id."""
+    if isinstance(frame, bytes):
+        return _start_step_part_bytes(message_id)
+    return _start_step_part(message_id)
+
+
+class _FrameEncoder(NamedTuple):
+    """The set of part helpers a serializer writes its frames with (all `str` or all `bytes`)."""
+
+    start_step: Callable[[str], Any]
+    text: Callable[[str], Any]
+    tool_call_start: Callable[[str, str], Any]
+    tool_call_delta: Callable[[str, str], Any]
+    tool_call_end: Callable[[ToolCall | None], Any]
+    tool_result: Callable[[str, Any], Any]
+    error: Callable[[str], Any]
+    end_step: Callable[[str, UsageMetadata | None], Any]
+    finish_message: Callable[[str, UsageMetadata | None], Any]
+    reasoning: Callable[[str], Any]
+    redacted_reasoning: Callable[[str], Any]
+    reasoning_signature: Callable[[str], Any]
+
+
+_STR_ENCODER = _FrameEncoder(
+    start_step=_start_step_part,
+    text=_text,
+    tool_call_start=_tool_call_start,
+    tool_call_delta=_tool_call_delta_part,
+    tool_call_end=_tool_call_end,
+    tool_result=_tool_result,
+    error=_error,
+    end_step=_end_step_part,
+    finish_message=_finish_message_part,
+    reasoning=_reasoning,
+    redacted_reasoning=_redacted_reasoning,
+    reasoning_signature=_reasoning_signature,
+)
+
+_BYTES_ENCODER = _FrameEncoder(
+    start_step=_start_step_part_bytes,
+    text=_text_bytes,
+    tool_call_start=_tool_call_start_bytes,
+    tool_call_delta=_tool_call_delta_part_bytes,
+    tool_call_end=_tool_call_end_bytes,
+    tool_result=_tool_result_bytes,
+    error=_error_bytes,
+    end_step=_end_step_part_bytes,
+    finish_message=_finish_message_part_bytes,
+    reasoning=_reasoning_bytes,
+    redacted_reasoning=_redacted_reasoning_bytes,
+    reasoning_signature=_reasoning_signature_bytes,
+)
+
+
+def serialize_to_data_stream_protocol(
     stream: AsyncGenerator[AIMessageChunk, None],
+    *,
+    coalesce: TextCoalescing | None = None,
+    observer: StreamObserver | None = None,
+    usage: StreamUsage | None = None,
+    recorder: DataStreamRecorder | None = None,
+    interleaved: bool = False,
 ) -> AsyncGenerator[str, None]:
     """
     Serializes an async stream of AIMessageChunks into Vercel AI SDK's data stream protocol format.
@@ -88,6 +384,20 @@ async def serialize_to_data_stream_protocol(
 
     Args:
         stream: An async generator that yields AIMessageChunk objects from an LLM.
+        coalesce: When set, consecutive text deltas of a step are merged into fewer text parts,
+            trading a bounded amount of latency for far fewer writes per response.
+        observer: Receives timestamped events (steps, first token, tool calls, chunk gaps and
+            emitted parts) to attribute latency to the provider or to the pipeline.
+        usage: Accumulates the token usage reported by the chunks, per step and in total. The
+            usage of a step is also written in its finish step part.
+        recorder: Tees the parts into a recording file, appended once the stream is consumed to
+            its end.
+        interleaved: Whether the stream interleaves the chunks of concurrent runs, e.g. of the
+            parallel branches of a LangGraph graph. Every run, told apart by the ids of its
+            chunks, then keeps its own state and is written as its own step: the parts of the
+            oldest open run are written as they arrive, and once it ends, the runs that ended
+            meanwhile are written in the order they ended before the next oldest open run takes
+            over. The parts of the other runs are buffered in memory until then.
 
     Returns:
         An async generator yielding strings formatted according to Vercel's data stream protocol.
@@ -95,90 +405,640 @@ async def serialize_to_data_stream_protocol(
     References:
         https://sdk.vercel.ai/docs/ai-sdk-ui/stream-protocol#tool-call-streaming-start-part
     """
+    return _serialize(
+        stream,
+        _STR_ENCODER,
+        coalesce,
+        observer,
+        usage,
+        recorder,
+        feed=_feed_run if interleaved else _feed,
+    )
+
+
+def serialize_to_data_stream_protocol_bytes(
+    stream: AsyncGenerator[AIMessageChunk, None],
+    *,
+    coalesce: TextCoalescing | None = None,
+    observer: StreamObserver | None = None,
+    usage: StreamUsage | None = None,
+    recorder: DataStreamRecorder | None = None,
+    interleaved: bool = False,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Bytes-native variant of `serialize_to_data_stream_protocol`.
+
+    Yields the exact same parts, already UTF-8 encoded, so ASGI servers can write them without
+    re-encoding every frame. Prefer it in the hot path of high concurrency deployments.
+    """
+    return _serialize(
+        stream,
+        _BYTES_ENCODER,
+        coalesce,
+        observer,
+        usage,
+        recorder,
+        feed=_feed_run if interleaved else _feed,
+    )
+
+
+def serialize_to_data_stream_protocol_sync(
+    stream: Iterator[AIMessageChunk],
+    *,
+    coalesce: TextCoalescing | None = None,
+    observer: StreamObserver | None = None,
+    usage: StreamUsage | None = None,
+    recorder: DataStreamRecorder | None = None,
+    interleaved: bool = False,
+) -> Generator[str, None, None]:
+    """
+    Synchronous variant of `serialize_to_data_stream_protocol`, for `llm.stream(...)`.
+
+    Yields the exact same parts without an event loop, for thread-based WSGI workers (Flask,
+    Django). As the stream cannot be waited on with a timeout, `coalesce.max_latency` is only
+    checked when a chunk arrives.
+    """
+    return _serialize_sync(
+        stream,
+        _STR_ENCODER,
+        coalesce,
+        observer,
+        usage,
+        recorder,
+        feed=_feed_run if interleaved else _feed,
+    )
+
+
+def serialize_to_data_stream_protocol_bytes_sync(
+    stream: Iterator[AIMessageChunk],
+    *,
+    coalesce: TextCoalescing | None = None,
+    observer: StreamObserver | None = None,
+    usage: StreamUsage | None = None,
+    recorder: DataStreamRecorder | None = None,
+    interleaved: bool = False,
+) -> Generator[bytes, None, None]:
+    """Bytes-native variant of `serialize_to_data_stream_protocol_sync`."""
+    return _serialize_sync(
+        stream,
+        _BYTES_ENCODER,
+        coalesce,
+        observer,
+        usage,
+        recorder,
+        feed=_feed_run if interleaved else _feed,
+    )
+
+
+@dataclass(slots=True)
+class _StreamState:
+    """The state of one serialized stream, updated in place by `_feed`."""
+
+    encoder: _FrameEncoder
+    # max UTF-8 bytes of buffered text before it is flushed, None when coalescing is off
+    coalesce_max_bytes: int | None = None
+    # timestamps buffered text when coalescing is bounded by latency
+    clock: Callable[[], float] | None = None
+    observer: StreamObserver | None = None
+    usage: StreamUsage = field(default_factory=StreamUsage)
+    # parts produced since the driver last drained them
+    frames: list[Any] = field(default_factory=list)
+
     # a new ID signals the beggining of a new "step"
     # i.e., one LLM API call in the backend
-    step_id = None
-    current_tool_call: ToolCall | None = None
+    step_id: str | None = None
+    # the tool calls of the step still streaming, by tool call index, in the order they started
+    tool_calls: dict[int | None, ToolCall] = field(default_factory=dict)
+    current_index: int | None = 0
+    current_type: str | None = None
+    # whether a text or reasoning delta was seen in the current step, only tracked for the observer
+    seen_text: bool = False
+    # usage reported by the chunks of the current step so far
+    step_usage: UsageMetadata | None = None
+    # whether an error part was written in the current step, which then finishes with an error
+    step_failed: bool = False
+    # indexes of the tool calls of the current step whose tool call part was written
+    closed_tool_call_indexes: set[int | None] = field(default_factory=set)
+    # ids of the tool call parts written in the current step, events serializers remove them as
+    # their results arrive and hold the finish step part back until then
+    step_tool_call_ids: set[str] = field(default_factory=set)
+    # the stop reason of the current step, its finish step part is written once the trailing
+    # usage-only chunks some providers send after the stop reason have been accounted for
+    stop_reason: str | None = None
 
-    current_index = 0
-    current_type = None
+    # text deltas waiting to be merged into a single text part (coalescing mode only)
+    pending_text: list[str] = field(default_factory=list)
+    pending_size: int = 0
+    # when the oldest text delta still waiting in `pending_text` was buffered
+    pending_since: float = 0.0
+    # signature of the thinking block being streamed, written once the block ends
+    pending_signature: list[str] = field(default_factory=list)
 
-    async for chunk in stream:
-        run_id = chunk.id
+    # interleaved runs only: the state of every run still open, by run id in the order they
+    # started. The parts of the live run, the oldest one, are written as they arrive. Those of
+    # the others are buffered in their state, and those of the runs that ended while the live run
+    # was still open are held in `held`, until the live run ends, so steps never overlap.
+    runs: dict[str | None, "_StreamState"] = field(default_factory=dict)
+    ended_runs: set[str | None] = field(default_factory=set)
+    live: "_StreamState | None" = None
+    held: list[Any] = field(default_factory=list)
+    # the runs that stopped but still wait for their usage, in the order they stopped
+    stopped_runs: dict[str | None, None] = field(default_factory=dict)
 
-        # if the run_id is different from the step_id, we need to start a new step
-        if isinstance(run_id, str) and run_id != step_id:
-            yield _start_step_part(run_id)
-            step_id = run_id
-            # reset the state
-            current_index = 0
-            current_type = None
-            current_tool_call = None
-
-        content = chunk.content
-
-        if isinstance(content, str):
-            # if the content is empty and there is a stop reason, we need to end the step
-            if content:
-                yield _text(content)
-                current_type = "text"
-
-            response_metadata = chunk.response_metadata
-            stop_reason = None
-            fields = ["stop_reason", "finish_reason"]
-            for field in fields:
-                if field in response_metadata:
-                    stop_reason = response_metadata[field]
-            if stop_reason is not None:
-                # if we are stopping and the last content was a tool call, we need to end the tool call
-                if current_type == "tool_call":
-                    yield _tool_call_end(current_tool_call)
-                yield _end_step_part(stop_reason, chunk.usage_metadata or {})
-
-        elif isinstance(content, list):
-            for x in content:
-                if isinstance(x, str):
-                    current_type = "text"
-                    yield _text(x)
-                    continue
-
-                x = cast(dict[str, Any], x)
-
-                # this will be the case for the text part
-                if x["type"] == "text":
-                    current_type = "text"
-                    current_index = x["index"]
-                    yield _text(x["text"])
 
-        else:
-            raise ValueError(f"Invalid content type: {type(content)}")
+def _flush_text(state: _StreamState) -> None:
+    state.frames.append(state.encoder.text("".join(state.pending_text)))
+    state.pending_text.clear()
+    state.pending_size = 0
 
-        tool_call_chunks: list[ToolCallChunk] = chunk.tool_call_chunks
 
-        for x in tool_call_chunks:
-            if any(
-                [
-                    current_index is not None
-                    and x["index"] != current_index
-                    and current_type == "tool_call",
-                ]
-            ):
-                yield _tool_call_end(current_tool_call)
+def _first_token(state: _StreamState) -> None:
+    if state.observer is not None and not state.seen_text:
+        state.seen_text = True
+        state.observer.on_first_token(state.step_id, time.perf_counter())
+
+
+def _add_text(state: _StreamState, text: str) -> None:
+    if state.pending_signature:
+        _end_reasoning(state)
+    state.current_type = "text"
+    _first_token(state)
+    if state.coalesce_max_bytes is None:
+        state.frames.append(state.encoder.text(text))
+        return
+    if not state.pending_text and state.clock is not None:
+        state.pending_since = state.clock()
+    state.pending_text.append(text)
+    # the UTF-8 length, without encoding the text when it is ASCII
+    state.pending_size += len(text) if text.isascii() else len(text.encode())
+    if state.pending_size >= state.coalesce_max_bytes:
+        _flush_text(state)
+
+
+def _add_reasoning(state: _StreamState, block: dict[str, Any]) -> None:
+    """Writes the deltas of a thinking block as they arrive, its signature once it ends."""
+    if state.pending_signature and block["index"] != state.current_index:
+        _end_reasoning(state)
+    if state.pending_text:
+        _flush_text(state)
+    state.current_index = block["index"]
+    state.current_type = "reasoning"
+    thinking = block.get("thinking")
+    if thinking:
+        _first_token(state)
+        state.frames.append(state.encoder.reasoning(thinking))
+    signature = block.get("signature")
+    if signature:
+        state.pending_signature.append(signature)
+
+
+def _add_redacted_reasoning(state: _StreamState, block: dict[str, Any]) -> None:
+    if state.pending_signature:
+        _end_reasoning(state)
+    if state.pending_text:
+        _flush_text(state)
+    state.current_index = block["index"]
+    state.current_type = "reasoning"
+    state.frames.append(state.encoder.redacted_reasoning(block["data"]))
+
+
+def _end_reasoning(state: _StreamState) -> None:
+    state.frames.append(state.encoder.reasoning_signature("".join(state.pending_signature)))
+    state.pending_signature.clear()
+
+
+def _start_tool_call(state: _StreamState, index: int | None, id: str, name: str) -> ToolCall:
+    if index in state.tool_calls:
+        # a new tool call reusing the index of one still streaming, which is therefore complete
+        _end_tool_call(state, index)
+    tool_call = state.tool_calls[index] = ToolCall(id=id, name=name)
+    state.frames.append(state.encoder.tool_call_start(id, name))
+    if state.observer is not None:
+        state.observer.on_tool_call_start(id, name, time.perf_counter())
+    return tool_call
+
+
+def _tool_call_error(state: _StreamState, tool_call: ToolCall, error: ValueError) -> None:
+    """Writes an error part in place of a tool call whose arguments are invalid."""
+    tool_call.error = error
+    state.step_failed = True
+    state.frames.append(state.encoder.error(str(error)))
+
+
+def _end_tool_call(state: _StreamState, index: int | None) -> None:
+    tool_call = state.tool_calls.pop(index)
+    state.closed_tool_call_indexes.add(index)
+    if tool_call.error is not None:
+        return
+    try:
+        frame = state.encoder.tool_call_end(tool_call)
+    except ValueError as e:
+        # e.g. arguments cut short by the end of the step
+        _tool_call_error(state, tool_call, e)
+        return
+    state.frames.append(frame)
+    state.step_tool_call_ids.add(tool_call.id)
+    if state.observer is not None:
+        state.observer.on_tool_call_end(
+            tool_call.id, tool_call.name, len(tool_call.args.encode()), time.perf_counter()
+        )
+
+
+def _end_tool_calls(state: _StreamState) -> None:
+    """Writes the tool call parts of the tool calls still streaming, at the end of a step."""
+    for index in list(state.tool_calls):
+        _end_tool_call(state, index)
+
+
+def _end_step(state: _StreamState) -> None:
+    stop_reason = "error" if state.step_failed else cast(str, state.stop_reason)
+    state.stop_reason = None
+    state.frames.append(state.encoder.end_step(stop_reason, state.step_usage))
+    if state.observer is not None:
+        state.observer.on_step_end(state.step_id, _finish_reason(stop_reason), time.perf_counter())
+
+
+def _finish(state: _StreamState) -> None:
+    """Writes the parts still held back once the upstream stream is exhausted."""
+    # the live run is the oldest one, every run is written once it ended
+    for run_id in list(state.runs):
+        _end_run(state, run_id)
+    if state.pending_text:
+        _flush_text(state)
+    if state.pending_signature:
+        _end_reasoning(state)
+    if state.tool_calls:
+        _end_tool_calls(state)
+    if state.stop_reason is not None:
+        _end_step(state)
+
+
+def _feed(state: _StreamState, chunk: AIMessageChunk, step_id: str | None = None) -> None:
+    """
+    Appends the parts produced by one chunk to `state.frames`.
+
+    Steps are delimited by the ids of the chunks, or by `step_id` when given.
+    """
+    frames = state.frames
+    encoder = state.encoder
+    run_id = chunk.id if step_id is None else step_id
+    new_step = isinstance(run_id, str) and run_id != state.step_id
+    usage_metadata = chunk.usage_metadata
+
+    if state.stop_reason is not None:
+        if usage_metadata and not new_step:
+            state.step_usage = state.usage.add(state.step_id, usage_metadata)
+            usage_metadata = None
+        _end_step(state)
+
+    # if the run_id is different from the step_id, we need to start a new step
+    if new_step:
+        run_id = cast(str, run_id)
+        if state.pending_text:
+            _flush_text(state)
+        if state.pending_signature:
+            _end_reasoning(state)
+        if state.tool_calls:
+            _end_tool_calls(state)
+        frames.append(encoder.start_step(run_id))
+        state.step_id = run_id
+        # reset the state
+        state.current_index = 0
+        state.current_type = None
+        state.seen_text = False
+        state.step_usage = None
+        state.step_failed = False
+        state.step_tool_call_ids.clear()
+        state.closed_tool_call_indexes.clear()
+        if state.observer is not None:
+            state.observer.on_step_start(run_id, time.perf_counter())
+
+    if usage_metadata:
+        state.step_usage = state.usage.add(state.step_id, usage_metadata)
 
-            # this condition marks the start of a tool call
-            if x["name"] is not None:
-                id_ = x["id"] or ""
-                current_tool_call = ToolCall(id=id_, name=x["name"])
-                yield _tool_call_start(id_, x["name"])
+    content = chunk.content
 
-            if current_tool_call is None:
+    if isinstance(content, str):
+        # if the content is empty and there is a stop reason, we need to end the step
+        if content:
+            _add_text(state, content)
+
+        response_metadata = chunk.response_metadata
+        stop_reason = None
+        fields = ["stop_reason", "finish_reason"]
+        for field_name in fields:
+            if field_name in response_metadata:
+                stop_reason = response_metadata[field_name]
+        if stop_reason is not None:
+            if state.pending_text:
+                _flush_text(state)
+            if state.pending_signature:
+                _end_reasoning(state)
+            # every tool call of the step is complete once it stops
+            if state.tool_calls:
+                _end_tool_calls(state)
+            state.stop_reason = stop_reason
+
+    elif isinstance(content, list):
+        for x in content:
+            if isinstance(x, str):
+                _add_text(state, x)
+                continue
+
+            x = cast(dict[str, Any], x)
+
+            # this will be the case for the text part
+            if x["type"] == "text":
+                state.current_index = x["index"]
+                _add_text(state, x["text"])
+            elif x["type"] == "thinking":
+                _add_reasoning(state, x)
+            elif x["type"] == "redacted_thinking":
+                _add_redacted_reasoning(state, x)
+
+    else:
+        raise ValueError(f"Invalid content type: {type(content)}")
+
+    tool_call_chunks: list[ToolCallChunk] = chunk.tool_call_chunks
+
+    if tool_call_chunks and state.pending_text:
+        _flush_text(state)
+    if tool_call_chunks and state.pending_signature:
+        _end_reasoning(state)
+
+    for x in tool_call_chunks:
+        index = x["index"]
+        if state.current_type == "tool_call" and index != state.current_index:
+            # tool calls streamed one after the other end when the next one starts, interleaved
+            # (parallel) ones stay open until the end of the step as long as their arguments
+            # are incomplete
+            previous = state.tool_calls.get(state.current_index)
+            if previous is not None and previous.parser.complete:
+                _end_tool_call(state, state.current_index)
+
+        # a name marks the start of a tool call
+        tool_call = (
+            _start_tool_call(state, index, x["id"] or "", x["name"])
+            if x["name"] is not None
+            else state.tool_calls.get(index)
+        )
+        args = x["args"] or ""
+        if tool_call is None:
+            if index not in state.closed_tool_call_indexes:
                 raise ValueError(
                     "Attempting to add a tool call delta part without a tool call start part"
                 )
-            args = x["args"] or ""
-            yield _tool_call_delta_part(current_tool_call.id, args)
-            # we update the tool call args in place
-            current_tool_call.args += args
+            # a late delta of a tool call whose part was written early, once its arguments were
+            # complete: blanks change nothing, anything else can no longer be written
+            if args.strip():
+                state.step_failed = True
+                frames.append(
+                    encoder.error(f"Invalid arguments for the tool call at index {index}: {args!r}")
+                )
+            continue
+        # deltas are validated before they are written, the rest of an invalid tool call is dropped
+        if tool_call.error is None:
+            try:
+                if args:
+                    tool_call.add(args)
+            except ValueError as e:
+                _tool_call_error(state, tool_call, e)
+            else:
+                frames.append(encoder.tool_call_delta(tool_call.id, args))
+                if args and state.observer is not None:
+                    state.observer.on_tool_call_delta(
+                        tool_call.id, tool_call.name, tool_call.parser, time.perf_counter()
+                    )
+
+        state.current_index = index
+        state.current_type = "tool_call"
+
+
+def _end_run(state: _StreamState, run_id: str | None) -> None:
+    """
+    Ends a run, writing its step right away if it is the live run and holding it back otherwise.
+
+    Once the live run ends, the runs that ended meanwhile are written in the order they ended and
+    the oldest run still open becomes the live one.
+    """
+    run = state.runs.pop(run_id)
+    state.stopped_runs.pop(run_id, None)
+    _finish(run)
+    state.ended_runs.add(run_id)
+    if run is not state.live:
+        state.held.extend(run.frames)
+        return
+    state.live = None
+    if state.held:
+        state.frames.extend(state.held)
+        state.held.clear()
+    if state.runs:
+        _go_live(state, next(iter(state.runs.values())))
+
+
+def _go_live(state: _StreamState, run: _StreamState) -> None:
+    """Makes `run` the live run, whose parts are written as they arrive."""
+    if run.frames:
+        state.frames.extend(run.frames)
+    # the run writes its parts straight into the frames drained by the driver from now on
+    run.frames = state.frames
+    state.live = run
+
+
+def _run_state(
+    state: _StreamState, chunk: AIMessageChunk, run_id: str | None
+) -> _StreamState | None:
+    """The state of the run of a chunk, created if the run is new, None if it already ended."""
+    run = state.runs.get(run_id)
+    if run is not None:
+        return run
+    if run_id in state.ended_runs:
+        # usage sent after the run already ended
+        if chunk.usage_metadata:
+            state.usage.add(run_id, chunk.usage_metadata)
+        return None
+    run = state.runs[run_id] = _StreamState(
+        encoder=state.encoder,
+        coalesce_max_bytes=state.coalesce_max_bytes,
+        clock=state.clock,
+        observer=state.observer,
+        usage=state.usage,
+    )
+    if state.live is None:
+        _go_live(state, run)
+    return run
+
+
+def _feed_run(state: _StreamState, chunk: AIMessageChunk, run_id: str | None = None) -> None:
+    """
+    Feeds a chunk of one of several runs streamed concurrently to the state of its run.
+
+    Runs are told apart by the ids of the chunks, or by `run_id` when given. A run ends once both
+    its stop reason and its usage are known, or once a chunk of another run (or another chunk of
+    its own, like a trailing usage-only one) follows its stop reason. Usage sent after that is
+    still added to `state.usage`, but not to the finish step part already written.
+    """
+    if run_id is None:
+        run_id = chunk.id
+    if state.stopped_runs:
+        # providers sending no usage would otherwise keep a stopped run, and every run started
+        # after it, held back until the end of the stream
+        for stopped_id in [x for x in state.stopped_runs if x != run_id]:
+            _end_run(state, stopped_id)
+    run = _run_state(state, chunk, run_id)
+    if run is None:
+        return
+
+    stopped = run.stop_reason is not None
+    _feed(run, chunk, run_id)
+    if stopped or (run.stop_reason is not None and run.step_usage is not None):
+        _end_run(state, run_id)
+    elif run.stop_reason is not None:
+        state.stopped_runs[run_id] = None
+
+
+async def _serialize(
+    stream: AsyncIterable[Any],
+    encoder: _FrameEncoder,
+    coalesce: TextCoalescing | None,
+    observer: StreamObserver | None = None,
+    usage: StreamUsage | None = None,
+    recorder: DataStreamRecorder | None = None,
+    feed: Callable[[_StreamState, Any], None] = _feed,
+) -> AsyncGenerator[Any, None]:
+    loop = asyncio.get_running_loop()
+    max_latency = coalesce.max_latency if coalesce is not None else None
+    state = _StreamState(
+        encoder=encoder,
+        coalesce_max_bytes=coalesce.max_bytes if coalesce is not None else None,
+        clock=loop.time if max_latency is not None else None,
+        observer=observer,
+        usage=usage if usage is not None else StreamUsage(),
+    )
+    frames = state.frames
+    record = recorder.record() if recorder is not None else None
+
+    iterator = aiter(stream)
+    # the in-flight read of the next chunk, kept across latency flushes so no chunk is lost
+    next_chunk: asyncio.Future[AIMessageChunk] | None = None
+    exhausted = False
+
+    if observer is not None:
+        last_chunk_at = time.perf_counter()
+        observer.on_stream_start(last_chunk_at)
+
+    try:
+        while not exhausted:
+            chunk = None
+            # with interleaved runs, the buffered text that is waiting is that of the live run
+            text_state = state if state.live is None else state.live
+            pending_text = text_state.pending_text
+            if next_chunk is None and not (pending_text and max_latency is not None):
+                try:
+                    chunk = await anext(iterator)
+                except StopAsyncIteration:
+                    exhausted = True
+            else:
+                if next_chunk is None:
+                    next_chunk = asyncio.ensure_future(anext(iterator))
+                if pending_text and max_latency is not None:
+                    timeout = max(text_state.pending_since + max_latency - loop.time(), 0)
+                    await asyncio.wait((next_chunk,), timeout=timeout)
+                if next_chunk.done() or not pending_text:
+                    read, next_chunk = next_chunk, None
+                    try:
+                        chunk = await read
+                    except StopAsyncIteration:
+                        exhausted = True
+                else:
+                    # the latency window elapsed before the next chunk arrived
+                    _flush_text(text_state)
+
+            if chunk is not None:
+                if observer is not None:
+                    now = time.perf_counter()
+                    observer.on_chunk(now - last_chunk_at, now)
+                    last_chunk_at = now
+                feed(state, chunk)
+
+            if exhausted:
+                _finish(state)
+
+            if frames:
+                for frame in frames:
+                    if observer is not None:
+                        observer.on_frame(len(frame), time.perf_counter())
+                    if record is not None:
+                        record.add(frame)
+                    yield frame
+                frames.clear()
+
+        if observer is not None:
+            observer.on_stream_end(time.perf_counter())
+        if record is not None:
+            await record.aclose()
+    finally:
+        if next_chunk is not None:
+            next_chunk.cancel()
+
+
+def _serialize_sync(
+    stream: Iterable[Any],
+    encoder: _FrameEncoder,
+    coalesce: TextCoalescing | None,
+    observer: StreamObserver | None = None,
+    usage: StreamUsage | None = None,
+    recorder: DataStreamRecorder | None = None,
+    feed: Callable[[_StreamState, Any], None] = _feed,
+) -> Generator[Any, None, None]:
+    """The loop of `_serialize` driving the same state machine without an event loop."""
+    max_latency = coalesce.max_latency if coalesce is not None else None
+    clock = time.monotonic
+    state = _StreamState(
+        encoder=encoder,
+        coalesce_max_bytes=coalesce.max_bytes if coalesce is not None else None,
+        clock=clock if max_latency is not None else None,
+        observer=observer,
+        usage=usage if usage is not None else StreamUsage(),
+    )
+    frames = state.frames
+    record = recorder.record() if recorder is not None else None
+
+    if observer is not None:
+        last_chunk_at = time.perf_counter()
+        observer.on_stream_start(last_chunk_at)
+
+    iterator = iter(stream)
+    exhausted = False
+    while not exhausted:
+        chunk = next(iterator, None)
+        if chunk is None:
+            exhausted = True
+            _finish(state)
+        else:
+            if observer is not None:
+                now = time.perf_counter()
+                observer.on_chunk(now - last_chunk_at, now)
+                last_chunk_at = now
+            feed(state, chunk)
+            text_state = state if state.live is None else state.live
+            if (
+                text_state.pending_text
+                and max_latency is not None
+                and clock() - text_state.pending_since >= max_latency
+            ):
+                _flush_text(text_state)
+
+        if frames:
+            for frame in frames:
+                if observer is not None:
+                    observer.on_frame(len(frame), time.perf_counter())
+                if record is not None:
+                    record.add(frame)
+                yield frame
+            frames.clear()
 
-            current_index = x["index"]
-            current_type = "tool_call"
+    if observer is not None:
+        observer.on_stream_end(time.perf_counter())
+    if record is not None:
+        record.close()
@@ -0,0 +1,238 @@
+from typing import Any, AsyncGenerator, AsyncIterable, Callable, Collection
+
+from langchain_core.messages import AIMessageChunk, ToolMessage
+
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    _BYTES_ENCODER,
+    _STR_ENCODER,
+    TextCoalescing,
+    _end_reasoning,
+    _end_run,
+    _end_step,
+    _end_tool_calls,
+    _feed,
+    _flush_text,
+    _FrameEncoder,
+    _run_state,
+    _serialize,
+    _StreamState,
+)
+from langchain_vercel_adapters.stream_protocol.observer import StreamObserver
+from langchain_vercel_adapters.stream_protocol.recording import DataStreamRecorder
+from langchain_vercel_adapters.stream_protocol.usage import StreamUsage
+
+Event = dict[str, Any]
+
+
+def _add_held_usage(state: _StreamState, chunk: AIMessageChunk, run_id: str) -> bool:
+    """
+    Adds the usage of a usage-only chunk sent after the stop reason of a step whose finish step
+    part waits for its tool results, without ending the step as `_feed` would.
+    """
+    if (
+        state.stop_reason is None
+        or not state.step_tool_call_ids
+        or run_id != state.step_id
+        or chunk.content
+        or chunk.tool_call_chunks
+    ):
+        return False
+    if chunk.usage_metadata:
+        state.step_usage = state.usage.add(state.step_id, chunk.usage_metadata)
+    return True
+
+
+def _on_chat_model_stream(state: _StreamState, event: Event) -> None:
+    # every chat model run is a step
+    chunk = event["data"]["chunk"]
+    if not _add_held_usage(state, chunk, event["run_id"]):
+        _feed(state, chunk, event["run_id"])
+
+
+def _on_chat_model_end(state: _StreamState, event: Event) -> None:
+    """
+    Ends the step of a chat model run without waiting for the next one to start.
+
+    The finish step part of a run that made tool calls is held back until their results arrive,
+    or until the next run starts, as the AI SDK expects the results before it.
+    """
+    if event["run_id"] != state.step_id:
+        return
+    if state.pending_text:
+        _flush_text(state)
+    if state.pending_signature:
+        _end_reasoning(state)
+    if state.tool_calls:
+        _end_tool_calls(state)
+    if state.stop_reason is not None and not state.step_tool_call_ids:
+        _end_step(state)
+
+
+def _on_tool_end(state: _StreamState, event: Event) -> None:
+    output = event["data"].get("output")
+    # tools called with a tool call, like in LangGraph's `ToolNode`, return a `ToolMessage`,
+    # others cannot be matched with the tool call part they answer
+    if not isinstance(output, ToolMessage):
+        return
+    if state.pending_text:
+        _flush_text(state)
+    state.frames.append(state.encoder.tool_result(output.tool_call_id, output.content))
+    state.step_tool_call_ids.discard(output.tool_call_id)
+    if state.stop_reason is not None and not state.step_tool_call_ids:
+        _end_step(state)
+
+
+def _on_interleaved_chat_model_stream(state: _StreamState, event: Event) -> None:
+    # runs end with their `on_chat_model_end` event, not with the chunks of the other runs
+    chunk = event["data"]["chunk"]
+    run_id = event["run_id"]
+    run = _run_state(state, chunk, run_id)
+    if run is not None and not _add_held_usage(run, chunk, run_id):
+        _feed(run, chunk, run_id)
+
+
+def _on_interleaved_chat_model_end(state: _StreamState, event: Event) -> None:
+    run_id = event["run_id"]
+    run = state.runs.get(run_id)
+    if run is None:
+        return
+    _on_chat_model_end(run, event)
+    # a run waiting for its tool results ends with the last of them
+    if run.stop_reason is None or not run.step_tool_call_ids:
+        _end_run(state, run_id)
+
+
+def _on_interleaved_tool_end(state: _StreamState, event: Event) -> None:
+    output = event["data"].get("output")
+    if not isinstance(output, ToolMessage):
+        return
+    result = state.encoder.tool_result(output.tool_call_id, output.content)
+    for run_id, run in state.runs.items():
+        if run.stop_reason is not None and output.tool_call_id in run.step_tool_call_ids:
+            # in the step of the run that made the tool call, before its finish step part
+            run.frames.append(result)
+            run.step_tool_call_ids.discard(output.tool_call_id)
+            if not run.step_tool_call_ids:
+                _end_run(state, run_id)
+            return
+    # the run already ended, the result goes right behind the parts written or held, never
+    # inside the step of the live run
+    frames = state.held if state.live is not None else state.frames
+    frames.append(result)
+
+
+_Handler = Callable[[_StreamState, Event], None]
+
+_HANDLERS: dict[str, _Handler] = {
+    "on_chat_model_stream": _on_chat_model_stream,
+    "on_chat_model_end": _on_chat_model_end,
+    "on_tool_end": _on_tool_end,
+}
+
+# chat model runs streamed concurrently, e.g. by the parallel branches of a graph
+_INTERLEAVED_HANDLERS: dict[str, _Handler] = {
+    "on_chat_model_stream": _on_interleaved_chat_model_stream,
+    "on_chat_model_end": _on_interleaved_chat_model_end,
+    "on_tool_end": _on_interleaved_tool_end,
+}
+
+
+def _feed_event(state: _StreamState, event: Event) -> None:
+    _HANDLERS[event["event"]](state, event)
+
+
+def _feed_interleaved_event(state: _StreamState, event: Event) -> None:
+    _INTERLEAVED_HANDLERS[event["event"]](state, event)
+
+
+async def _relevant_events(
+    events: AsyncIterable[Event], nodes: Collection[str] | None
+) -> AsyncGenerator[Event, None]:
+    """Skips the events that produce no part, most of them (chain and node starts and ends)."""
+    handlers = _HANDLERS
+    async for event in events:
+        if event["event"] in handlers and (
+            nodes is None or event.get("metadata", {}).get("langgraph_node") in nodes
+        ):
+            yield event
+
+
+def _serialize_events(
+    events: AsyncIterable[Event],
+    encoder: _FrameEncoder,
+    nodes: Collection[str] | None,
+    coalesce: TextCoalescing | None,
+    observer: StreamObserver | None,
+    usage: StreamUsage | None,
+    recorder: DataStreamRecorder | None,
+    interleaved: bool,
+) -> AsyncGenerator[Any, None]:
+    return _serialize(
+        _relevant_events(events, nodes),
+        encoder,
+        coalesce,
+        observer,
+        usage,
+        recorder,
+        feed=_feed_interleaved_event if interleaved else _feed_event,
+    )
+
+
+def serialize_events_to_data_stream_protocol(
+    events: AsyncIterable[Event],
+    *,
+    nodes: Collection[str] | None = None,
+    coalesce: TextCoalescing | None = None,
+    observer: StreamObserver | None = None,
+    usage: StreamUsage | None = None,
+    recorder: DataStreamRecorder | None = None,
+    interleaved: bool = False,
+) -> AsyncGenerator[str, None]:
+    """
+    Serializes the output of `astream_events(version="v2")`, of a LangChain runnable or a
+    LangGraph graph, into Vercel AI SDK's data stream protocol format.
+
+    Every chat model run is a step: its `on_chat_model_stream` chunks are serialized like
+    `serialize_to_data_stream_protocol` does and its finish step part is written as soon as the
+    run ends, or once the results of its tool calls are written. The `on_tool_end` events of tools
+    called with a tool call (as LangGraph's `ToolNode` does) are written as tool result parts.
+    Other events are skipped.
+
+    Args:
+        events: The event stream.
+        nodes: When set, only the events of these LangGraph nodes are serialized, e.g.
+            `{"agent", "tools"}` to leave out a router model. `include_names` and `include_tags`
+            of `astream_events` filter events as well.
+        coalesce: See `serialize_to_data_stream_protocol`.
+        observer: See `serialize_to_data_stream_protocol`, events count as chunks.
+        usage: See `serialize_to_data_stream_protocol`.
+        recorder: See `serialize_to_data_stream_protocol`.
+        interleaved: Whether chat model runs stream concurrently, e.g. in the parallel branches
+            of a graph. Every run then keeps its own state and is written as its own step, the
+            oldest open run as it streams and the others once it ends (see
+            `serialize_to_data_stream_protocol`). A run ends with its `on_chat_model_end` event,
+            or with the results of its tool calls, which are written before its finish step part.
+
+    Example:
+        events = graph.astream_events({"messages": messages}, version="v2")
+        return StreamingResponse(serialize_events_to_data_stream_protocol(events))
+    """
+    return _serialize_events(
+        events, _STR_ENCODER, nodes, coalesce, observer, usage, recorder, interleaved
+    )
+
+
+def serialize_events_to_data_stream_protocol_bytes(
+    events: AsyncIterable[Event],
+    *,
+    nodes: Collection[str] | None = None,
+    coalesce: TextCoalescing | None = None,
+    observer: StreamObserver | None = None,
+    usage: StreamUsage | None = None,
+    recorder: DataStreamRecorder | None = None,
+    interleaved: bool = False,
+) -> AsyncGenerator[bytes, None]:
+    """Bytes-native variant of `serialize_events_to_data_stream_protocol`."""
+    return _serialize_events(
+        events, _BYTES_ENCODER, nodes, coalesce, observer, usage, recorder, interleaved
+    )
@@ -0,0 +1,116 @@
+import asyncio
+import binascii
+import functools
+import os
+from typing import AsyncGenerator, AsyncIterable
+
+from langchain_vercel_adapters.stream_protocol.data_stream import _head, _json_string
+from langchain_vercel_adapters.types import DataStreamStringPrefixes
+
+FileSource = bytes | bytearray | memoryview | str | os.PathLike[str] | AsyncIterable[bytes]
+
+_FILE_HEAD = _head(DataStreamStringPrefixes.FILE, '{"data":"')
+
+
+def _encode(block: memoryview) -> bytes:
+    return binascii.b2a_base64(block, newline=False)
+
+
+async def _encoded_blocks(
+    blocks: AsyncIterable[memoryview], offload_after: int | None
+) -> AsyncGenerator[bytes, None]:
+    # blocks are encoded in the executor once more than `offload_after` bytes were seen
+    loop = asyncio.get_running_loop()
+    size = 0
+    async for block in blocks:
+        size += len(block)
+        if offload_after is not None and size > offload_after:
+            yield await loop.run_in_executor(None, _encode, block)
+        else:
+            yield _encode(block)
+
+
+async def _memory_blocks(data: memoryview, block_size: int) -> AsyncGenerator[memoryview, None]:
+    for i in range(0, len(data), block_size):
+        yield data[i : i + block_size]
+
+
+async def _file_blocks(
+    path: str | os.PathLike[str], block_size: int, offload: bool
+) -> AsyncGenerator[memoryview, None]:
+    loop = asyncio.get_running_loop()
+    with open(path, "rb") as f:
+        read = functools.partial(f.read, block_size)
+        while True:
+            block = await loop.run_in_executor(None, read) if offload else read()
+            if not block:
+                return
+            yield memoryview(block)
+
+
+async def _iterator_blocks(
+    chunks: AsyncIterable[bytes], block_size: int
+) -> AsyncGenerator[memoryview, None]:
+    # regroups arbitrary chunks into blocks of `block_size` bytes, a multiple of 3, base64 encoding
+    # each block separately then produces the same text as encoding the whole payload at once
+    pending = bytearray()
+    async for chunk in chunks:
+        pending += chunk
+        # a chunk larger than the block size is split, memory stays bounded by the block size
+        while len(pending) >= block_size:
+            yield memoryview(bytes(pending[:block_size]))
+            del pending[:block_size]
+    if pending:
+        yield memoryview(bytes(pending))
+
+
+async def stream_file_part(
+    source: FileSource,
+    mime_type: str,
+    *,
+    block_size: int = 192 * 1024,
+    offload_threshold: int = 1024 * 1024,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Streams a file (`k:`) part, for images and other files generated during a response.
+
+    The protocol carries a file as a single part, so the part is yielded as a sequence of byte
+    chunks that only form one line once concatenated: the head, one base64 chunk per
+    `block_size` bytes of the file, and the tail. Memory stays bounded by the block size whatever
+    the size of the file, and blocks are encoded from `memoryview`s of the source without copies.
+
+    Chain it after the bytes serializer, or anything else writing whole lines, in the body of the
+    response. Consumers that expect one part per item, like `DataStreamRecorder`, should join the
+    chunks first.
+
+    Args:
+        source: The file contents, the path of a file, or an async iterator of bytes.
+        mime_type: The IANA media type of the file.
+        block_size: Bytes encoded per chunk, rounded down to a multiple of 3.
+        offload_threshold: Files larger than this are read and encoded in the default thread
+            pool executor, so a multi-megabyte payload does not block the event loop. The size of
+            an async iterator is unknown, its blocks are encoded in the executor once more than
+            `offload_threshold` bytes were read (the iterator itself is awaited on the loop).
+    """
+    block_size = max(block_size - block_size % 3, 3)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = memoryview(source).cast("B")
+        offload_after = 0 if len(data) > offload_threshold else None
+        blocks = _memory_blocks(data, block_size)
+    elif isinstance(source, (str, os.PathLike)):
+        offload = os.path.getsize(source) > offload_threshold
+        offload_after = 0 if offload else None
+        blocks = _file_blocks(source, block_size, offload)
+    else:
+        offload_after = offload_threshold
+        blocks = _iterator_blocks(source, block_size)
+
+    yield _FILE_HEAD
+    async for encoded in _encoded_blocks(blocks, offload_after):
+        yield encoded
+    yield b'","mimeType":%b}\n' % _json_string(mime_type)
+
+
+async def file_part(source: FileSource, mime_type: str) -> bytes:
+    """A whole file (`k:`) part, for small files and consumers that need one part per item."""
+    return b"".join([chunk async for chunk in stream_file_part(source, mime_type)])
@@ -0,0 +1,125 @@
+from dataclasses import dataclass, field
+
+from langchain_vercel_adapters.stream_protocol.partial_json import PartialJSON
+
+
+class StreamObserver:
+    """
+    Receives timestamped events while a stream is serialized.
+
+    Every method is a no-op, subclasses override the events they care about. Timestamps are
+    `time.perf_counter()` seconds. Events are delivered synchronously from the serializer, so
+    implementations should only record what they need and return quickly.
+    """
+
+    def on_stream_start(self, timestamp: float) -> None:
+        """The serializer started pulling chunks from the upstream stream."""
+
+    def on_chunk(self, gap: float, timestamp: float) -> None:
+        """A chunk arrived, `gap` seconds after the previous one (or the stream start)."""
+
+    def on_step_start(self, step_id: str, timestamp: float) -> None:
+        """A step (one LLM call) started and its start step part was produced."""
+
+    def on_first_token(self, step_id: str | None, timestamp: float) -> None:
+        """The first text or reasoning delta of a step arrived from the provider."""
+
+    def on_tool_call_start(self, tool_call_id: str, tool_name: str, timestamp: float) -> None:
+        """A tool call started streaming."""
+
+    def on_tool_call_delta(
+        self, tool_call_id: str, tool_name: str, args: PartialJSON, timestamp: float
+    ) -> None:
+        """
+        A delta of the arguments of a tool call arrived.
+
+        `args.value` is the arguments parsed so far, e.g. to start work on a known path before the
+        whole file content is streamed. Reading it costs the length of the string being streamed,
+        so read it only when needed.
+        """
+
+    def on_tool_call_end(
+        self, tool_call_id: str, tool_name: str, args_bytes: int, timestamp: float
+    ) -> None:
+        """A tool call completed with `args_bytes` bytes of UTF-8 encoded arguments."""
+
+    def on_step_end(self, step_id: str | None, finish_reason: str, timestamp: float) -> None:
+        """The finish step part of a step was produced."""
+
+    def on_frame(self, size: int, timestamp: float) -> None:
+        """
+        A part was handed to the consumer of the serializer.
+
+        `size` is the length of the part, in bytes for the bytes serializer and in characters for
+        the `str` one (the same thing except for non-ASCII tool call arguments).
+        """
+
+    def on_stream_end(self, timestamp: float) -> None:
+        """The upstream stream was exhausted and every part was handed to the consumer."""
+
+
+@dataclass
+class StreamTimings(StreamObserver):
+    """
+    A `StreamObserver` that records the timings of one stream.
+
+    `time_to_first_token` and `chunk_gaps` describe the provider, while the gap between a chunk
+    arriving and its parts being handed out (`frames_bytes` over time) describes our pipeline.
+    """
+
+    started_at: float | None = None
+    ended_at: float | None = None
+    first_token_at: float | None = None
+    chunk_gaps: list[float] = field(default_factory=list)
+    # step id -> (start, end) timestamps, end is None while the step is running
+    steps: dict[str, tuple[float, float | None]] = field(default_factory=dict)
+    # tool call id -> (start, end) timestamps and the size of the arguments in bytes
+    tool_calls: dict[str, tuple[float, float | None, int]] = field(default_factory=dict)
+    frames: int = 0
+    frames_bytes: int = 0
+
+    @property
+    def time_to_first_token(self) -> float | None:
+        if self.started_at is None or self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started_at
+
+    @property
+    def duration(self) -> float | None:
+        if self.started_at is None or self.ended_at is None:
+            return None
+        return self.ended_at - self.started_at
+
+    def on_stream_start(self, timestamp: float) -> None:
+        self.started_at = timestamp
+
+    def on_chunk(self, gap: float, timestamp: float) -> None:
+        self.chunk_gaps.append(gap)
+
+    def on_step_start(self, step_id: str, timestamp: float) -> None:
+        self.steps[step_id] = (timestamp, None)
+
+    def on_first_token(self, step_id: str | None, timestamp: float) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = timestamp
+
+    def on_tool_call_start(self, tool_call_id: str, tool_name: str, timestamp: float) -> None:
+        self.tool_calls[tool_call_id] = (timestamp, None, 0)
+
+    def on_tool_call_end(
+        self, tool_call_id: str, tool_name: str, args_bytes: int, timestamp: float
+    ) -> None:
+        start = self.tool_calls.get(tool_call_id, (timestamp, None, 0))[0]
+        self.tool_calls[tool_call_id] = (start, timestamp, args_bytes)
+
+    def on_step_end(self, step_id: str | None, finish_reason: str, timestamp: float) -> None:
+        if step_id is not None:
+            start = self.steps.get(step_id, (timestamp, None))[0]
+            self.steps[step_id] = (start, timestamp)
+
+    def on_frame(self, size: int, timestamp: float) -> None:
+        self.frames += 1
+        self.frames_bytes += size
+
+    def on_stream_end(self, timestamp: float) -> None:
+        self.ended_at = timestamp
@@ -0,0 +1,166 @@
+import json
+from typing import Any, AsyncGenerator, AsyncIterable, Iterator
+
+from pydantic import BaseModel
+
+from langchain_vercel_adapters.types import (
+    DataStreamStringPrefixes,
+    FileData,
+    FinishMessage,
+    FinishStep,
+    LanguageModelV1Source,
+    ReasoningSignature,
+    RedactedReasoning,
+    StartStep,
+    ToolCallDelta,
+    ToolCallPart,
+    ToolCallStreamingStart,
+    ToolResultPart,
+)
+
+# the model the JSON payload of each part is validated into, the others are plain JSON values
+_MODELS: dict[DataStreamStringPrefixes, type[BaseModel]] = {
+    DataStreamStringPrefixes.TOOL_CALL: ToolCallPart,
+    DataStreamStringPrefixes.TOOL_RESULT: ToolResultPart,
+    DataStreamStringPrefixes.TOOL_CALL_STREAMING_START: ToolCallStreamingStart,
+    DataStreamStringPrefixes.TOOL_CALL_DELTA: ToolCallDelta,
+    DataStreamStringPrefixes.FINISH_MESSAGE: FinishMessage,
+    DataStreamStringPrefixes.FINISH_STEP: FinishStep,
+    DataStreamStringPrefixes.START_STEP: StartStep,
+    DataStreamStringPrefixes.SOURCE: LanguageModelV1Source,
+    DataStreamStringPrefixes.REDACTED_REASONING: RedactedReasoning,
+    DataStreamStringPrefixes.REASONING_SIGNATURE: ReasoningSignature,
+    DataStreamStringPrefixes.FILE: FileData,
+}
+
+_PREFIXES = {ord(prefix.value): prefix for prefix in DataStreamStringPrefixes}
+
+
+class DataStreamPart:
+    """
+    One part of a data stream, decoded lazily.
+
+    `payload` is a view of the JSON after the prefix, in the buffer the part was read from. It is
+    only decoded when `json()` or `parse()` is called, so forwarding or filtering parts by `type`
+    never pays for JSON decoding or validation.
+    """
+
+    __slots__ = ("type", "payload")
+
+    def __init__(self, type: DataStreamStringPrefixes, payload: memoryview) -> None:
+        self.type = type
+        self.payload = payload
+
+    def __repr__(self) -> str:
+        return f"DataStreamPart({self.type.name}, {bytes(self.payload)!r})"
+
+    def __bytes__(self) -> bytes:
+        """The part as written on the wire, newline included."""
+        return b"%s:%b\n" % (self.type.value.encode(), self.payload)
+
+    def json(self) -> Any:
+        """The decoded JSON payload."""
+        return json.loads(self.payload.tobytes())
+
+    def parse(self) -> Any:
+        """
+        The payload validated into its model from `types`, e.g. a `StartStep` for a `f:` part.
+
+        Parts without a model (text, reasoning, errors, data and annotations) return their
+        decoded JSON value.
+        """
+        model = _MODELS.get(self.type)
+        if model is None:
+            return self.json()
+        return model.model_validate_json(self.payload.tobytes())
+
+
+class DataStreamParser:
+    """
+    Incremental parser of the data stream protocol.
+
+    Accepts the stream in arbitrary chunks, split anywhere (including inside a multi-byte UTF-8
+    sequence), and returns the parts completed by each chunk. Lines are located over the chunk
+    itself and handed out as `memoryview` slices of it, only a line spanning several chunks is
+    copied, once, when it completes.
+
+    Example:
+        parser = DataStreamParser()
+        async for chunk in response.aiter_bytes():
+            for part in parser.feed(chunk):
+                ...
+        parser.close()
+    """
+
+    def __init__(self) -> None:
+        # the start of a line whose newline has not been received yet
+        self._pending = bytearray()
+
+    def feed(self, data: bytes | str) -> Iterator[DataStreamPart]:
+        """
+        Returns the parts completed by `data`.
+
+        The parts are produced as the returned iterator is consumed, it must be exhausted before
+        the next chunk is fed.
+
+        Raises:
+            ValueError: When iterated, if a line has no known prefix.
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        view = memoryview(data)
+        start = 0
+        end = data.find(b"\n")
+        if self._pending:
+            if end == -1:
+                self._pending += view
+                return
+            self._pending += view[:end]
+            line = bytes(self._pending)
+            self._pending.clear()
+            if line:
+                yield _part(memoryview(line))
+            start = end + 1
+            end = data.find(b"\n", start)
+        while end != -1:
+            if end > start:
+                yield _part(view[start:end])
+            start = end + 1
+            end = data.find(b"\n", start)
+        if start < len(data):
+            self._pending += view[start:]
+
+    def close(self) -> None:
+        """
+        Checks the stream ended on a part boundary.
+
+        Raises:
+            ValueError: If the last part is incomplete.
+        """
+        if self._pending:
+            pending = bytes(self._pending[:32])
+            self._pending.clear()
+            raise ValueError(f"The data stream ended in the middle of a part: {pending!r}")
+
+
+def _part(line: memoryview) -> DataStreamPart:
+    prefix = _PREFIXES.get(line[0])
+    if prefix is None or len(line) < 2 or line[1] != 0x3A:  # ":"
+        raise ValueError(f"Invalid data stream part: {line[:32].tobytes()!r}")
+    return DataStreamPart(prefix, line[2:])
+
+
+async def parse_data_stream(
+    stream: AsyncIterable[bytes | str],
+) -> AsyncGenerator[DataStreamPart, None]:
+    """
+    Parses a data stream read in arbitrary chunks, e.g. the body of an HTTP response.
+
+    Raises:
+        ValueError: If a line has no known prefix or the stream ends in the middle of a part.
+    """
+    parser = DataStreamParser()
+    async for chunk in stream:
+        for part in parser.feed(chunk):
+            yield part
+    parser.close()
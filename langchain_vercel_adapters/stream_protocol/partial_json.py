@@ -0,0 +1,277 @@
+import json
+import re
+from typing import Any
+
+# states of the parser, what the next token may be
+_VALUE = 0
+_VALUE_OR_END = 1  # right after `[`
+_KEY = 2
+_KEY_OR_END = 3  # right after `{`
+_COLON = 4
+_COMMA_OR_END = 5
+_DONE = 6
+
+_WHITESPACE = " \t\n\r"
+_SCALAR = re.compile(r"[-+.0-9eEtruefalsn]*")
+# the characters ending a string or starting an escape sequence, everything else is copied as is
+_STRING_SPECIAL = re.compile(r'["\\\x00-\x1f]')
+# a `\uXXXX` escape of a high surrogate, decoded together with the low surrogate following it
+_HIGH_SURROGATE = re.compile(r"\\u[dD][89abAB][0-9a-fA-F]{2}")
+_MISSING: Any = object()
+
+
+def _escape_size(escape: str) -> int | None:
+    """The length of the escape sequence `escape` starts with, None if more is needed to tell."""
+    if len(escape) < 2:
+        return None
+    if escape[1] != "u":
+        return 2
+    if len(escape) < 6:
+        return None
+    if not _HIGH_SURROGATE.fullmatch(escape, 0, 6):
+        return 6
+    if len(escape) < 8:
+        return None if escape.startswith("\\u"[: len(escape) - 6], 6) else 6
+    if escape[6:8] != "\\u":
+        return 6
+    return None if len(escape) < 12 else 12
+
+
+class PartialJSON:
+    """
+    An incremental JSON parser for arguments streamed in fragments, like tool call deltas.
+
+    Each fragment is scanned once, so parsing a document costs O(its length) however it is split,
+    instead of re-parsing the whole prefix on every delta. The document being built is available
+    at any point as `value`: containers are included as soon as they are opened and strings as they
+    grow, numbers and literals once they are complete, keys once their value started.
+
+    Example:
+        parser = PartialJSON()
+        parser.feed('{"city": "Zür')
+        parser.value  # {"city": "Zür"}
+        parser.feed('ich", "days": 3}')
+        parser.close()  # {"city": "Zürich", "days": 3}
+    """
+
+    def __init__(self) -> None:
+        self.size = 0
+        self._state = _VALUE
+        self._root: Any = _MISSING
+        # the open containers, innermost last, with the key being filled in each open object
+        self._stack: list[Any] = []
+        self._keys: list[str | None] = []
+        # the string being read: its decoded parts, the raw escape sequence split across
+        # fragments and whether it is an object key
+        self._string: list[str] | None = None
+        self._escape = ""
+        self._is_key = False
+        # the number or literal being read, it can be split across fragments as well
+        self._scalar = ""
+
+    @property
+    def value(self) -> Any:
+        """The document parsed so far, None before its first token."""
+        if self._string is not None and not self._is_key:
+            self._string[:] = ["".join(self._string)]
+            self._set(self._string[0])
+        return None if self._root is _MISSING else self._root
+
+    @property
+    def complete(self) -> bool:
+        # a top-level string is added, and the document done, as soon as it opens
+        return self._state == _DONE and not self._scalar and self._string is None
+
+    def feed(self, fragment: str) -> None:
+        """
+        Parses the next fragment of the document.
+
+        Raises:
+            ValueError: If the fragment makes the document invalid.
+        """
+        i = 0
+        end = len(fragment)
+        while i < end:
+            if self._string is not None:
+                i = self._read_string(fragment, i)
+                continue
+            if self._scalar:
+                i = self._read_scalar(fragment, i)
+                continue
+
+            char = fragment[i]
+            if char in _WHITESPACE:
+                i += 1
+                continue
+            state = self._state
+            if state <= _VALUE_OR_END:
+                if char == "]" and state == _VALUE_OR_END:
+                    self._close_container(fragment, i, list)
+                elif char == "{":
+                    self._open({})
+                    self._state = _KEY_OR_END
+                elif char == "[":
+                    self._open([])
+                    self._state = _VALUE_OR_END
+                elif char == '"':
+                    self._add("")
+                    self._string = []
+                    self._is_key = False
+                elif char in "-0123456789tfn":
+                    self._scalar = char
+                else:
+                    self._error(fragment, i)
+            elif state <= _KEY_OR_END:
+                if char == '"':
+                    self._string = []
+                    self._is_key = True
+                elif char == "}" and state == _KEY_OR_END:
+                    self._close_container(fragment, i, dict)
+                else:
+                    self._error(fragment, i)
+            elif state == _COLON:
+                if char != ":":
+                    self._error(fragment, i)
+                self._state = _VALUE
+            elif state == _COMMA_OR_END:
+                container = self._stack[-1]
+                if char == ",":
+                    self._state = _KEY if isinstance(container, dict) else _VALUE
+                elif char in "]}":
+                    self._close_container(fragment, i, list if char == "]" else dict)
+                else:
+                    self._error(fragment, i)
+            else:
+                self._error(fragment, i)
+            i += 1
+        self.size += end
+
+    def close(self) -> Any:
+        """
+        Returns the complete document.
+
+        Raises:
+            ValueError: If the document is incomplete.
+        """
+        if self._scalar:
+            self._end_scalar()
+        if self._state != _DONE or self._string is not None:
+            raise ValueError(f"Incomplete JSON document after {self.size} characters")
+        return self._root
+
+    def _error(self, fragment: str, i: int) -> None:
+        raise ValueError(f"Invalid JSON at character {self.size + i}: unexpected {fragment[i]!r}")
+
+    def _add(self, value: Any) -> None:
+        if not self._stack:
+            self._root = value
+            self._state = _DONE
+            return
+        container = self._stack[-1]
+        if isinstance(container, list):
+            container.append(value)
+        else:
+            container[self._keys[-1]] = value
+        self._state = _COMMA_OR_END
+
+    def _set(self, value: Any) -> None:
+        """Replaces the value added last, i.e. the string being read."""
+        if not self._stack:
+            self._root = value
+        elif isinstance(container := self._stack[-1], list):
+            container[-1] = value
+        else:
+            container[self._keys[-1]] = value
+
+    def _open(self, container: Any) -> None:
+        self._add(container)
+        self._stack.append(container)
+        self._keys.append(None)
+
+    def _close_container(self, fragment: str, i: int, kind: type) -> None:
+        if not isinstance(self._stack[-1], kind):
+            self._error(fragment, i)
+        self._stack.pop()
+        self._keys.pop()
+        self._state = _COMMA_OR_END if self._stack else _DONE
+
+    def _read_string(self, fragment: str, i: int) -> int:
+        """Reads string contents from `fragment[i:]`, returns where the string ends or `len`."""
+        parts = self._string
+        assert parts is not None
+        end = len(fragment)
+        if self._escape:
+            # complete the escape sequence split across fragments before anything else
+            i = self._read_escape(fragment, i)
+        while i < end and not self._escape:
+            match = _STRING_SPECIAL.search(fragment, i)
+            if match is None:
+                parts.append(fragment[i:])
+                return end
+            j = match.start()
+            if j > i:
+                parts.append(fragment[i:j])
+            char = fragment[j]
+            if char == '"':
+                self._end_string()
+                return j + 1
+            if char != "\\":
+                # raw line breaks would also split the part they are written in
+                self._error(fragment, j)
+            self._escape = char
+            i = self._read_escape(fragment, j + 1)
+        return i
+
+    def _read_escape(self, fragment: str, i: int) -> int:
+        """Adds to the escape sequence being read, decodes it once complete."""
+        assert self._string is not None
+        escape = self._escape
+        end = len(fragment)
+        while True:
+            size = _escape_size(escape)
+            if size is None:
+                if i == end:
+                    self._escape = escape
+                    return i
+                escape += fragment[i]
+                i += 1
+                continue
+            try:
+                self._string.append(json.loads(f'"{escape[:size]}"'))
+            except ValueError:
+                raise ValueError(
+                    f"Invalid JSON escape sequence {escape[:size]!r} at character {self.size + i}"
+                ) from None
+            escape = escape[size:]
+            if not escape.startswith("\\"):
+                # a lone high surrogate was followed by a regular character, read it again
+                self._escape = ""
+                return i - len(escape)
+
+    def _end_string(self) -> None:
+        assert self._string is not None
+        string = "".join(self._string)
+        self._string = None
+        if self._is_key:
+            self._keys[-1] = string
+            self._state = _COLON
+        else:
+            self._set(string)
+
+    def _read_scalar(self, fragment: str, i: int) -> int:
+        match = _SCALAR.match(fragment, i)
+        assert match is not None
+        self._scalar += match.group()
+        if match.end() == len(fragment):
+            return match.end()
+        self._end_scalar()
+        return match.end()
+
+    def _end_scalar(self) -> None:
+        scalar = self._scalar
+        self._scalar = ""
+        try:
+            value = json.loads(scalar)
+        except ValueError:
+            raise ValueError(f"Invalid JSON value {scalar!r}") from None
+        self._add(value)
@@ -0,0 +1,306 @@
+import asyncio
+import json
+import mmap
+import os
+import threading
+import time
+from typing import Any, AsyncGenerator, Iterator
+
+# File layout, all integers are unsigned LEB128 varints:
+#
+#   header:  MAGIC, version byte, flags byte
+#   stream:  STREAM_START, id length, id, then its parts, then STREAM_END
+#   part:    prefix byte (e.g. b"0"), payload length, payload (the JSON after `0:`, without the
+#            newline), then the microseconds since the previous part if FLAG_TIMESTAMPS is set
+#
+# Streams are appended as contiguous blocks once they end. The index, `<path>.idx`, lists the
+# id, offset and length of every block. Blocks it is missing (it is written after the block) are
+# found by scanning the file past the last indexed one, the whole file is scanned when the index
+# is missing or does not match the file.
+MAGIC = b"LVDS"
+VERSION = 1
+FLAG_TIMESTAMPS = 0x01
+STREAM_START = 0x01
+STREAM_END = 0x00
+_HEADER_SIZE = len(MAGIC) + 2
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: Any, position: int) -> tuple[int, int]:
+    """Returns the varint at `position` and the position after it."""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+class StreamRecord:
+    """
+    The recording of one serialized stream, appended to its file once the stream ends.
+
+    Created by `DataStreamRecorder.record`, or by the serializer when given a recorder.
+    """
+
+    def __init__(self, recorder: "DataStreamRecorder", stream_id: str | None = None) -> None:
+        self._recorder = recorder
+        self.stream_id = stream_id
+        self._data = bytearray()
+        self._last = time.perf_counter()
+
+    def add(self, frame: str | bytes) -> None:
+        if isinstance(frame, str):
+            frame = frame.encode()
+        if self.stream_id is None and frame[:2] == b"f:":
+            self.stream_id = json.loads(frame[2:])["messageId"]
+        data = self._data
+        data.append(frame[0])
+        payload = memoryview(frame)[2:-1]
+        _write_varint(data, len(payload))
+        data += payload
+        if self._recorder.timestamps:
+            now = time.perf_counter()
+            _write_varint(data, round((now - self._last) * 1e6))
+            self._last = now
+
+    def close(self) -> None:
+        """Appends the stream to the recording."""
+        self._recorder._append(self.stream_id or "", self._data)
+
+    async def aclose(self) -> None:
+        """Appends the stream to the recording in the default thread pool, off the event loop."""
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._recorder._append, self.stream_id or "", self._data
+        )
+
+
+class DataStreamRecorder:
+    """
+    Appends serialized streams to a compact recording file, for load tests and offline replay.
+
+    Parts are stored as a prefix byte, a varint length and the JSON payload, about the size of
+    the stream itself, with optional per-part timing. Pass the recorder to the serializer to tee
+    every stream it serializes into the file, streams that fail or are not consumed to their end
+    are not recorded. Read the file with `DataStreamRecording`.
+
+    Args:
+        path: The recording file, created if needed, appended to otherwise.
+        timestamps: Whether to store the delay before every part, to replay with its pacing.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], timestamps: bool = True) -> None:
+        self.path = os.fspath(path)
+        self.timestamps = timestamps
+        flags = FLAG_TIMESTAMPS if timestamps else 0
+        self._file = open(self.path, "ab+")
+        self._file.seek(0)
+        header = self._file.read(_HEADER_SIZE)
+        if not header:
+            self._file.write(MAGIC + bytes([VERSION, flags]))
+            self._file.flush()
+        elif header[:4] != MAGIC or header[4] != VERSION:
+            self._file.close()
+            raise ValueError(f"{self.path} is not a data stream recording")
+        elif header[5] != flags:
+            self._file.close()
+            raise ValueError(f"{self.path} was recorded with timestamps={not timestamps}")
+        self._index = open(self.path + ".idx", "ab")
+        # streams ending together are appended from several threads
+        self._lock = threading.Lock()
+
+    def record(self, stream_id: str | None = None) -> StreamRecord:
+        """
+        Starts recording a stream, appended to the file when the record is closed.
+
+        Args:
+            stream_id: Defaults to the message id of the stream's first start step part.
+        """
+        return StreamRecord(self, stream_id)
+
+    def _append(self, stream_id: str, frames: bytearray) -> None:
+        block = bytearray([STREAM_START])
+        encoded_id = stream_id.encode()
+        _write_varint(block, len(encoded_id))
+        block += encoded_id
+        block += frames
+        block.append(STREAM_END)
+
+        with self._lock:
+            offset = self._file.seek(0, os.SEEK_END)
+            self._file.write(block)
+            self._file.flush()
+
+            entry = bytearray()
+            _write_varint(entry, len(encoded_id))
+            entry += encoded_id
+            _write_varint(entry, offset)
+            _write_varint(entry, len(block))
+            self._index.write(entry)
+            self._index.flush()
+
+    def close(self) -> None:
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self) -> "DataStreamRecorder":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class DataStreamRecording:
+    """
+    Reads a recording written by `DataStreamRecorder`, memory-mapped.
+
+    Only the index is loaded, parts are read from the mapping as streams are replayed, so files
+    far larger than memory replay fine. Replayed parts are the exact `bytes` the serializer wrote.
+    When the same stream id was recorded several times, the latest recording is replayed.
+
+    Raises:
+        ValueError: If the file is not a recording or is corrupted.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = self._mmap[:_HEADER_SIZE]
+        if header[:4] != MAGIC or header[4] != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a data stream recording")
+        self.timestamps = bool(header[5] & FLAG_TIMESTAMPS)
+        # (stream id, offset, length) of every stream, in recording order
+        self.streams = self._read_index()
+        # blocks appended before the mapping was made but not indexed yet
+        end = self.streams[-1][1] + self.streams[-1][2] if self.streams else _HEADER_SIZE
+        self.streams += self._scan(end)
+        self._by_id = {stream_id: i for i, (stream_id, _, _) in enumerate(self.streams)}
+
+    def _read_index(self) -> list[tuple[str, int, int]]:
+        """The indexed streams, an empty list to scan the whole file when the index is unusable."""
+        try:
+            with open(self.path + ".idx", "rb") as f:
+                index = f.read()
+        except FileNotFoundError:
+            return []
+        data = self._mmap
+        streams = []
+        position = 0
+        end = _HEADER_SIZE
+        try:
+            while position < len(index):
+                length, position = _read_varint(index, position)
+                stream_id = index[position : position + length].decode()
+                offset, position = _read_varint(index, position + length)
+                size, position = _read_varint(index, position)
+                if position > len(index):
+                    raise IndexError
+                if offset + size > len(data):
+                    # appended after the mapping was made
+                    break
+                # blocks are contiguous, each entry must describe the block right after the last
+                if (
+                    offset != end
+                    or data[offset] != STREAM_START
+                    or data[offset + size - 1] != STREAM_END
+                ):
+                    return []
+                streams.append((stream_id, offset, size))
+                end = offset + size
+        except (IndexError, UnicodeDecodeError):
+            # the last entry is being written, the scan finds its block
+            pass
+        return streams
+
+    def _scan(self, position: int) -> list[tuple[str, int, int]]:
+        """The streams of the blocks from `position` on, up to a block still being written."""
+        data = self._mmap
+        streams = []
+        while position < len(data):
+            offset = position
+            if data[position] != STREAM_START:
+                raise ValueError(f"{self.path} is corrupted at offset {position}")
+            try:
+                length, position = _read_varint(data, position + 1)
+                stream_id = data[position : position + length].decode()
+                position += length
+                while data[position] != STREAM_END:
+                    size, position = _read_varint(data, position + 1)
+                    position += size
+                    if self.timestamps:
+                        _, position = _read_varint(data, position)
+            except IndexError:
+                break
+            position += 1
+            streams.append((stream_id, offset, position - offset))
+        return streams
+
+    def __len__(self) -> int:
+        return len(self.streams)
+
+    def __contains__(self, stream: str) -> bool:
+        return stream in self._by_id
+
+    def _parts(self, stream: str | int) -> Iterator[tuple[bytes, float]]:
+        _, offset, _ = self.streams[self._by_id[stream] if isinstance(stream, str) else stream]
+        data = self._mmap
+        length, position = _read_varint(data, offset + 1)
+        position += length
+        timestamps = self.timestamps
+        delay = 0.0
+        while data[position] != STREAM_END:
+            prefix = data[position]
+            size, position = _read_varint(data, position + 1)
+            # no view is held while the part is yielded, so the recording can be closed meanwhile
+            with memoryview(data) as view:
+                frame = b"%c:%b\n" % (prefix, view[position : position + size])
+            position += size
+            if timestamps:
+                delay_us, position = _read_varint(data, position)
+                delay = delay_us / 1e6
+            yield frame, delay
+
+    def frames(self, stream: str | int) -> Iterator[bytes]:
+        """
+        Iterates the parts of a stream, given its id or its position in the recording.
+
+        Raises:
+            KeyError: If no stream was recorded with this id.
+            IndexError: If there is no stream at this position.
+        """
+        for frame, _ in self._parts(stream):
+            yield frame
+
+    async def replay(self, stream: str | int, pace: bool = False) -> AsyncGenerator[bytes, None]:
+        """
+        Replays the parts of a stream, e.g. as the body of a `StreamingResponse`.
+
+        Args:
+            stream: The id of the stream or its position in the recording.
+            pace: Wait the recorded delay before every part, requires a recording made with
+                timestamps.
+        """
+        for frame, delay in self._parts(stream):
+            if pace and delay > 0:
+                await asyncio.sleep(delay)
+            yield frame
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> "DataStreamRecording":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncGenerator, AsyncIterator, Callable
+
+from langchain_vercel_adapters.stream_protocol.broadcast import DataStreamBroadcast
+from langchain_vercel_adapters.stream_protocol.data_stream import message_id
+
+
+class ResumableStreams:
+    """
+    Keeps recent responses around so clients can reconnect without re-running the LLM.
+
+    Every recorded stream is consumed by a background task into a bounded ring buffer of parts,
+    whether or not a client is reading it. A client whose connection dropped reconnects with the
+    number of parts it already received (its offset) and gets the rest, live while the response
+    is still generated and for `ttl` seconds after it finished.
+
+    Streams are keyed by the message ids of their start step (`f:`) parts, and by the explicit
+    `stream_id` given to `record`, if any.
+
+    Args:
+        max_frames: Number of parts retained per stream.
+        ttl: Seconds a finished stream stays resumable.
+        max_streams: Number of streams retained, running or finished. The oldest finished ones
+            are evicted first, then the oldest running ones, which keep being generated for
+            their first client but can no longer be resumed.
+    """
+
+    def __init__(self, max_frames: int = 10_000, ttl: float = 60.0, max_streams: int = 1_000):
+        self.max_frames = max_frames
+        self.ttl = ttl
+        self.max_streams = max_streams
+        self._streams: dict[str, DataStreamBroadcast] = {}
+        # every key of a stream, to forget them together, in the order the streams started
+        self._keys: dict[DataStreamBroadcast, list[str]] = {}
+        # finished streams by expiry time, which is also their finish order
+        self._expiries: deque[tuple[float, DataStreamBroadcast]] = deque()
+
+    def __contains__(self, stream_id: str) -> bool:
+        self._evict()
+        return stream_id in self._streams
+
+    def record(
+        self, frames: AsyncIterator[Any], stream_id: str | None = None
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Starts recording a serialized stream and returns the stream for the first client.
+
+        The upstream stream keeps being consumed if that client disconnects.
+        """
+        broadcast = DataStreamBroadcast(
+            self._index(frames, lambda key: self._add_key(broadcast, key)), self.max_frames
+        )
+        self._keys[broadcast] = []
+        if stream_id is not None:
+            self._add_key(broadcast, stream_id)
+        self._evict()
+        broadcast.add_done_callback(self._finished)
+        broadcast.start()
+        return broadcast.subscribe()
+
+    @staticmethod
+    async def _index(
+        frames: AsyncIterator[Any], on_message_id: Callable[[str], None]
+    ) -> AsyncGenerator[Any, None]:
+        # registers the stream under the message id of every step as it goes by
+        try:
+            async for frame in frames:
+                id = message_id(frame)
+                if id is not None:
+                    on_message_id(id)
+                yield frame
+        finally:
+            aclose = getattr(frames, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    def _add_key(self, broadcast: DataStreamBroadcast, key: str) -> None:
+        keys = self._keys.get(broadcast)
+        if keys is None:
+            # the stream was evicted or the store closed while it was still generated
+            return
+        self._streams[key] = broadcast
+        keys.append(key)
+
+    def _finished(self, broadcast: DataStreamBroadcast) -> None:
+        if broadcast not in self._keys:
+            # evicted while it was still generated
+            return
+        self._expiries.append((time.monotonic() + self.ttl, broadcast))
+        self._evict()
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        while self._expiries and (
+            self._expiries[0][0] <= now or len(self._keys) > self.max_streams
+        ):
+            _, broadcast = self._expiries.popleft()
+            self._forget(broadcast)
+        while len(self._keys) > self.max_streams:
+            # only running streams are left, the oldest one stops being resumable
+            self._forget(next(iter(self._keys)))
+
+    def _forget(self, broadcast: DataStreamBroadcast) -> None:
+        for key in self._keys.pop(broadcast, []):
+            if self._streams.get(key) is broadcast:
+                del self._streams[key]
+
+    def resume(self, stream_id: str, offset: int = 0) -> AsyncGenerator[Any, None]:
+        """
+        Returns the parts of a recorded stream from `offset` on.
+
+        Raises:
+            KeyError: If the stream is unknown or expired.
+            FrameOffsetError: When iterated, if `offset` is no longer retained.
+        """
+        self._evict()
+        return self._streams[stream_id].subscribe(offset)
+
+    async def aclose(self) -> None:
+        """Stops every stream still being generated and forgets all streams."""
+        await asyncio.gather(*(broadcast.aclose() for broadcast in self._keys))
+        self._streams.clear()
+        self._keys.clear()
+        self._expiries.clear()
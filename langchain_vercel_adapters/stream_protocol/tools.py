@@ -0,0 +1,142 @@
+import asyncio
+import functools
+import inspect
+import json
+from typing import Any, AsyncGenerator, AsyncIterable, Callable, Sequence
+
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool
+from pydantic_core import to_json
+
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    _BYTES_ENCODER,
+    _STR_ENCODER,
+    _FrameEncoder,
+)
+
+Tool = BaseTool | Callable[..., Any]
+
+
+def _tool_name(tool: Tool) -> str:
+    return tool.name if isinstance(tool, BaseTool) else tool.__name__
+
+
+async def _invoke(tool: Tool, args: dict[str, Any]) -> Any:
+    if isinstance(tool, BaseTool):
+        # tools without a coroutine already run in the default executor
+        return await tool.ainvoke(args)
+    if inspect.iscoroutinefunction(tool):
+        return await tool(**args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(tool, **args))
+
+
+async def _run_tool_call(
+    tool: Tool,
+    tool_call: dict[str, Any],
+    semaphore: asyncio.Semaphore,
+    handle_errors: bool,
+    on_result: Callable[[ToolMessage], Any] | None,
+    encoder: _FrameEncoder,
+) -> Any:
+    """Runs one tool call and returns its result part."""
+    id = tool_call["toolCallId"]
+    status = "success"
+    async with semaphore:
+        try:
+            result = await _invoke(tool, tool_call["args"])
+        except Exception as e:
+            if not handle_errors:
+                raise
+            result = f"Error: {e!r}"
+            status = "error"
+    if on_result is not None:
+        content = result if isinstance(result, str) else to_json(result, fallback=str).decode()
+        on_result(
+            ToolMessage(content=content, tool_call_id=id, name=tool_call["toolName"], status=status)
+        )
+    return encoder.tool_result(id, result)
+
+
+async def execute_tool_calls(
+    frames: AsyncIterable[Any],
+    tools: Sequence[Tool],
+    *,
+    max_concurrency: int = 8,
+    handle_errors: bool = True,
+    on_result: Callable[[ToolMessage], Any] | None = None,
+) -> AsyncGenerator[Any, None]:
+    """
+    Executes the tool calls of a serialized stream as soon as they are complete.
+
+    Every tool call (`9:`) part starts its tool right away, while the LLM is still streaming, and
+    tool result (`a:`) parts are inserted in the stream in completion order. Calls run
+    concurrently, at most `max_concurrency` at once. The finish step (`e:`) part is held back until
+    the tool calls of its step have a result, as the AI SDK expects.
+
+    Tool calls whose name matches none of `tools` are left to the client, e.g. tools executed in
+    the browser with `onToolCall`.
+
+    Args:
+        frames: The output of `serialize_to_data_stream_protocol` or its bytes variant.
+        tools: LangChain tools, or plain functions called with the arguments as keywords. Sync
+            functions run in the default thread pool executor.
+        max_concurrency: Maximum number of tools running at once in this stream.
+        handle_errors: Whether an exception raised by a tool becomes an error result, like
+            LangGraph's `ToolNode` does, instead of failing the stream.
+        on_result: Called with a `ToolMessage` per result, e.g. to send them back to the LLM.
+
+    Example:
+        frames = serialize_to_data_stream_protocol(llm.bind_tools(tools).astream(messages))
+        return StreamingResponse(execute_tool_calls(frames, tools))
+    """
+    by_name = {_tool_name(tool): tool for tool in tools}
+    semaphore = asyncio.Semaphore(max_concurrency)
+    running: set[asyncio.Task[Any]] = set()
+    iterator = aiter(frames)
+    next_frame: asyncio.Future[Any] | None = None
+
+    try:
+        while True:
+            if next_frame is None:
+                next_frame = asyncio.ensure_future(anext(iterator))
+            done, _ = await asyncio.wait(
+                (next_frame, *running), return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in [task for task in running if task in done]:
+                running.discard(task)
+                yield task.result()
+            if next_frame not in done:
+                continue
+
+            read, next_frame = next_frame, None
+            try:
+                frame = read.result()
+            except StopAsyncIteration:
+                break
+
+            encoder = _BYTES_ENCODER if isinstance(frame, bytes) else _STR_ENCODER
+            prefix = frame[:2]
+            if prefix in ("e:", b"e:"):
+                for task in asyncio.as_completed(running):
+                    yield await task
+                running.clear()
+            yield frame
+            if prefix in ("9:", b"9:"):
+                tool_call = json.loads(frame[2:])
+                tool = by_name.get(tool_call["toolName"])
+                if tool is not None:
+                    run = _run_tool_call(
+                        tool, tool_call, semaphore, handle_errors, on_result, encoder
+                    )
+                    running.add(asyncio.create_task(run))
+
+        for task in asyncio.as_completed(running):
+            yield await task
+        running.clear()
+    finally:
+        pending = [*running, next_frame] if next_frame is not None else [*running]
+        for task in pending:
+            task.cancel()
+        # cancelled tools may still be cleaning up, wait for them before the stream is closed
+        await asyncio.gather(*pending, return_exceptions=True)
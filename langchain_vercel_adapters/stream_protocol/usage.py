@@ -0,0 +1,55 @@
+from dataclasses import dataclass, field
+
+from langchain_core.messages.ai import UsageMetadata, add_usage
+
+
+@dataclass
+class StreamUsage:
+    """
+    Token usage of a serialized stream, accumulated per step and over the whole stream.
+
+    Providers spread usage over several chunks of a step (Anthropic reports input tokens on the
+    first chunk and output tokens on the last one, OpenAI sends a trailing usage-only chunk).
+    Chunks are summed the same way LangChain sums them when `AIMessageChunk`s are added together.
+
+    Pass an instance to the serializer to read the usage once the stream is consumed.
+    """
+
+    # step id -> usage of that step
+    steps: dict[str, UsageMetadata] = field(default_factory=dict)
+    total: UsageMetadata = field(default_factory=lambda: add_usage(None, None))
+
+    def add(self, step_id: str | None, usage: UsageMetadata) -> UsageMetadata:
+        """Adds the usage reported by one chunk and returns the usage of its step so far."""
+        key = step_id or ""
+        step_usage = add_usage(self.steps.get(key), usage)
+        self.steps[key] = step_usage
+        self.total = add_usage(self.total, usage)
+        return step_usage
+
+    @property
+    def prompt_tokens(self) -> int:
+        return self.total["input_tokens"]
+
+    @property
+    def completion_tokens(self) -> int:
+        return self.total["output_tokens"]
+
+    @property
+    def total_tokens(self) -> int:
+        return self.total["total_tokens"]
+
+    @property
+    def cache_read_tokens(self) -> int:
+        return self.total.get("input_token_details", {}).get("cache_read", 0)
+
+    @property
+    def cache_creation_tokens(self) -> int:
+        return self.total.get("input_token_details", {}).get("cache_creation", 0)
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Share of the prompt tokens that were read from the provider's prompt cache."""
+        if not self.prompt_tokens:
+            return 0.0
+        return self.cache_read_tokens / self.prompt_tokens
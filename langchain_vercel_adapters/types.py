@@ -31,9 +31,11 @@ class LanguageModelUsage(BaseModel):
 class LanguageModelV1FinishReason(str, Enum):
     STOP = "stop"
     LENGTH = "length"
-    CONTENT_FILTER = "content_filter"
-    TOOL_CALLS = "tool_calls"
+    CONTENT_FILTER = "content-filter"
+    TOOL_CALLS = "tool-calls"
     ERROR = "error"
+    OTHER = "other"
+    UNKNOWN = "unknown"
 
 
 class LanguageModelV1Source(BaseModel):
@@ -357,6 +359,21 @@ class ToolCallStreamingStart(BaseModel):
     tool_name: str = Field(alias="toolName")
 
 
+class ToolCallPart(BaseModel):
+    """A complete tool call, sent once its arguments are streamed."""
+
+    tool_call_id: str = Field(alias="toolCallId")
+    tool_name: str = Field(alias="toolName")
+    args: Any
+
+
+class ToolResultPart(BaseModel):
+    """The result of a tool call."""
+
+    tool_call_id: str = Field(alias="toolCallId")
+    result: Any
+
+
 class ToolCallDelta(BaseModel):
     """Delta updates for a streaming tool call."""
 
@@ -0,0 +1,96 @@
+import base64
+import random
+
+import pytest
+
+from langchain_vercel_adapters.messages import attachments
+from langchain_vercel_adapters.messages.attachments import (
+    decode_base64,
+    decode_data_url,
+    load_attachments,
+)
+from langchain_vercel_adapters.types import UIMessage
+
+PAYLOAD = random.Random(0).randbytes(600_000)
+ENCODED = base64.b64encode(PAYLOAD).decode()
+
+
+@pytest.mark.parametrize("max_memory", [10_000_000, 100_000])
+def test_data_urls_are_decoded_in_memory_or_on_disk(max_memory):
+    with decode_data_url(
+        f"data:application/pdf;base64,{ENCODED}", name="report.pdf", max_memory=max_memory
+    ) as attachment:
+        assert attachment.mime_type == "application/pdf"
+        assert attachment.name == "report.pdf"
+        assert attachment.size == len(PAYLOAD)
+        assert attachment.on_disk == (max_memory < len(PAYLOAD))
+        assert attachment.read() == PAYLOAD
+        view = attachment.getbuffer()
+        assert view == PAYLOAD
+        view.release()
+
+
+def test_base64_with_line_breaks():
+    wrapped = "\n".join(ENCODED[i : i + 76] for i in range(0, len(ENCODED), 76))
+
+    assert decode_base64(wrapped).read() == PAYLOAD
+
+
+def test_invalid_payloads():
+    with pytest.raises(ValueError):
+        decode_data_url("https://example.com/a.png")
+    with pytest.raises(ValueError):
+        decode_base64(ENCODED[:-1])
+
+
+def test_url_encoded_data_urls():
+    attachment = decode_data_url("data:,hello%20world")
+
+    assert attachment.mime_type == "text/plain"
+    assert attachment.read() == b"hello world"
+
+
+def test_load_attachments_of_a_message():
+    message = UIMessage.model_validate(
+        {
+            "role": "user",
+            "content": "Summarize these",
+            "experimentalAttachments": [
+                {"contentType": "image/png", "url": "https://example.com/a.png"},
+                {"name": "a.txt", "contentType": "text/plain", "url": "data:;base64,aGk="},
+            ],
+            "parts": [{"type": "file", "mimeType": "application/pdf", "data": ENCODED}],
+        }
+    )
+
+    text, pdf = load_attachments(message, max_memory=100_000)
+
+    assert (text.name, text.read()) == ("a.txt", b"hi")
+    assert (pdf.mime_type, pdf.on_disk, pdf.read()) == ("application/pdf", True, PAYLOAD)
+
+
+def test_decoded_attachments_are_closed_when_a_later_one_fails(monkeypatch):
+    opened = []
+    decode = decode_data_url
+
+    def tracking_decode_data_url(*args, **kwargs):
+        opened.append(decode(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(attachments, "decode_data_url", tracking_decode_data_url)
+    message = UIMessage.model_validate(
+        {
+            "role": "user",
+            "content": "Summarize these",
+            "experimentalAttachments": [
+                {"contentType": "application/pdf", "url": f"data:;base64,{ENCODED}"}
+            ],
+            "parts": [{"type": "file", "mimeType": "application/pdf", "data": ENCODED[:-1]}],
+        }
+    )
+
+    with pytest.raises(ValueError):
+        load_attachments(message, max_memory=100_000)
+
+    assert opened[0].on_disk
+    assert opened[0].file.closed
@@ -0,0 +1,129 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from langchain_vercel_adapters.messages import convert
+from langchain_vercel_adapters.messages.convert import MessageConverter, convert_messages
+from langchain_vercel_adapters.types import ChatMessages, Message
+
+
+def _history(turns: int) -> list:
+    messages = []
+    for i in range(turns):
+        messages.append(
+            {
+                "id": f"user-{i}",
+                "role": "user",
+                "content": f"question {i}",
+                "parts": [{"type": "text", "text": f"question {i}"}],
+            }
+        )
+        messages.append(
+            {
+                "id": f"assistant-{i}",
+                "role": "assistant",
+                "content": f"answer {i}",
+                "parts": [
+                    {"type": "step-start"},
+                    {
+                        "type": "tool-invocation",
+                        "toolInvocation": {
+                            "state": "result",
+                            "step": 0,
+                            "toolCallId": f"call_{i}",
+                            "toolName": "Search",
+                            "args": {"query": f"question {i}"},
+                            "result": {"hits": i},
+                        },
+                    },
+                    {"type": "step-start"},
+                    {"type": "text", "text": f"answer {i}"},
+                ],
+            }
+        )
+    return ChatMessages.model_validate({"id": "chat-1", "messages": messages}).messages
+
+
+def test_assistant_steps_become_ai_and_tool_messages():
+    messages = convert_messages(_history(1))
+
+    assert messages == [
+        HumanMessage(content="question 0", id="user-0"),
+        # every step has its own id, id-keyed stores would merge them otherwise
+        AIMessage(
+            content="",
+            id="assistant-0-0",
+            tool_calls=[{"id": "call_0", "name": "Search", "args": {"query": "question 0"}}],
+        ),
+        ToolMessage(content='{"hits": 0}', tool_call_id="call_0", name="Search"),
+        AIMessage(content="answer 0", id="assistant-0-1"),
+    ]
+
+
+def test_messages_without_parts():
+    messages = convert_messages(
+        [
+            Message(role="system", content="Be brief."),
+            Message.model_validate(
+                {
+                    "role": "user",
+                    "content": "What is this?",
+                    "experimentalAttachments": [
+                        {"contentType": "image/png", "url": "https://example.com/a.png"},
+                        {
+                            "contentType": "application/pdf",
+                            "url": "data:application/pdf;base64,JVBE",
+                        },
+                    ],
+                }
+            ),
+            Message.model_validate(
+                {
+                    "role": "assistant",
+                    "content": "A cat.",
+                    "toolInvocations": [
+                        {"state": "call", "toolCallId": "call_1", "toolName": "Search", "args": {}}
+                    ],
+                }
+            ),
+        ]
+    )
+
+    assert messages[0] == SystemMessage(content="Be brief.")
+    assert messages[1].content == [
+        {"type": "text", "text": "What is this?"},
+        {"type": "image_url", "image_url": {"url": "https://example.com/a.png"}},
+        {"type": "file", "source_type": "base64", "mime_type": "application/pdf", "data": "JVBE"},
+    ]
+    # the tool call never got a result
+    assert messages[2] == AIMessage(content="A cat.")
+
+
+def test_only_new_messages_are_converted(monkeypatch):
+    converted = []
+    convert_message = convert.convert_message
+
+    def counting_convert_message(message):
+        converted.append(message.id)
+        return convert_message(message)
+
+    monkeypatch.setattr(convert, "convert_message", counting_convert_message)
+    converter = MessageConverter()
+
+    first = converter.convert(_history(100))
+    second = converter.convert(_history(101))
+
+    assert len(converted) == 202
+    assert converted[200:] == ["user-100", "assistant-100"]
+    assert second[: len(first)] == first
+    assert second == convert_messages(_history(101))
+
+
+def test_edited_messages_are_converted_again():
+    converter = MessageConverter()
+    history = _history(1)
+    converter.convert(history)
+
+    history[0].parts[0].text = "edited question"
+    messages = converter.convert(history)
+
+    assert messages[0].content == "edited question"
+    assert len(converter) == 3
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from langchain_vercel_adapters.messages.convert import MessageConverter, convert_messages
+from langchain_vercel_adapters.messages.ingest import (
+    LazyChatMessages,
+    LazyChatRequest,
+    LazyMessage,
+    parse_chat_messages,
+    parse_chat_request,
+)
+from langchain_vercel_adapters.types import ChatMessages, UIMessage
+
+
+def _message(i: int, **overrides) -> dict:
+    message = {
+        "id": f"msg-{i}",
+        "role": "user" if i % 2 == 0 else "assistant",
+        "content": f"message {i}",
+        "parts": [{"type": "text", "text": f"message {i}"}],
+    }
+    return {**message, **overrides}
+
+
+def _body(count: int, *messages: dict) -> bytes:
+    return json.dumps(
+        {"id": "chat-1", "messages": [_message(i) for i in range(count)] + list(messages)}
+    ).encode()
+
+
+def test_only_the_newest_messages_are_validated():
+    request = parse_chat_messages(_body(10), validate_last=3)
+
+    assert isinstance(request, LazyChatMessages)
+    assert request.id == "chat-1"
+    assert all(isinstance(x, LazyMessage) for x in request.messages)
+    assert [x.validated for x in request.messages] == [False] * 7 + [True] * 3
+
+    first = request.messages[0]
+    assert first.role == "user"
+    assert first.validated
+    assert isinstance(first.message, UIMessage)
+    assert [x.message for x in request.messages] == ChatMessages.model_validate_json(
+        _body(10)
+    ).messages
+
+
+def test_old_invalid_messages_fail_on_access():
+    invalid = _message(0, role="robot")
+    request = parse_chat_messages(_body(0, invalid, _message(1), _message(2)))
+
+    with pytest.raises(ValidationError):
+        _ = request.messages[0].role
+
+    with pytest.raises(ValidationError):
+        parse_chat_messages(_body(2, invalid))
+
+
+def test_chat_request_bodies():
+    body = json.dumps({"messages": [_message(0), _message(1)], "data": {"a": 1}})
+
+    request = parse_chat_request(body, validate_last=1)
+
+    assert isinstance(request, LazyChatRequest)
+    assert request.data == {"a": 1}
+    assert request.headers is None
+    assert request.messages[0].validated is False
+    assert request.messages[1].content == "message 1"
+
+
+def test_converter_does_not_validate_messages_it_has_seen():
+    converter = MessageConverter()
+    converter.convert(parse_chat_messages(_body(10), validate_last=10).messages)
+
+    request = parse_chat_messages(_body(11), validate_last=1)
+    messages = converter.convert(request.messages)
+
+    assert not any(x.validated for x in request.messages[:10])
+    assert messages == convert_messages(ChatMessages.model_validate_json(_body(11)).messages)
@@ -0,0 +1,80 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from langchain_vercel_adapters.messages.window import HistoryWindow
+
+
+class WordCounter:
+    def __init__(self):
+        self.counted = []
+
+    def __call__(self, message):
+        self.counted.append(message.id)
+        return len(message.content.split()) if message.content else 1
+
+
+def _history(turns: int) -> list:
+    messages = [SystemMessage(content="be brief", id="system")]
+    for i in range(turns):
+        messages += [
+            HumanMessage(content="one two three", id=f"human-{i}"),
+            AIMessage(
+                content="",
+                id=f"ai-{i}",
+                tool_calls=[{"id": f"call_{i}", "name": "Search", "args": {}}],
+            ),
+            ToolMessage(content="one two", tool_call_id=f"call_{i}", id=f"tool-{i}"),
+            AIMessage(content="one two three four", id=f"answer-{i}"),
+        ]
+    return messages
+
+
+def test_largest_suffix_within_budget_keeps_system_messages():
+    window = HistoryWindow(max_tokens=2 + 10 + 7, count_tokens=WordCounter())
+    messages = _history(3)
+
+    kept = window(messages)
+
+    # a turn is 10 tokens, the system message 2
+    assert [x.id for x in kept] == ["system", "ai-1", "tool-1", "answer-1"] + [
+        x.id for x in messages[-4:]
+    ]
+
+
+def test_tool_results_are_dropped_with_their_tool_call():
+    # room for the tool result of the previous turn, not for its tool call as well
+    window = HistoryWindow(max_tokens=2 + 10 + 4 + 2, count_tokens=WordCounter())
+
+    kept = window(_history(3))
+
+    assert [x.id for x in kept[:2]] == ["system", "answer-1"]
+
+
+def test_everything_fits():
+    window = HistoryWindow(max_tokens=1_000)
+    messages = _history(3)
+
+    assert window(messages) == messages
+
+
+def test_only_new_messages_are_counted():
+    counter = WordCounter()
+    window = HistoryWindow(max_tokens=1_000, count_tokens=counter)
+
+    window(_history(50))
+    counted = len(counter.counted)
+    window(_history(51))
+
+    assert counted == 201
+    assert sorted(counter.counted[counted:]) == ["ai-50", "answer-50", "human-50", "tool-50"]
+
+
+def test_edited_messages_are_counted_again():
+    counter = WordCounter()
+    window = HistoryWindow(max_tokens=1_000, count_tokens=counter)
+    messages = _history(1)
+    window(messages)
+
+    messages[1] = HumanMessage(content="one", id="human-0")
+
+    assert window.tokens(messages[1]) == 1
+    assert counter.counted[-1] == "human-0"
@@ -0,0 +1,42 @@
+import asyncio
+from typing import Any, AsyncIterable
+
+from langchain_core.messages import AIMessageChunk
+
+RUN_ID = "run-2b3c4d5e-6f7a-8b9c-0d1e-2f3a4b5c6d7e"
+
+
+class Upstream:
+    """A provider stream of `tokens` text chunks, counting how many times it was called."""
+
+    def __init__(self, tokens: int = 20, fail: bool = False, run_id: str = RUN_ID):
+        self.tokens = tokens
+        self.fail = fail
+        self.run_id = run_id
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        for i in range(self.tokens):
+            await asyncio.sleep(0.001)
+            yield AIMessageChunk(content=f" token{i}", id=self.run_id)
+        if self.fail:
+            raise RuntimeError("provider failed")
+        yield AIMessageChunk(
+            content="", id=self.run_id, response_metadata={"finish_reason": "stop"}
+        )
+
+
+async def collect(stream: AsyncIterable[Any], delay: float = 0.0) -> list[Any]:
+    """Reads a stream to its end, sleeping `delay` after each item, failing after 5s."""
+
+    async def read():
+        frames = []
+        async for frame in stream:
+            frames.append(frame)
+            if delay:
+                await asyncio.sleep(delay)
+        return frames
+
+    # a stream waiting on something that never happens would hang, fail instead
+    return await asyncio.wait_for(read(), timeout=5)
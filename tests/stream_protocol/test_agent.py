@@ -0,0 +1,180 @@
+import json
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, ToolMessage
+
+from langchain_vercel_adapters.stream_protocol.agent import (
+    serialize_agent_to_data_stream_protocol,
+    serialize_agent_to_data_stream_protocol_bytes,
+)
+from langchain_vercel_adapters.stream_protocol.parser import parse_data_stream
+from langchain_vercel_adapters.types import DataStreamStringPrefixes
+
+pytestmark = pytest.mark.asyncio
+
+
+def _usage(input_tokens: int, output_tokens: int) -> dict:
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+    }
+
+
+def _text_step(run_id: str, text: str, finish_reason: str = "stop") -> list[AIMessageChunk]:
+    return [
+        AIMessageChunk(content="", id=run_id),
+        AIMessageChunk(content=text, id=run_id),
+        AIMessageChunk(
+            content="",
+            id=run_id,
+            response_metadata={"finish_reason": finish_reason},
+            usage_metadata=_usage(10, 5),
+        ),
+    ]
+
+
+def _tool_step(run_id: str, *calls: tuple[str, str, dict]) -> list[AIMessageChunk]:
+    chunks = [AIMessageChunk(content="", id=run_id)]
+    for index, (id, name, args) in enumerate(calls):
+        chunks.append(
+            AIMessageChunk(
+                content="",
+                id=run_id,
+                tool_call_chunks=[
+                    {
+                        "name": name,
+                        "args": json.dumps(args),
+                        "id": id,
+                        "index": index,
+                        "type": "tool_call_chunk",
+                    }
+                ],
+            )
+        )
+    chunks.append(
+        AIMessageChunk(
+            content="",
+            id=run_id,
+            response_metadata={"finish_reason": "tool_calls"},
+            usage_metadata=_usage(20, 8),
+        )
+    )
+    return chunks
+
+
+class ScriptedModel:
+    """Streams the next scripted step on each call and records the messages it was called with."""
+
+    def __init__(self, *steps: list[AIMessageChunk]):
+        self.steps = list(steps)
+        self.calls = []
+
+    async def astream(self, messages):
+        self.calls.append(list(messages))
+        for chunk in self.steps.pop(0):
+            yield chunk
+
+
+async def weather(city: str) -> str:
+    return f"Sunny in {city}"
+
+
+async def _parts(frames):
+    return [part async for part in parse_data_stream(frames)]
+
+
+async def test_tool_loop_in_one_response():
+    model = ScriptedModel(
+        _tool_step(
+            "run-1",
+            ("call_1", "weather", {"city": "Bern"}),
+            ("call_2", "weather", {"city": "Oslo"}),
+        ),
+        _text_step("run-2", "Sunny in both"),
+    )
+    added = []
+
+    parts = await _parts(
+        serialize_agent_to_data_stream_protocol_bytes(
+            model, [HumanMessage(content="Weather?")], [weather], on_message=added.append
+        )
+    )
+
+    types = "".join(part.type.value for part in parts)
+    # tool results are streamed as soon as each tool completes, before the end of their step
+    assert types.replace("a", "") == "fbc9bc9ef0ed"
+    assert types.count("a") == 2
+    assert types.rindex("a") < types.index("e")
+    steps = [part.parse() for part in parts if part.type == DataStreamStringPrefixes.FINISH_STEP]
+    assert [(x.finish_reason, x.is_continued) for x in steps] == [
+        ("tool-calls", False),
+        ("stop", False),
+    ]
+    finish = parts[-1].parse()
+    assert finish.finish_reason == "stop"
+    assert finish.usage == {"promptTokens": 30, "completionTokens": 13}
+
+    # the second call sees the tool calls and their results, in call order
+    history = model.calls[1]
+    assert isinstance(history[1], AIMessage)
+    assert [x["id"] for x in history[1].tool_calls] == ["call_1", "call_2"]
+    assert [(x.tool_call_id, x.content) for x in history[2:]] == [
+        ("call_1", "Sunny in Bern"),
+        ("call_2", "Sunny in Oslo"),
+    ]
+    assert added == history[1:] + [added[-1]]
+    assert added[-1].content == "Sunny in both"
+
+
+async def test_client_tools_end_the_response():
+    model = ScriptedModel(_tool_step("run-1", ("call_1", "ask_user", {"question": "Where?"})))
+
+    frames = [
+        frame
+        async for frame in serialize_agent_to_data_stream_protocol(
+            model, [HumanMessage(content="Weather?")], [weather]
+        )
+    ]
+
+    assert [frame[0] for frame in frames] == list("fbc9ed")
+    assert frames[-1].startswith('d:{"finishReason":"tool-calls"')
+    assert len(model.calls) == 1
+
+
+async def test_max_steps():
+    model = ScriptedModel(
+        *[_tool_step(f"run-{i}", (f"call_{i}", "weather", {"city": "Bern"})) for i in range(3)]
+    )
+
+    frames = [
+        frame
+        async for frame in serialize_agent_to_data_stream_protocol(
+            model, [HumanMessage(content="Weather?")], [weather], max_steps=2
+        )
+    ]
+
+    assert len(model.calls) == 2
+    assert "".join(frame[0] for frame in frames) == "fbc9aefbc9aed"
+
+
+async def test_continue_on_length():
+    model = ScriptedModel(
+        _text_step("run-1", "Once upon", finish_reason="length"),
+        _text_step("run-2", " a time"),
+    )
+
+    frames = [
+        frame
+        async for frame in serialize_agent_to_data_stream_protocol(
+            model, [HumanMessage(content="A story")], continue_on_length=True
+        )
+    ]
+
+    assert [frame for frame in frames if frame.startswith("e:")] == [
+        'e:{"finishReason":"length","usage":{"promptTokens":10,"completionTokens":5},"isContinued":true}\n',
+        'e:{"finishReason":"stop","usage":{"promptTokens":10,"completionTokens":5},"isContinued":false}\n',
+    ]
+    assert isinstance(model.calls[1][-1], AIMessage)
+    assert model.calls[1][-1].content == "Once upon"
+    assert not any(isinstance(x, ToolMessage) for x in model.calls[1])
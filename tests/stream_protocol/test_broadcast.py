@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from langchain_vercel_adapters.stream_protocol.broadcast import (
+    DataStreamBroadcast,
+    FrameOffsetError,
+)
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    serialize_to_data_stream_protocol,
+)
+from tests.stream_protocol.conftest import RUN_ID, Upstream, collect
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_subscribers_share_a_single_upstream_stream():
+    upstream = Upstream()
+    broadcast = DataStreamBroadcast(serialize_to_data_stream_protocol(upstream()))
+
+    fast, slow = await asyncio.gather(
+        collect(broadcast.subscribe()), collect(broadcast.subscribe(), delay=0.002)
+    )
+
+    assert upstream.calls == 1
+    assert fast == slow == broadcast.frames
+    assert fast[0] == f'f:{{"messageId":"{RUN_ID}"}}\n'
+    assert fast[-1].startswith("e:")
+
+
+async def test_late_subscribers_catch_up_from_the_beginning():
+    broadcast = DataStreamBroadcast(serialize_to_data_stream_protocol(Upstream()()))
+    first = asyncio.create_task(collect(broadcast.subscribe()))
+
+    while len(broadcast) < 5:
+        await asyncio.sleep(0.001)
+    late = await collect(broadcast.subscribe())
+    resumed = await collect(broadcast.subscribe(offset=5))
+
+    assert late == await first
+    assert resumed == late[5:]
+
+
+async def test_negative_offsets_are_rejected():
+    broadcast = DataStreamBroadcast(serialize_to_data_stream_protocol(Upstream()()))
+
+    with pytest.raises(ValueError):
+        await collect(broadcast.subscribe(offset=-1))
+    await broadcast.aclose()
+
+
+async def test_upstream_errors_reach_every_subscriber():
+    broadcast = DataStreamBroadcast(serialize_to_data_stream_protocol(Upstream(fail=True)()))
+
+    results = await asyncio.gather(
+        collect(broadcast.subscribe()), collect(broadcast.subscribe()), return_exceptions=True
+    )
+
+    assert all(isinstance(x, RuntimeError) for x in results)
+
+
+async def test_closing_the_broadcast_stops_the_upstream_stream():
+    broadcast = DataStreamBroadcast(serialize_to_data_stream_protocol(Upstream(tokens=1_000)()))
+    subscriber = broadcast.subscribe()
+    await anext(subscriber)
+
+    await broadcast.aclose()
+
+    assert broadcast.done
+    assert len(broadcast) < 1_000
+    with pytest.raises(RuntimeError, match="closed"):
+        await collect(subscriber)
+
+
+async def test_bounded_log_keeps_the_latest_parts():
+    unbounded = DataStreamBroadcast(serialize_to_data_stream_protocol(Upstream()()))
+    bounded = DataStreamBroadcast(serialize_to_data_stream_protocol(Upstream()()), max_frames=4)
+    frames = await collect(unbounded.subscribe())
+    await bounded.wait_closed()
+
+    assert len(bounded) == len(frames)
+    assert bounded.first_offset == len(frames) - 4
+    assert bounded.frames == frames[-4:]
+    assert await collect(bounded.subscribe(offset=bounded.first_offset)) == frames[-4:]
+    with pytest.raises(FrameOffsetError):
+        await collect(bounded.subscribe())
+
+
+async def test_bounded_log_larger_than_the_stream():
+    broadcast = DataStreamBroadcast(
+        serialize_to_data_stream_protocol(Upstream()()), max_frames=10_000
+    )
+
+    frames = await collect(broadcast.subscribe())
+
+    assert broadcast.first_offset == 0
+    assert broadcast.frames == frames
+    assert await collect(broadcast.subscribe(offset=3)) == frames[3:]
+
+
+async def test_done_callbacks():
+    broadcast = DataStreamBroadcast(serialize_to_data_stream_protocol(Upstream()()))
+    done = []
+    broadcast.add_done_callback(done.append)
+
+    await broadcast.wait_closed()
+    broadcast.add_done_callback(done.append)
+
+    assert done == [broadcast, broadcast]
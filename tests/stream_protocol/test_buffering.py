@@ -0,0 +1,131 @@
+import asyncio
+import json
+
+import pytest
+
+from langchain_vercel_adapters.stream_protocol.buffering import (
+    BufferOverflow,
+    _FrameBuffer,
+    buffer_data_stream,
+)
+
+pytestmark = pytest.mark.asyncio
+
+TEXT = [f"0:{json.dumps(f' token-{i} é')}\n" for i in range(100)]
+TOOL = [
+    'b:{"toolCallId":"call_1","toolName":"Search"}\n',
+    'c:{"toolCallId":"call_1","argsTextDelta":"{\\"q\\""}\n',
+    'c:{"toolCallId":"call_1","argsTextDelta":": 1}"}\n',
+    '9:{"toolCallId":"call_1","toolName":"Search","args":{"q": 1}}\n',
+]
+
+
+class Upstream:
+    def __init__(self, frames, binary=False):
+        self.frames = frames
+        self.binary = binary
+        self.produced = 0
+        self.finished = False
+        self.closed = False
+
+    async def __call__(self):
+        try:
+            for frame in self.frames:
+                await asyncio.sleep(0)
+                self.produced += 1
+                yield frame.encode() if self.binary else frame
+            self.finished = True
+        finally:
+            self.closed = True
+
+
+async def _slow_read(stream, upstream: Upstream, delay=0.001):
+    frames = []
+    produced_at_first_read = None
+    async for frame in stream:
+        if produced_at_first_read is None:
+            await asyncio.sleep(0.05)
+            produced_at_first_read = upstream.produced
+        frames.append(frame)
+        await asyncio.sleep(delay)
+    return frames, produced_at_first_read
+
+
+async def test_merge_keeps_the_provider_flowing_and_merges_text():
+    upstream = Upstream(TEXT + TOOL)
+
+    frames, produced = await _slow_read(
+        buffer_data_stream(upstream(), max_bytes=64, overflow=BufferOverflow.MERGE), upstream
+    )
+
+    # text never waits for the client, the tool call start part has to
+    assert produced > len(TEXT)
+    assert len(frames) < len(TEXT + TOOL)
+    text = "".join(json.loads(x[2:]) for x in frames if x.startswith("0:"))
+    assert text == "".join(json.loads(x[2:]) for x in TEXT)
+    deltas = [json.loads(x[2:])["argsTextDelta"] for x in frames if x.startswith("c:")]
+    assert "".join(deltas) == '{"q": 1}'
+    assert frames[-1] == TOOL[-1]
+
+
+@pytest.mark.parametrize("frames", [TEXT, TOOL[1:3] * 50])
+async def test_merged_parts_are_accounted_for_exactly(frames):
+    buffer = _FrameBuffer(64, BufferOverflow.MERGE, None)
+    for frame in frames:
+        await buffer.put(frame)
+
+    assert buffer.size == sum(len(x) for x in buffer.frames)
+    buffer.close()
+    while await buffer.get() is not None:
+        pass
+    assert buffer.size == 0
+
+
+@pytest.mark.parametrize("binary", [False, True])
+async def test_spill_preserves_every_part_in_order(tmp_path, binary):
+    upstream = Upstream(TEXT + TOOL, binary=binary)
+
+    frames, produced = await _slow_read(
+        buffer_data_stream(
+            upstream(), max_bytes=64, overflow=BufferOverflow.SPILL, spill_dir=str(tmp_path)
+        ),
+        upstream,
+    )
+
+    assert produced == len(TEXT + TOOL)
+    expected = [x.encode() if binary else x for x in TEXT + TOOL]
+    assert frames == expected
+
+
+async def test_wait_applies_backpressure_to_the_upstream_stream():
+    upstream = Upstream(TEXT)
+
+    frames, produced = await _slow_read(
+        buffer_data_stream(upstream(), max_bytes=64, overflow=BufferOverflow.WAIT), upstream
+    )
+
+    assert produced < len(TEXT)
+    assert frames == TEXT
+
+
+async def test_upstream_errors_are_raised_to_the_client():
+    async def failing():
+        yield TEXT[0]
+        raise RuntimeError("provider failed")
+
+    stream = buffer_data_stream(failing())
+
+    assert await anext(stream) == TEXT[0]
+    with pytest.raises(RuntimeError, match="provider failed"):
+        await anext(stream)
+
+
+async def test_closing_the_client_stream_closes_the_upstream_stream():
+    upstream = Upstream(TEXT)
+    stream = buffer_data_stream(upstream(), max_bytes=64, overflow=BufferOverflow.WAIT)
+
+    await anext(stream)
+    await stream.aclose()
+
+    assert upstream.closed
+    assert not upstream.finished
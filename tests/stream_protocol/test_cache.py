@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from langchain_vercel_adapters.stream_protocol.cache import ResponseCache, request_key
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    serialize_to_data_stream_protocol,
+    serialize_to_data_stream_protocol_bytes,
+)
+from langchain_vercel_adapters.types import ChatMessages
+from tests.stream_protocol.conftest import Upstream, collect
+
+pytestmark = pytest.mark.asyncio
+
+
+def _request(chat_id: str, message_id: str) -> ChatMessages:
+    return ChatMessages.model_validate(
+        {
+            "id": chat_id,
+            "messages": [
+                {
+                    "id": message_id,
+                    "createdAt": "2025-05-01T10:00:00Z",
+                    "role": "user",
+                    "content": "What can you do?",
+                    "parts": [{"type": "text", "text": "What can you do?"}],
+                }
+            ],
+        }
+    )
+
+
+async def test_request_key_ignores_ids_and_timestamps():
+    key = request_key(_request("chat-1", "msg-1"), model="gpt-4o", temperature=0)
+
+    assert key == request_key(_request("chat-2", "msg-2"), model="gpt-4o", temperature=0)
+    assert key != request_key(_request("chat-1", "msg-1"), model="gpt-4o", temperature=1)
+
+
+@pytest.mark.parametrize(
+    "serializer", [serialize_to_data_stream_protocol, serialize_to_data_stream_protocol_bytes]
+)
+async def test_hits_replay_with_fresh_message_ids(serializer):
+    upstream = Upstream()
+    cache = ResponseCache()
+
+    first = await collect(cache.stream("key", lambda: serializer(upstream())))
+    second = await collect(cache.stream("key", lambda: serializer(upstream())))
+    third = await collect(cache.stream("key", lambda: serializer(upstream())))
+
+    assert upstream.calls == 1
+    assert second[1:] == first[1:]
+    assert len({first[0], second[0], third[0]}) == 3
+    assert second[0][:15] == first[0][:15]
+
+
+async def test_paced_replay_keeps_the_original_timing():
+    cache = ResponseCache()
+    await collect(cache.stream("key", lambda: serialize_to_data_stream_protocol(Upstream(20)())))
+
+    start = asyncio.get_running_loop().time()
+    await collect(cache.stream("key", lambda: None, pace=True))  # type: ignore
+
+    assert asyncio.get_running_loop().time() - start >= 0.02
+
+
+async def test_paced_replay_ignores_the_first_client_backpressure():
+    cache = ResponseCache()
+    async for _ in cache.stream("key", lambda: serialize_to_data_stream_protocol(Upstream(5)())):
+        # a slow client
+        await asyncio.sleep(0.05)
+
+    start = asyncio.get_running_loop().time()
+    await collect(cache.stream("key", lambda: None, pace=True))  # type: ignore
+
+    assert asyncio.get_running_loop().time() - start < 0.15
+
+
+async def test_incomplete_responses_are_not_cached():
+    upstream = Upstream(fail=True)
+    cache = ResponseCache()
+    with pytest.raises(RuntimeError):
+        await collect(cache.stream("key", lambda: serialize_to_data_stream_protocol(upstream())))
+
+    stream = cache.stream("key", lambda: serialize_to_data_stream_protocol(Upstream()()))
+    await anext(stream)
+    await stream.aclose()
+
+    assert "key" not in cache
+
+
+async def test_least_recently_used_responses_are_evicted():
+    upstream = Upstream()
+    size = len(b"".join(await collect(serialize_to_data_stream_protocol_bytes(upstream()))))
+    cache = ResponseCache(max_bytes=2 * size)
+
+    for key in ["a", "b", "a", "c"]:
+        await collect(
+            cache.stream(key, lambda: serialize_to_data_stream_protocol_bytes(upstream()))
+        )
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.size == 2 * size
+
+
+async def test_responses_expire():
+    cache = ResponseCache(ttl=0.01)
+    await collect(cache.stream("key", lambda: serialize_to_data_stream_protocol(Upstream()())))
+    assert "key" in cache
+
+    await asyncio.sleep(0.02)
+
+    assert "key" not in cache
+    assert cache.size == 0
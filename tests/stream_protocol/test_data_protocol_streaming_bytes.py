@@ -0,0 +1,94 @@
+import json
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    _BYTES_ENCODER,
+    _STR_ENCODER,
+    TextCoalescing,
+    ToolCall,
+    serialize_to_data_stream_protocol,
+    serialize_to_data_stream_protocol_bytes,
+)
+
+pytestmark = pytest.mark.asyncio
+
+RUN_ID = "run-0f1e2d3c-4b5a-6978-8695-a4b3c2d1e0f9"
+
+TRICKY_STRINGS = [
+    "",
+    "plain ascii",
+    'quotes " and \\ backslashes',
+    "new\nlines\tand\rcontrol\x00\x1f chars",
+    "unicode: héllo wörld, 你好, emoji 🚗",
+    " line separators ",
+]
+
+
+@pytest.mark.parametrize("value", TRICKY_STRINGS)
+async def test_bytes_parts_match_str_parts(value: str):
+    tool_call = ToolCall(
+        id=value, name=value, fragments=[json.dumps({"key": value}, ensure_ascii=False)]
+    )
+
+    assert _BYTES_ENCODER.start_step(value) == _STR_ENCODER.start_step(value).encode()
+    assert _BYTES_ENCODER.text(value) == _STR_ENCODER.text(value).encode()
+    assert (
+        _BYTES_ENCODER.tool_call_start(value, value)
+        == _STR_ENCODER.tool_call_start(value, value).encode()
+    )
+    assert (
+        _BYTES_ENCODER.tool_call_delta(value, value)
+        == _STR_ENCODER.tool_call_delta(value, value).encode()
+    )
+    assert _BYTES_ENCODER.tool_call_end(tool_call) == _STR_ENCODER.tool_call_end(tool_call).encode()
+    assert _BYTES_ENCODER.end_step("tool_use", {}) == _STR_ENCODER.end_step("tool_use", {}).encode()
+    usage = {"input_tokens": 3, "output_tokens": 5, "total_tokens": 8}
+    assert (
+        _BYTES_ENCODER.finish_message("length", usage)
+        == _STR_ENCODER.finish_message("length", usage).encode()
+    )
+
+
+@pytest.mark.parametrize("coalesce", [None, TextCoalescing(max_bytes=8, max_latency=None)])
+async def test_bytes_serializer_matches_str_serializer(coalesce):
+    chunks = [AIMessageChunk(content=text, id=RUN_ID) for text in TRICKY_STRINGS]
+    chunks += [
+        AIMessageChunk(
+            content="",
+            id=RUN_ID,
+            tool_call_chunks=[
+                {
+                    "name": "Search",
+                    "args": '{"query": "caf\\u00e9',
+                    "id": "call_1",
+                    "index": 0,
+                    "type": "tool_call_chunk",
+                }
+            ],
+        ),
+        AIMessageChunk(
+            content="",
+            id=RUN_ID,
+            tool_call_chunks=[
+                {"name": None, "args": '"}', "id": None, "index": 0, "type": "tool_call_chunk"}
+            ],
+        ),
+        AIMessageChunk(content="", id=RUN_ID, response_metadata={"finish_reason": "tool_calls"}),
+    ]
+
+    async def chunk_generator():
+        for chunk in chunks:
+            yield chunk
+
+    as_str = [
+        x async for x in serialize_to_data_stream_protocol(chunk_generator(), coalesce=coalesce)
+    ]
+    as_bytes = [
+        x
+        async for x in serialize_to_data_stream_protocol_bytes(chunk_generator(), coalesce=coalesce)
+    ]
+
+    assert all(isinstance(x, bytes) for x in as_bytes)
+    assert as_bytes == [x.encode() for x in as_str]
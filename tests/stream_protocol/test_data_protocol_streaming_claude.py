@@ -387,7 +387,7 @@ async def test_serialize_to_data_stream_protocol_with_content_list():
         'c:{"toolCallId":"toolu_01UuVvQSuChUrntM5BqjovsD","argsTextDelta":" \\"bmw"}\n',
         'c:{"toolCallId":"toolu_01UuVvQSuChUrntM5BqjovsD","argsTextDelta":"\\"}"}\n',
         '9:{"toolCallId":"toolu_01UuVvQSuChUrntM5BqjovsD","toolName":"LockSeatbelt","args":{"car_name": "bmw"}}\n',
-        'e:{"finishReason":"tool-calls","usage":{"promptTokens":0,"completionTokens":0},"isContinued":false}\n',
+        'e:{"finishReason":"tool-calls","usage":{"promptTokens":479,"completionTokens":160},"isContinued":false}\n',
     ]
 
     # Create an async generator from the chunks
@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    TextCoalescing,
+    serialize_to_data_stream_protocol,
+)
+
+pytestmark = pytest.mark.asyncio
+
+RUN_ID = "run-5b0c1d9e-8f3a-4e1b-9c2d-7a6e5f4b3c2d"
+
+
+def _text_chunks(*texts: str) -> list[AIMessageChunk]:
+    return [AIMessageChunk(content=text, id=RUN_ID) for text in texts]
+
+
+def _tool_call_chunks() -> list[AIMessageChunk]:
+    return [
+        AIMessageChunk(
+            content="",
+            id=RUN_ID,
+            tool_call_chunks=[
+                {
+                    "name": "StartDriving",
+                    "args": '{"car_name": "BMW"}',
+                    "id": "call_1",
+                    "index": 0,
+                    "type": "tool_call_chunk",
+                }
+            ],
+        ),
+        AIMessageChunk(
+            content="",
+            id=RUN_ID,
+            response_metadata={"finish_reason": "tool_calls"},
+        ),
+    ]
+
+
+async def _serialize(chunks, delay: float = 0.0, **kwargs) -> list[str]:
+    async def chunk_generator():
+        for chunk in chunks:
+            if delay:
+                await asyncio.sleep(delay)
+            yield chunk
+
+    return [x async for x in serialize_to_data_stream_protocol(chunk_generator(), **kwargs)]
+
+
+async def test_coalescing_merges_text_but_never_past_tool_calls():
+    chunks = _text_chunks("Why", " did", " the", " chicken") + _tool_call_chunks()
+
+    results = await _serialize(chunks, coalesce=TextCoalescing(max_latency=None))
+
+    assert results == [
+        f'f:{{"messageId":"{RUN_ID}"}}\n',
+        '0:"Why did the chicken"\n',
+        'b:{"toolCallId":"call_1","toolName":"StartDriving"}\n',
+        'c:{"toolCallId":"call_1","argsTextDelta":"{\\"car_name\\": \\"BMW\\"}"}\n',
+        '9:{"toolCallId":"call_1","toolName":"StartDriving","args":{"car_name": "BMW"}}\n',
+        'e:{"finishReason":"tool-calls","usage":{"promptTokens":0,"completionTokens":0},"isContinued":false}\n',
+    ]
+
+
+async def test_coalescing_flushes_when_max_bytes_is_reached():
+    chunks = _text_chunks("aaaa", "bbbb", "cccc", "dd")
+
+    results = await _serialize(chunks, coalesce=TextCoalescing(max_bytes=8, max_latency=None))
+
+    assert results == [
+        f'f:{{"messageId":"{RUN_ID}"}}\n',
+        '0:"aaaabbbb"\n',
+        '0:"ccccdd"\n',
+    ]
+
+
+async def test_coalescing_flushes_when_max_latency_elapses():
+    chunks = _text_chunks("slow", " provider")
+
+    results = await _serialize(chunks, delay=0.05, coalesce=TextCoalescing(max_latency=0.01))
+
+    assert results == [
+        f'f:{{"messageId":"{RUN_ID}"}}\n',
+        '0:"slow"\n',
+        '0:" provider"\n',
+    ]
+
+
+async def test_coalescing_preserves_the_streamed_text():
+    texts = [f"token-{i} " for i in range(200)]
+
+    plain = await _serialize(_text_chunks(*texts))
+    coalesced = await _serialize(_text_chunks(*texts), coalesce=TextCoalescing(max_bytes=256))
+
+    assert len(coalesced) < len(plain)
+    assert "".join(json.loads(x[2:]) for x in coalesced if x.startswith("0:")) == "".join(texts)
+    assert [x for x in coalesced if not x.startswith("0:")] == [
+        x for x in plain if not x.startswith("0:")
+    ]
+
+
+async def test_coalescing_max_bytes_counts_utf8_bytes():
+    chunks = _text_chunks("你好", "你好", "!")
+
+    results = await _serialize(chunks, coalesce=TextCoalescing(max_bytes=12, max_latency=None))
+
+    # 6 bytes per "你好"
+    assert [json.loads(x[2:]) for x in results[1:]] == ["你好你好", "!"]
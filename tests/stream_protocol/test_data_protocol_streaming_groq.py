@@ -232,7 +232,7 @@ async def test_serialize_to_data_stream_protocol_with_groq():
         'b:{"toolCallId":"call_j10m","toolName":"LockSeatbelt"}\n',
         'c:{"toolCallId":"call_j10m","argsTextDelta":"{\\"car_name\\": \\"BMW\\"}"}\n',
         '9:{"toolCallId":"call_j10m","toolName":"LockSeatbelt","args":{"car_name": "BMW"}}\n',
-        'e:{"finishReason":"tool-calls","usage":{"promptTokens":0,"completionTokens":0},"isContinued":false}\n',
+        'e:{"finishReason":"tool-calls","usage":{"promptTokens":287,"completionTokens":57},"isContinued":false}\n',
     ]
 
     # Create an async generator from the chunks
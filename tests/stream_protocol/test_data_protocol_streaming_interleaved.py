@@ -0,0 +1,201 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    TextCoalescing,
+    serialize_to_data_stream_protocol,
+)
+from langchain_vercel_adapters.stream_protocol.usage import StreamUsage
+
+pytestmark = pytest.mark.asyncio
+
+FIRST_RUN = "run-11111111-2222-3333-4444-555555555555"
+SECOND_RUN = "run-66666666-7777-8888-9999-000000000000"
+
+USAGE = {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15}
+
+
+async def _serialize(chunks, **kwargs) -> list[str]:
+    async def chunk_generator():
+        for chunk in chunks:
+            yield chunk
+
+    return [
+        x
+        async for x in serialize_to_data_stream_protocol(
+            chunk_generator(), interleaved=True, **kwargs
+        )
+    ]
+
+
+def _tool_call_chunk(run_id: str, args: str, name: str | None = None, id: str | None = None):
+    return AIMessageChunk(
+        content="",
+        id=run_id,
+        tool_call_chunks=[
+            {"name": name, "args": args, "id": id, "index": 0, "type": "tool_call_chunk"}
+        ],
+    )
+
+
+async def test_interleaved_runs_are_written_as_separate_steps():
+    chunks = [
+        AIMessageChunk(content="Hello", id=FIRST_RUN),
+        _tool_call_chunk(SECOND_RUN, '{"city":', name="weather", id="call_1"),
+        AIMessageChunk(content=" world", id=FIRST_RUN),
+        _tool_call_chunk(SECOND_RUN, ' "Bern"}'),
+        AIMessageChunk(
+            content="", id=SECOND_RUN, response_metadata={"finish_reason": "tool_calls"}
+        ),
+        AIMessageChunk(content="!", id=FIRST_RUN),
+        AIMessageChunk(
+            content="",
+            id=FIRST_RUN,
+            response_metadata={"finish_reason": "stop"},
+            usage_metadata=USAGE,
+        ),
+        # trailing usage of the second run, after its stop reason and a chunk of the first run
+        AIMessageChunk(content="", id=SECOND_RUN, usage_metadata=USAGE),
+    ]
+    usage = StreamUsage()
+
+    results = await _serialize(chunks, usage=usage)
+
+    assert results == [
+        f'f:{{"messageId":"{FIRST_RUN}"}}\n',
+        '0:"Hello"\n',
+        '0:" world"\n',
+        '0:"!"\n',
+        'e:{"finishReason":"stop","usage":{"promptTokens":10,"completionTokens":5},"isContinued":false}\n',
+        f'f:{{"messageId":"{SECOND_RUN}"}}\n',
+        'b:{"toolCallId":"call_1","toolName":"weather"}\n',
+        'c:{"toolCallId":"call_1","argsTextDelta":"{\\"city\\":"}\n',
+        'c:{"toolCallId":"call_1","argsTextDelta":" \\"Bern\\"}"}\n',
+        '9:{"toolCallId":"call_1","toolName":"weather","args":{"city": "Bern"}}\n',
+        # the second run ended once a chunk of the first one followed its stop reason
+        'e:{"finishReason":"tool-calls","usage":{"promptTokens":0,"completionTokens":0},"isContinued":false}\n',
+    ]
+    # its late usage is still accounted for
+    assert usage.total["output_tokens"] == 10
+
+
+async def test_runs_without_usage_end_with_the_stream():
+    chunks = [
+        AIMessageChunk(content="A", id=FIRST_RUN),
+        AIMessageChunk(content="B", id=SECOND_RUN),
+        AIMessageChunk(content="", id=SECOND_RUN, response_metadata={"finish_reason": "stop"}),
+        AIMessageChunk(content="A", id=FIRST_RUN),
+        AIMessageChunk(content="", id=FIRST_RUN, response_metadata={"finish_reason": "stop"}),
+    ]
+
+    results = await _serialize(chunks, coalesce=TextCoalescing(max_latency=None))
+
+    assert [x[:2] for x in results] == ["f:", "0:", "e:", "f:", "0:", "e:"]
+    assert results[1] == '0:"AA"\n'
+    assert results[4] == '0:"B"\n'
+
+
+async def test_late_usage_of_an_ended_run():
+    chunks = [
+        AIMessageChunk(
+            content="Hi",
+            id=FIRST_RUN,
+            response_metadata={"finish_reason": "stop"},
+            usage_metadata=USAGE,
+        ),
+        AIMessageChunk(content="", id=FIRST_RUN, usage_metadata=USAGE),
+    ]
+    usage = StreamUsage()
+
+    results = await _serialize(chunks, usage=usage)
+
+    assert [x[:2] for x in results] == ["f:", "0:", "e:"]
+    assert usage.total["output_tokens"] == 10
+
+
+async def test_runs_that_end_first_do_not_wait_for_older_open_runs():
+    third_run = "run-aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee"
+    chunks = [
+        AIMessageChunk(content="A", id=FIRST_RUN),
+        AIMessageChunk(content="B", id=SECOND_RUN),
+        AIMessageChunk(
+            content="C",
+            id=third_run,
+            response_metadata={"finish_reason": "stop"},
+            usage_metadata=USAGE,
+        ),
+        AIMessageChunk(
+            content="",
+            id=FIRST_RUN,
+            response_metadata={"finish_reason": "stop"},
+            usage_metadata=USAGE,
+        ),
+        AIMessageChunk(content="B", id=SECOND_RUN),
+        AIMessageChunk(content="", id=SECOND_RUN, response_metadata={"finish_reason": "stop"}),
+    ]
+
+    results = await _serialize(chunks)
+
+    # the third run ended while the first one was live, it is written right behind it, before
+    # the second run which is still open and becomes the live run
+    assert [x[:2] for x in results] == ["f:", "0:", "e:", "f:", "0:", "e:", "f:", "0:", "0:", "e:"]
+    assert [x for x in results if x.startswith("f:")] == [
+        f'f:{{"messageId":"{run_id}"}}\n' for run_id in (FIRST_RUN, third_run, SECOND_RUN)
+    ]
+
+
+async def test_text_of_the_live_run_is_flushed_on_latency():
+    flushed = asyncio.Event()
+
+    async def chunk_generator():
+        yield AIMessageChunk(content="A", id=FIRST_RUN)
+        yield AIMessageChunk(content="B", id=SECOND_RUN)
+        # the upstream stalls until the text of the live run was written
+        await flushed.wait()
+        yield AIMessageChunk(content="", id=FIRST_RUN, response_metadata={"finish_reason": "stop"})
+
+    async def collect():
+        results = []
+        stream = serialize_to_data_stream_protocol(
+            chunk_generator(),
+            interleaved=True,
+            coalesce=TextCoalescing(max_latency=0.01),
+        )
+        async for x in stream:
+            results.append(x)
+            if x == '0:"A"\n':
+                flushed.set()
+        return results
+
+    results = await asyncio.wait_for(collect(), timeout=5)
+
+    assert results[:2] == [f'f:{{"messageId":"{FIRST_RUN}"}}\n', '0:"A"\n']
+    # the second run never stopped, it has no finish step part
+    assert [x[:2] for x in results] == ["f:", "0:", "e:", "f:", "0:"]
+    assert results[4] == '0:"B"\n'
+
+
+async def test_runs_without_usage_end_when_another_run_streams():
+    resumed = asyncio.Event()
+
+    async def chunk_generator():
+        yield AIMessageChunk(content="A", id=FIRST_RUN)
+        yield AIMessageChunk(content="", id=FIRST_RUN, response_metadata={"finish_reason": "stop"})
+        yield AIMessageChunk(content="B", id=SECOND_RUN)
+        # the upstream stalls until the first step and the text of the second run were written
+        await resumed.wait()
+        yield AIMessageChunk(content="", id=SECOND_RUN, response_metadata={"finish_reason": "stop"})
+
+    async def collect():
+        results = []
+        async for x in serialize_to_data_stream_protocol(chunk_generator(), interleaved=True):
+            results.append(x)
+            if x == '0:"B"\n':
+                resumed.set()
+        return results
+
+    results = await asyncio.wait_for(collect(), timeout=5)
+
+    assert [x[:2] for x in results] == ["f:", "0:", "e:", "f:", "0:", "e:"]
@@ -0,0 +1,105 @@
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    serialize_to_data_stream_protocol,
+    serialize_to_data_stream_protocol_bytes,
+)
+from langchain_vercel_adapters.stream_protocol.observer import StreamObserver, StreamTimings
+
+pytestmark = pytest.mark.asyncio
+
+RUN_ID = "run-9e8d7c6b-5a49-3827-1605-f4e3d2c1b0a9"
+
+CHUNKS = [
+    AIMessageChunk(content="", id=RUN_ID),
+    AIMessageChunk(content="Hello", id=RUN_ID),
+    AIMessageChunk(content=" wörld", id=RUN_ID),
+    AIMessageChunk(
+        content="",
+        id=RUN_ID,
+        tool_call_chunks=[
+            {
+                "name": "Search",
+                "args": '{"query": "caf',
+                "id": "call_1",
+                "index": 0,
+                "type": "tool_call_chunk",
+            }
+        ],
+    ),
+    AIMessageChunk(
+        content="",
+        id=RUN_ID,
+        tool_call_chunks=[
+            {"name": None, "args": 'é"}', "id": None, "index": 0, "type": "tool_call_chunk"}
+        ],
+    ),
+    AIMessageChunk(content="", id=RUN_ID, response_metadata={"finish_reason": "tool_calls"}),
+]
+
+
+async def chunk_generator():
+    for chunk in CHUNKS:
+        yield chunk
+
+
+class RecordingObserver(StreamObserver):
+    def __init__(self):
+        self.events = []
+
+    def on_stream_start(self, timestamp):
+        self.events.append(("stream_start",))
+
+    def on_step_start(self, step_id, timestamp):
+        self.events.append(("step_start", step_id))
+
+    def on_first_token(self, step_id, timestamp):
+        self.events.append(("first_token", step_id))
+
+    def on_tool_call_start(self, tool_call_id, tool_name, timestamp):
+        self.events.append(("tool_call_start", tool_call_id, tool_name))
+
+    def on_tool_call_end(self, tool_call_id, tool_name, args_bytes, timestamp):
+        self.events.append(("tool_call_end", tool_call_id, tool_name, args_bytes))
+
+    def on_step_end(self, step_id, finish_reason, timestamp):
+        self.events.append(("step_end", step_id, finish_reason))
+
+    def on_stream_end(self, timestamp):
+        self.events.append(("stream_end",))
+
+
+async def test_observer_receives_stream_events_in_order():
+    observer = RecordingObserver()
+
+    async for _ in serialize_to_data_stream_protocol(chunk_generator(), observer=observer):
+        pass
+
+    assert observer.events == [
+        ("stream_start",),
+        ("step_start", RUN_ID),
+        ("first_token", RUN_ID),
+        ("tool_call_start", "call_1", "Search"),
+        ("tool_call_end", "call_1", "Search", len('{"query": "café"}'.encode())),
+        ("step_end", RUN_ID, "tool-calls"),
+        ("stream_end",),
+    ]
+
+
+async def test_stream_timings_account_for_every_chunk_and_byte():
+    timings = StreamTimings()
+
+    frames = [
+        x
+        async for x in serialize_to_data_stream_protocol_bytes(chunk_generator(), observer=timings)
+    ]
+
+    assert len(timings.chunk_gaps) == len(CHUNKS)
+    assert timings.frames == len(frames)
+    assert timings.frames_bytes == sum(len(x) for x in frames)
+    assert timings.time_to_first_token is not None
+    assert timings.duration is not None and timings.duration >= timings.time_to_first_token
+    start, end = timings.steps[RUN_ID]
+    assert end is not None and end >= start
+    assert timings.tool_calls["call_1"][2] == len('{"query": "café"}'.encode())
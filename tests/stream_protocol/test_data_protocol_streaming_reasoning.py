@@ -0,0 +1,96 @@
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    TextCoalescing,
+    serialize_to_data_stream_protocol,
+    serialize_to_data_stream_protocol_bytes,
+)
+
+pytestmark = pytest.mark.asyncio
+
+RUN_ID = "run-8b9c0d1e-2f3a-4b5c-6d7e-8f9a0b1c2d3e"
+
+
+def _chunks() -> list[AIMessageChunk]:
+    return [
+        AIMessageChunk(content=[], id=RUN_ID),
+        AIMessageChunk(content=[{"thinking": "Let me", "type": "thinking", "index": 0}], id=RUN_ID),
+        AIMessageChunk(
+            content=[{"thinking": " think.", "type": "thinking", "index": 0}], id=RUN_ID
+        ),
+        AIMessageChunk(
+            content=[{"signature": "EqQBCgIYAhIM", "type": "thinking", "index": 0}], id=RUN_ID
+        ),
+        AIMessageChunk(
+            content=[{"data": "EmwKAhgBEgy3va", "type": "redacted_thinking", "index": 1}],
+            id=RUN_ID,
+        ),
+        AIMessageChunk(content=[{"text": "Hi", "type": "text", "index": 2}], id=RUN_ID),
+        AIMessageChunk(content=[{"text": " there", "type": "text", "index": 2}], id=RUN_ID),
+        AIMessageChunk(content="", id=RUN_ID, response_metadata={"stop_reason": "end_turn"}),
+    ]
+
+
+async def _serialize(chunks, serializer=serialize_to_data_stream_protocol, **kwargs) -> list:
+    async def chunk_generator():
+        for chunk in chunks:
+            yield chunk
+
+    return [x async for x in serializer(chunk_generator(), **kwargs)]
+
+
+async def test_thinking_blocks_are_streamed_as_reasoning():
+    frames = await _serialize(_chunks())
+
+    assert frames == [
+        f'f:{{"messageId":"{RUN_ID}"}}\n',
+        'g:"Let me"\n',
+        'g:" think."\n',
+        'j:{"signature":"EqQBCgIYAhIM"}\n',
+        'i:{"data":"EmwKAhgBEgy3va"}\n',
+        '0:"Hi"\n',
+        '0:" there"\n',
+        'e:{"finishReason":"other","usage":{"promptTokens":0,"completionTokens":0},"isContinued":false}\n',
+    ]
+
+
+async def test_signature_is_written_when_the_block_ends():
+    chunks = _chunks()[:4] + [
+        AIMessageChunk(
+            content="",
+            id=RUN_ID,
+            tool_call_chunks=[
+                {
+                    "name": "Search",
+                    "args": "",
+                    "id": "toolu_01",
+                    "index": 1,
+                    "type": "tool_call_chunk",
+                }
+            ],
+        ),
+    ]
+
+    frames = await _serialize(chunks)
+
+    assert frames[3] == 'j:{"signature":"EqQBCgIYAhIM"}\n'
+    assert frames[4].startswith("b:")
+
+
+async def test_coalesced_text_is_not_reordered_past_reasoning():
+    chunks = [
+        AIMessageChunk(content=[{"text": "Hi", "type": "text", "index": 0}], id=RUN_ID),
+        AIMessageChunk(content=[{"thinking": "Hmm", "type": "thinking", "index": 1}], id=RUN_ID),
+    ]
+
+    frames = await _serialize(chunks, coalesce=TextCoalescing(max_latency=None))
+
+    assert frames[1:] == ['0:"Hi"\n', 'g:"Hmm"\n']
+
+
+async def test_bytes_serializer_matches_str_serializer():
+    frames = await _serialize(_chunks())
+    frames_bytes = await _serialize(_chunks(), serialize_to_data_stream_protocol_bytes)
+
+    assert frames_bytes == [x.encode() for x in frames]
@@ -0,0 +1,69 @@
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from benchmarks.streams import SCENARIOS, SIZES
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    TextCoalescing,
+    serialize_to_data_stream_protocol,
+    serialize_to_data_stream_protocol_bytes,
+    serialize_to_data_stream_protocol_bytes_sync,
+    serialize_to_data_stream_protocol_sync,
+)
+from langchain_vercel_adapters.stream_protocol.usage import StreamUsage
+
+pytestmark = pytest.mark.asyncio
+
+RUN_ID = "run-0f1e2d3c-4b5a-6978-8695-a4b3c2d1e0f9"
+
+
+async def _serialize(serializer, chunks, **kwargs) -> list:
+    async def chunk_generator():
+        for chunk in chunks:
+            yield chunk
+
+    return [x async for x in serializer(chunk_generator(), **kwargs)]
+
+
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+async def test_sync_parts_match_async_parts(scenario: str):
+    chunks = SCENARIOS[scenario](SIZES["small"], 0)
+    usage, sync_usage = StreamUsage(), StreamUsage()
+
+    assert list(
+        serialize_to_data_stream_protocol_sync(iter(chunks), usage=sync_usage)
+    ) == await _serialize(serialize_to_data_stream_protocol, chunks, usage=usage)
+    assert sync_usage.total == usage.total
+    assert list(serialize_to_data_stream_protocol_bytes_sync(iter(chunks))) == await _serialize(
+        serialize_to_data_stream_protocol_bytes, chunks
+    )
+
+
+async def test_sync_coalescing():
+    chunks = [AIMessageChunk(content=f"{i} ", id=RUN_ID) for i in range(10)]
+    chunks.append(
+        AIMessageChunk(content="", id=RUN_ID, response_metadata={"finish_reason": "stop"})
+    )
+
+    results = list(
+        serialize_to_data_stream_protocol_sync(
+            iter(chunks), coalesce=TextCoalescing(max_bytes=10, max_latency=None)
+        )
+    )
+
+    assert results[1:3] == ['0:"0 1 2 3 4 "\n', '0:"5 6 7 8 9 "\n']
+    assert results[3].startswith('e:{"finishReason":"stop"')
+
+
+async def test_sync_generator_is_lazy():
+    pulled = []
+
+    def chunk_generator():
+        for text in ["Hello", " world"]:
+            pulled.append(text)
+            yield AIMessageChunk(content=text, id=RUN_ID)
+
+    frames = serialize_to_data_stream_protocol_sync(chunk_generator())
+
+    assert next(frames) == f'f:{{"messageId":"{RUN_ID}"}}\n'
+    assert next(frames) == '0:"Hello"\n'
+    assert pulled == ["Hello"]
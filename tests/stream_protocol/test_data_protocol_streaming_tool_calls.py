@@ -0,0 +1,195 @@
+import json
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    ToolCall,
+    serialize_to_data_stream_protocol,
+)
+from langchain_vercel_adapters.stream_protocol.observer import StreamObserver
+
+pytestmark = pytest.mark.asyncio
+
+RUN_ID = "run-3c4d5e6f-7a8b-9c0d-1e2f-3a4b5c6d7e8f"
+
+
+def _tool_call_chunk(index: int, args: str, name: str | None = None, id: str | None = None):
+    return AIMessageChunk(
+        content="",
+        id=RUN_ID,
+        tool_call_chunks=[
+            {"name": name, "args": args, "id": id, "index": index, "type": "tool_call_chunk"}
+        ],
+    )
+
+
+async def _serialize(chunks) -> list[str]:
+    async def chunk_generator():
+        for chunk in chunks:
+            yield chunk
+
+    return [x async for x in serialize_to_data_stream_protocol(chunk_generator())]
+
+
+async def test_tool_call_args_are_joined_once():
+    tool_call = ToolCall(id="call_1", name="WriteFile")
+    tool_call.fragments.extend(['{"a"', ": ", "1}"])
+
+    assert tool_call.args == '{"a": 1}'
+    assert tool_call.fragments == ['{"a": 1}']
+    assert tool_call.args == '{"a": 1}'
+
+
+async def test_large_streamed_tool_call_arguments():
+    args = json.dumps({"path": "main.py", "content": "print('hello')\n" * 2_000})
+    deltas = [args[i : i + 7] for i in range(0, len(args), 7)]
+    chunks = [_tool_call_chunk(0, deltas[0], name="WriteFile", id="call_1")]
+    chunks += [_tool_call_chunk(0, delta) for delta in deltas[1:]]
+    chunks.append(
+        AIMessageChunk(content="", id=RUN_ID, response_metadata={"finish_reason": "tool_calls"})
+    )
+
+    results = await _serialize(chunks)
+
+    assert len(results) == len(deltas) + 4
+    tool_call = json.loads(results[-2][2:])
+    assert tool_call["toolName"] == "WriteFile"
+    assert tool_call["args"] == json.loads(args)
+
+
+async def test_tool_call_without_arguments():
+    chunks = [
+        _tool_call_chunk(0, "", name="Now", id="call_1"),
+        AIMessageChunk(content="", id=RUN_ID, response_metadata={"finish_reason": "tool_calls"}),
+    ]
+
+    results = await _serialize(chunks)
+
+    assert results[-2] == '9:{"toolCallId":"call_1","toolName":"Now","args":{}}\n'
+
+
+@pytest.mark.parametrize("args", ['{"city": "Zür', '{"city": Zürich}', '{"a": 1}{', '"abc'])
+async def test_invalid_tool_call_arguments_are_never_written(args):
+    chunks = [
+        _tool_call_chunk(0, args, name="Weather", id="call_1"),
+        _tool_call_chunk(0, " "),
+        _tool_call_chunk(1, '{"city": "Bern"}', name="Weather", id="call_2"),
+        AIMessageChunk(content="", id=RUN_ID, response_metadata={"finish_reason": "tool_calls"}),
+    ]
+
+    results = await _serialize(chunks)
+
+    # an error part replaces the tool call, the other tool calls and the step are still written
+    errors = [x for x in results if x.startswith("3:")]
+    assert len(errors) == 1
+    assert json.loads(errors[0][2:]).startswith("Invalid arguments for tool call call_1 (Weather)")
+    assert [json.loads(x[2:])["toolCallId"] for x in results if x.startswith("9:")] == ["call_2"]
+    assert json.loads(results[-1][2:])["finishReason"] == "error"
+
+
+async def test_partial_arguments_are_observed():
+    class PartialArgs(StreamObserver):
+        def __init__(self):
+            self.args = []
+
+        def on_tool_call_delta(self, tool_call_id, tool_name, args, timestamp):
+            self.args.append(json.dumps(args.value))
+
+    observer = PartialArgs()
+    chunks = [_tool_call_chunk(0, '{"path": "ma', name="WriteFile", id="call_1")]
+    chunks += [_tool_call_chunk(0, delta) for delta in ['in.py", "co', 'ntent": "x', '"}']]
+
+    async def chunk_generator():
+        for chunk in chunks:
+            yield chunk
+
+    async for _ in serialize_to_data_stream_protocol(chunk_generator(), observer=observer):
+        pass
+
+    assert observer.args == [
+        '{"path": "ma"}',
+        '{"path": "main.py"}',
+        '{"path": "main.py", "content": "x"}',
+        '{"path": "main.py", "content": "x"}',
+    ]
+
+
+async def test_interleaved_parallel_tool_calls():
+    calls = 50
+    args = [json.dumps({"path": f"file_{i}.py", "content": "x = 1\n" * i}) for i in range(calls)]
+    deltas = [[x[j : j + 5] for j in range(0, len(x), 5)] for x in args]
+    chunks = [_tool_call_chunk(i, "", name="WriteFile", id=f"call_{i}") for i in range(calls)]
+    for position in range(max(len(x) for x in deltas)):
+        chunks += [
+            _tool_call_chunk(i, x[position]) for i, x in enumerate(deltas) if position < len(x)
+        ]
+    chunks.append(
+        AIMessageChunk(content="", id=RUN_ID, response_metadata={"finish_reason": "tool_calls"})
+    )
+
+    results = await _serialize(chunks)
+
+    # every tool call is written once, complete, after its last delta and before the step ends
+    ends = {}
+    last_deltas = {}
+    streamed = dict.fromkeys((f"call_{i}" for i in range(calls)), "")
+    for position, x in enumerate(results):
+        part = json.loads(x[2:])
+        if x.startswith("c:"):
+            streamed[part["toolCallId"]] += part["argsTextDelta"]
+            last_deltas[part["toolCallId"]] = position
+        elif x.startswith("9:"):
+            assert part["toolCallId"] not in ends
+            ends[part["toolCallId"]] = position
+            assert part["args"] == json.loads(args[int(part["toolCallId"][5:])])
+    assert sorted(ends) == sorted(streamed)
+    assert all(last_deltas[id] < ends[id] < len(results) - 1 for id in ends)
+    assert list(streamed.values()) == args
+
+
+async def test_sequential_tool_calls_end_when_the_next_one_starts():
+    chunks = [
+        _tool_call_chunk(0, '{"city": ', name="Weather", id="call_1"),
+        _tool_call_chunk(0, '"Bern"}'),
+        _tool_call_chunk(1, '{"city": "Oslo"}', name="Weather", id="call_2"),
+        AIMessageChunk(content="", id=RUN_ID, response_metadata={"finish_reason": "tool_calls"}),
+    ]
+
+    results = await _serialize(chunks)
+
+    assert [x[:2] for x in results] == ["f:", "b:", "c:", "c:", "9:", "b:", "c:", "9:", "e:"]
+
+
+@pytest.mark.parametrize("late", ["", " ", '"x"'])
+async def test_late_deltas_of_a_tool_call_written_early(late):
+    chunks = [
+        _tool_call_chunk(0, '{"a": 1}', name="First", id="call_1"),
+        _tool_call_chunk(1, '{"b":', name="Second", id="call_2"),
+        _tool_call_chunk(0, late),
+        _tool_call_chunk(1, " 2}"),
+        AIMessageChunk(content="", id=RUN_ID, response_metadata={"finish_reason": "tool_calls"}),
+    ]
+
+    results = await _serialize(chunks)
+
+    # the first tool call was written once the second one started, blank deltas after it are
+    # ignored and anything else becomes an error part
+    assert [json.loads(x[2:])["toolCallId"] for x in results if x.startswith("9:")] == [
+        "call_1",
+        "call_2",
+    ]
+    errors = [x for x in results if x.startswith("3:")]
+    assert len(errors) == (1 if late.strip() else 0)
+    finish_reason = json.loads(results[-1][2:])["finishReason"]
+    assert finish_reason == ("error" if late.strip() else "tool-calls")
+
+
+async def test_delta_without_start():
+    with pytest.raises(ValueError, match="without a tool call start part"):
+        await _serialize(
+            [
+                _tool_call_chunk(0, '{"city": "Bern"}', name="Weather", id="call_1"),
+                _tool_call_chunk(1, "{}"),
+            ]
+        )
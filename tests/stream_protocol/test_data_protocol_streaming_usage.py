@@ -0,0 +1,94 @@
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    serialize_to_data_stream_protocol,
+)
+from langchain_vercel_adapters.stream_protocol.usage import StreamUsage
+
+pytestmark = pytest.mark.asyncio
+
+FIRST_RUN = "run-11111111-2222-3333-4444-555555555555"
+SECOND_RUN = "run-66666666-7777-8888-9999-000000000000"
+
+
+async def _serialize(chunks, usage: StreamUsage) -> list[str]:
+    async def chunk_generator():
+        for chunk in chunks:
+            yield chunk
+
+    return [x async for x in serialize_to_data_stream_protocol(chunk_generator(), usage=usage)]
+
+
+async def test_usage_is_accumulated_across_chunks_and_steps():
+    chunks = [
+        AIMessageChunk(
+            content="",
+            id=FIRST_RUN,
+            usage_metadata={
+                "input_tokens": 1_000,
+                "output_tokens": 1,
+                "total_tokens": 1_001,
+                "input_token_details": {"cache_creation": 200, "cache_read": 600},
+            },
+        ),
+        AIMessageChunk(content=[{"text": "Hi", "type": "text", "index": 0}], id=FIRST_RUN),
+        AIMessageChunk(
+            content="",
+            id=FIRST_RUN,
+            response_metadata={"stop_reason": "end_turn"},
+            usage_metadata={"input_tokens": 0, "output_tokens": 41, "total_tokens": 41},
+        ),
+        AIMessageChunk(content="Again", id=SECOND_RUN),
+        AIMessageChunk(
+            content="",
+            id=SECOND_RUN,
+            response_metadata={"finish_reason": "stop"},
+            usage_metadata={
+                "input_tokens": 1_100,
+                "output_tokens": 8,
+                "total_tokens": 1_108,
+                "input_token_details": {"cache_read": 1_000},
+            },
+        ),
+    ]
+    usage = StreamUsage()
+
+    results = await _serialize(chunks, usage)
+
+    assert results == [
+        f'f:{{"messageId":"{FIRST_RUN}"}}\n',
+        '0:"Hi"\n',
+        'e:{"finishReason":"other","usage":{"promptTokens":1000,"completionTokens":42},"isContinued":false}\n',
+        f'f:{{"messageId":"{SECOND_RUN}"}}\n',
+        '0:"Again"\n',
+        'e:{"finishReason":"stop","usage":{"promptTokens":1100,"completionTokens":8},"isContinued":false}\n',
+    ]
+    assert usage.steps[FIRST_RUN]["output_tokens"] == 42
+    assert usage.prompt_tokens == 2_100
+    assert usage.completion_tokens == 50
+    assert usage.total_tokens == 2_150
+    assert usage.cache_read_tokens == 1_600
+    assert usage.cache_creation_tokens == 200
+    assert usage.cache_hit_ratio == pytest.approx(1_600 / 2_100)
+
+
+async def test_trailing_usage_chunk_is_written_in_the_finish_step_part():
+    # OpenAI reports usage in a last chunk sent after the one carrying the finish reason
+    chunks = [
+        AIMessageChunk(content="Hello", id=FIRST_RUN),
+        AIMessageChunk(content="", id=FIRST_RUN, response_metadata={"finish_reason": "stop"}),
+        AIMessageChunk(
+            content="",
+            id=FIRST_RUN,
+            usage_metadata={"input_tokens": 12, "output_tokens": 3, "total_tokens": 15},
+        ),
+    ]
+    usage = StreamUsage()
+
+    results = await _serialize(chunks, usage)
+
+    assert results[-1] == (
+        'e:{"finishReason":"stop","usage":{"promptTokens":12,"completionTokens":3},"isContinued":false}\n'
+    )
+    assert usage.total_tokens == 15
@@ -0,0 +1,167 @@
+import asyncio
+import json
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk, HumanMessage
+from langchain_core.outputs import ChatGenerationChunk
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.tools import tool
+
+from langchain_vercel_adapters.stream_protocol.events import (
+    serialize_events_to_data_stream_protocol,
+    serialize_events_to_data_stream_protocol_bytes,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Streams the next scripted list of chunks on each call."""
+
+    steps: list[list[AIMessageChunk]]
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise NotImplementedError
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        for chunk in self.steps.pop(0):
+            yield ChatGenerationChunk(message=chunk)
+
+
+@tool
+def weather(city: str) -> str:
+    """Returns the weather of a city."""
+    return f"Sunny in {city}"
+
+
+USAGE = {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15}
+
+
+def _graph(router: bool = False, trailing_usage: bool = False):
+    tool_call = {"name": "weather", "args": '{"city": "Bern"}', "id": "call_1", "index": 0}
+    steps = [
+        [
+            AIMessageChunk(content="", tool_call_chunks=[{**tool_call, "type": "tool_call_chunk"}]),
+            AIMessageChunk(content="", response_metadata={"finish_reason": "tool_calls"}),
+        ],
+        [
+            AIMessageChunk(content="Sunny"),
+            AIMessageChunk(content=" in Bern"),
+            AIMessageChunk(content="", response_metadata={"finish_reason": "stop"}),
+        ],
+    ]
+    if trailing_usage:
+        # sent after the stop reason, like OpenAI does with `stream_usage`
+        steps[0].append(AIMessageChunk(content="", usage_metadata=USAGE))
+    if router:
+        steps.insert(0, [AIMessageChunk(content="weather")])
+    model = ScriptedChatModel(steps=steps)
+
+    def node(name: str) -> RunnableConfig:
+        return {"metadata": {"langgraph_node": name}}
+
+    async def agent(messages, config: RunnableConfig):
+        if router:
+            await model.ainvoke(messages, node("router"))
+        message = await model.ainvoke(messages, node("agent"))
+        results = [
+            await weather.ainvoke({**call, "type": "tool_call"}, node("tools"))
+            for call in message.tool_calls
+        ]
+        return await model.ainvoke([*messages, message, *results], node("agent"))
+
+    return RunnableLambda(agent)
+
+
+async def test_chat_model_and_tool_events():
+    events = _graph().astream_events([HumanMessage(content="Weather?")], version="v2")
+
+    frames = [frame async for frame in serialize_events_to_data_stream_protocol(events)]
+
+    # the finish step part of the first run waits for its tool result
+    assert "".join(frame[0] for frame in frames) == "fbc9aef00e"
+    assert frames[4] == 'a:{"toolCallId":"call_1","result":"Sunny in Bern"}\n'
+    assert json.loads(frames[3][2:])["args"] == {"city": "Bern"}
+    # each chat model run is a step
+    assert json.loads(frames[0][2:])["messageId"] != json.loads(frames[6][2:])["messageId"]
+
+
+@pytest.mark.parametrize("trailing_usage", [False, True])
+async def test_interleaved_chat_model_and_tool_events(trailing_usage):
+    events = _graph(trailing_usage=trailing_usage).astream_events(
+        [HumanMessage(content="Weather?")], version="v2"
+    )
+
+    frames = [
+        frame async for frame in serialize_events_to_data_stream_protocol(events, interleaved=True)
+    ]
+
+    # like without `interleaved`, the tool result comes before the finish step part
+    assert "".join(frame[0] for frame in frames) == "fbc9aef00e"
+    assert frames[4] == 'a:{"toolCallId":"call_1","result":"Sunny in Bern"}\n'
+
+
+async def test_events_of_other_nodes_are_skipped():
+    events = _graph(router=True).astream_events([HumanMessage(content="Weather?")], version="v2")
+
+    frames = [
+        frame
+        async for frame in serialize_events_to_data_stream_protocol_bytes(
+            events, nodes={"agent", "tools"}
+        )
+    ]
+
+    assert b"".join(frame[:1] for frame in frames) == b"fbc9aef00e"
+    assert b'0:"weather"\n' not in frames
+
+
+async def test_trailing_usage_of_a_step_waiting_for_tool_results():
+    events = _graph(trailing_usage=True).astream_events(
+        [HumanMessage(content="Weather?")], version="v2"
+    )
+
+    frames = [frame async for frame in serialize_events_to_data_stream_protocol(events)]
+
+    assert "".join(frame[0] for frame in frames) == "fbc9aef00e"
+    assert json.loads(frames[5][2:])["usage"] == {"promptTokens": 10, "completionTokens": 5}
+
+
+async def test_finish_step_without_tool_results():
+    events = _graph().astream_events([HumanMessage(content="Weather?")], version="v2")
+
+    frames = [
+        frame async for frame in serialize_events_to_data_stream_protocol(events, nodes={"agent"})
+    ]
+
+    # no result arrives, the finish step part is written once the next run starts
+    assert "".join(frame[0] for frame in frames) == "fbc9ef00e"
+
+
+async def test_interleaved_chat_model_runs():
+    model = ScriptedChatModel(
+        steps=[
+            [AIMessageChunk(content=letter) for _ in range(20)]
+            + [AIMessageChunk(content="", response_metadata={"finish_reason": "stop"})]
+            for letter in "AB"
+        ]
+    )
+
+    async def branches(messages):
+        return await asyncio.gather(model.ainvoke(messages), model.ainvoke(messages))
+
+    events = RunnableLambda(branches).astream_events([HumanMessage(content="Hi")], version="v2")
+    frames = [
+        frame async for frame in serialize_events_to_data_stream_protocol(events, interleaved=True)
+    ]
+
+    # one step after the other, each with the text of its own run only
+    assert "".join(frame[0] for frame in frames) == ("f" + "0" * 20 + "e") * 2
+    assert {
+        "".join(json.loads(frame[2:]) for frame in frames[1:21]),
+        "".join(json.loads(frame[2:]) for frame in frames[23:43]),
+    } == {"A" * 20, "B" * 20}
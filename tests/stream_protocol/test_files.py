@@ -0,0 +1,89 @@
+import base64
+import random
+
+import pytest
+
+from langchain_vercel_adapters.stream_protocol.files import file_part, stream_file_part
+from langchain_vercel_adapters.stream_protocol.parser import DataStreamParser
+from langchain_vercel_adapters.types import DataStreamStringPrefixes, FileData
+
+pytestmark = pytest.mark.asyncio
+
+PAYLOAD = random.Random(0).randbytes(1_000_001)
+
+
+def _parse(data: bytes) -> FileData:
+    parser = DataStreamParser()
+    (part,) = parser.feed(data)
+    parser.close()
+    assert part.type == DataStreamStringPrefixes.FILE
+    return part.parse()
+
+
+async def _chunks(size: int):
+    for i in range(0, len(PAYLOAD), size):
+        yield PAYLOAD[i : i + size]
+
+
+@pytest.mark.parametrize("offload_threshold", [0, 10_000_000])
+async def test_bytes_are_encoded_in_blocks(offload_threshold):
+    chunks = [
+        chunk
+        async for chunk in stream_file_part(
+            PAYLOAD, "image/png", block_size=65_536, offload_threshold=offload_threshold
+        )
+    ]
+
+    assert max(len(chunk) for chunk in chunks) <= 65_535 // 3 * 4
+    assert len(chunks) == 2 + 16
+    assert b"\n" not in b"".join(chunks)[:-1]
+    file = _parse(b"".join(chunks))
+    assert file.mime_type == "image/png"
+    assert base64.b64decode(file.data) == PAYLOAD
+
+
+@pytest.mark.parametrize("offload_threshold", [0, 10_000_000])
+async def test_files_are_read_in_blocks(tmp_path, offload_threshold):
+    path = tmp_path / "chart.png"
+    path.write_bytes(PAYLOAD)
+
+    chunks = [
+        chunk
+        async for chunk in stream_file_part(
+            path, "image/png", block_size=65_536, offload_threshold=offload_threshold
+        )
+    ]
+
+    assert len(chunks) == 2 + 16
+    assert base64.b64decode(_parse(b"".join(chunks)).data) == PAYLOAD
+
+
+@pytest.mark.parametrize("size", [1, 1000, 100_000])
+async def test_async_iterators_are_regrouped(size):
+    data = await file_part(_chunks(size), "application/pdf")
+
+    assert data == base64.b64encode(PAYLOAD).join(
+        [b'k:{"data":"', b'","mimeType":"application/pdf"}\n']
+    )
+
+
+@pytest.mark.parametrize("offload_threshold", [0, 10_000_000])
+async def test_large_iterator_chunks_are_split(offload_threshold):
+    async def one_chunk():
+        yield PAYLOAD
+
+    chunks = [
+        chunk
+        async for chunk in stream_file_part(
+            one_chunk(), "image/png", block_size=65_536, offload_threshold=offload_threshold
+        )
+    ]
+
+    assert max(len(chunk) for chunk in chunks) <= 65_535 // 3 * 4
+    assert base64.b64decode(_parse(b"".join(chunks)).data) == PAYLOAD
+
+
+async def test_empty_file():
+    file = _parse(await file_part(b"", "text/plain"))
+
+    assert (file.data, file.mime_type) == ("", "text/plain")
@@ -0,0 +1,107 @@
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    serialize_to_data_stream_protocol,
+    serialize_to_data_stream_protocol_bytes,
+)
+from langchain_vercel_adapters.stream_protocol.parser import (
+    DataStreamParser,
+    parse_data_stream,
+)
+from langchain_vercel_adapters.types import (
+    DataStreamStringPrefixes,
+    FinishStep,
+    LanguageModelV1FinishReason,
+    StartStep,
+    ToolCallDelta,
+    ToolCallPart,
+    ToolCallStreamingStart,
+)
+
+pytestmark = pytest.mark.asyncio
+
+RUN_ID = "run-5e6f7a8b-9c0d-1e2f-3a4b-5c6d7e8f9a0b"
+
+
+async def _chunks():
+    for text in ["Hello", " héllo wörld 🚗", ' "quoted"\n']:
+        yield AIMessageChunk(content=text, id=RUN_ID)
+    for i, args in enumerate(['{"city": ', '"Zürich"}']):
+        yield AIMessageChunk(
+            content="",
+            id=RUN_ID,
+            tool_call_chunks=[
+                {
+                    "name": "Weather" if i == 0 else None,
+                    "args": args,
+                    "id": "call_1" if i == 0 else None,
+                    "index": 0,
+                    "type": "tool_call_chunk",
+                }
+            ],
+        )
+    yield AIMessageChunk(
+        content="",
+        id=RUN_ID,
+        response_metadata={"finish_reason": "tool_calls"},
+        usage_metadata={"input_tokens": 12, "output_tokens": 7, "total_tokens": 19},
+    )
+
+
+async def _stream() -> bytes:
+    return b"".join([x async for x in serialize_to_data_stream_protocol_bytes(_chunks())])
+
+
+async def test_parts_are_parsed_into_their_models():
+    parts = [
+        part.parse()
+        async for part in parse_data_stream(serialize_to_data_stream_protocol(_chunks()))
+    ]
+
+    assert parts[0] == StartStep(messageId=RUN_ID)
+    assert parts[1:4] == ["Hello", " héllo wörld 🚗", ' "quoted"\n']
+    assert parts[4] == ToolCallStreamingStart(toolCallId="call_1", toolName="Weather")
+    assert parts[5] == ToolCallDelta(toolCallId="call_1", argsTextDelta='{"city": ')
+    assert parts[7] == ToolCallPart(
+        toolCallId="call_1", toolName="Weather", args={"city": "Zürich"}
+    )
+    assert parts[8] == FinishStep(
+        isContinued=False,
+        finishReason=LanguageModelV1FinishReason.TOOL_CALLS,
+        usage={"promptTokens": 12, "completionTokens": 7},
+    )
+
+
+async def test_chunks_split_anywhere():
+    stream = await _stream()
+    expected = [bytes(part) for part in DataStreamParser().feed(stream)]
+    assert b"".join(expected) == stream
+
+    for size in [1, 2, 3, 7, 64]:
+        parser = DataStreamParser()
+        parts = [
+            bytes(part)
+            for i in range(0, len(stream), size)
+            for part in parser.feed(stream[i : i + size])
+        ]
+        parser.close()
+        assert parts == expected
+
+
+async def test_parts_are_views_of_the_chunk():
+    stream = await _stream()
+    part = next(iter(DataStreamParser().feed(stream)))
+
+    assert part.type is DataStreamStringPrefixes.START_STEP
+    assert part.payload.obj is stream
+
+
+async def test_invalid_parts():
+    with pytest.raises(ValueError, match="Invalid"):
+        list(DataStreamParser().feed(b"z:1\n"))
+
+    parser = DataStreamParser()
+    assert list(parser.feed(b'0:"unfinished')) == []
+    with pytest.raises(ValueError, match="middle of a part"):
+        parser.close()
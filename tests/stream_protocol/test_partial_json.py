@@ -0,0 +1,96 @@
+import json
+import random
+
+import pytest
+
+from langchain_vercel_adapters.stream_protocol.partial_json import PartialJSON
+
+DOCUMENTS = [
+    {
+        "path": "main.py",
+        "content": 'print("héllo")\n\t\\ 🚗',
+        "lines": [1, -2.5e3, 0.25, True, False, None],
+        "nested": {"a": [[], {}], "b": {"c": [{"d": "e"}]}},
+    },
+    [],
+    "🚗",
+    -12.5,
+    None,
+]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_any_split_parses_like_json_loads(document, ensure_ascii):
+    text = json.dumps(document, ensure_ascii=ensure_ascii, indent=1)
+    rng = random.Random(0)
+
+    for _ in range(100):
+        parser = PartialJSON()
+        i = 0
+        while i < len(text):
+            size = rng.randint(1, 8)
+            parser.feed(text[i : i + size])
+            i += size
+            _ = parser.value
+
+        assert parser.close() == document
+
+
+def test_partial_values():
+    parser = PartialJSON()
+    assert parser.value is None
+
+    parser.feed('{"path": "main')
+    assert parser.value == {"path": "main"}
+    parser.feed('.py", "size": 12')
+    # the number may still grow
+    assert parser.value == {"path": "main.py"}
+    parser.feed(', "tags": ["a", "b\\u00e')
+    assert parser.value == {"path": "main.py", "size": 12, "tags": ["a", "b"]}
+    parser.feed('9"]}')
+    assert parser.complete
+    assert parser.close() == {"path": "main.py", "size": 12, "tags": ["a", "bé"]}
+
+
+def test_unterminated_top_level_string():
+    parser = PartialJSON()
+    parser.feed('"abc')
+
+    assert parser.value == "abc"
+    assert not parser.complete
+    parser.feed('"')
+    assert parser.complete
+
+
+def test_surrogate_pairs_split_across_fragments():
+    parser = PartialJSON()
+    for fragment in ['"\\ud83d', "\\ude97", '\\ud83d"']:
+        parser.feed(fragment)
+
+    assert parser.close() == "🚗\ud83d"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"a":}',
+        '{"a" 1}',
+        "[1,]",
+        '{"a": 1,}',
+        '"a\nb"',
+        "tru",
+        '{"a": 1} x',
+        '"\\x"',
+        "[}",
+        "",
+        '"abc',
+        '"abc\\',
+    ],
+)
+def test_invalid_documents(text):
+    parser = PartialJSON()
+
+    with pytest.raises(ValueError):
+        parser.feed(text)
+        parser.close()
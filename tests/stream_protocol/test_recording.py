@@ -0,0 +1,161 @@
+import os
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    serialize_to_data_stream_protocol,
+    serialize_to_data_stream_protocol_bytes,
+)
+from langchain_vercel_adapters.stream_protocol.recording import (
+    DataStreamRecorder,
+    DataStreamRecording,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+def _run_id(i: int) -> str:
+    return f"run-7a8b9c0d-1e2f-3a4b-5c6d-7e8f9a0b1c{i:02d}"
+
+
+async def _upstream(run_id: str, tokens: int = 5, fail: bool = False):
+    for i in range(tokens):
+        yield AIMessageChunk(content=f" tökén{i}", id=run_id)
+    if fail:
+        raise RuntimeError("provider failed")
+    yield AIMessageChunk(
+        content="",
+        id=run_id,
+        tool_call_chunks=[
+            {
+                "name": "Search",
+                "args": '{"query": "🚗"}',
+                "id": "call_1",
+                "index": 0,
+                "type": "tool_call_chunk",
+            }
+        ],
+    )
+    yield AIMessageChunk(content="", id=run_id, response_metadata={"finish_reason": "tool_calls"})
+
+
+async def _record(recorder: DataStreamRecorder, run_id: str, **kwargs) -> list[bytes]:
+    return [
+        frame
+        async for frame in serialize_to_data_stream_protocol_bytes(
+            _upstream(run_id, **kwargs), recorder=recorder
+        )
+    ]
+
+
+async def test_replay_yields_the_serialized_parts(tmp_path):
+    path = tmp_path / "streams.lvds"
+    with DataStreamRecorder(path) as recorder:
+        live = [await _record(recorder, _run_id(i), tokens=i) for i in range(3)]
+        str_frames = [
+            frame
+            async for frame in serialize_to_data_stream_protocol(
+                _upstream(_run_id(3)), recorder=recorder
+            )
+        ]
+
+    with DataStreamRecording(path) as recording:
+        assert len(recording) == 4
+        for i, frames in enumerate(live):
+            assert list(recording.frames(_run_id(i))) == frames
+            assert [x async for x in recording.replay(i)] == frames
+        assert list(recording.frames(_run_id(3))) == [x.encode() for x in str_frames]
+
+    # a recording is about the size of the streams it holds
+    recorded = sum(len(frame) for frames in live for frame in frames)
+    assert os.path.getsize(path) < 2 * (recorded + len(b"".join(x.encode() for x in str_frames)))
+
+
+async def test_failed_streams_are_not_recorded(tmp_path):
+    path = tmp_path / "streams.lvds"
+    with DataStreamRecorder(path, timestamps=False) as recorder:
+        with pytest.raises(RuntimeError):
+            await _record(recorder, _run_id(0), fail=True)
+        await _record(recorder, _run_id(1))
+
+    with DataStreamRecording(path) as recording:
+        assert _run_id(0) not in recording
+        assert _run_id(1) in recording
+
+
+async def test_index_is_rebuilt_when_missing(tmp_path):
+    path = tmp_path / "streams.lvds"
+    with DataStreamRecorder(path) as recorder:
+        await _record(recorder, _run_id(0))
+    # appending to an existing recording
+    with DataStreamRecorder(path) as recorder:
+        frames = await _record(recorder, _run_id(1))
+
+    with DataStreamRecording(path) as recording:
+        indexed = recording.streams
+    os.remove(f"{path}.idx")
+    with DataStreamRecording(path) as recording:
+        assert recording.streams == indexed
+        assert list(recording.frames(_run_id(1))) == frames
+
+
+@pytest.mark.parametrize(
+    "damage",
+    [
+        # the entry of the last stream was never written
+        lambda index: index[: index.index(_run_id(1).encode()) - 1],
+        # the entry of the last stream was partially written
+        lambda index: index[:-2],
+        # entries that do not match the file
+        lambda index: index.replace(_run_id(0).encode(), _run_id(2).encode())[::-1],
+    ],
+)
+async def test_stale_index(tmp_path, damage):
+    path = tmp_path / "streams.lvds"
+    with DataStreamRecorder(path) as recorder:
+        first = await _record(recorder, _run_id(0))
+        second = await _record(recorder, _run_id(1))
+    with open(f"{path}.idx", "rb") as f:
+        index = f.read()
+    with open(f"{path}.idx", "wb") as f:
+        f.write(damage(index))
+
+    with DataStreamRecording(path) as recording:
+        assert [stream_id for stream_id, _, _ in recording.streams] == [_run_id(0), _run_id(1)]
+        assert list(recording.frames(_run_id(0))) == first
+        assert list(recording.frames(_run_id(1))) == second
+
+
+async def test_corrupted_recording(tmp_path):
+    path = tmp_path / "streams.lvds"
+    with DataStreamRecorder(path) as recorder:
+        await _record(recorder, _run_id(0))
+    os.remove(f"{path}.idx")
+    with open(path, "ab") as f:
+        f.write(b"garbage")
+
+    with pytest.raises(ValueError, match="corrupted"):
+        DataStreamRecording(path)
+
+
+async def test_close_while_replaying(tmp_path):
+    path = tmp_path / "streams.lvds"
+    with DataStreamRecorder(path) as recorder:
+        await _record(recorder, _run_id(0))
+
+    recording = DataStreamRecording(path)
+    frames = recording.frames(_run_id(0))
+    next(frames)
+    recording.close()
+
+    with pytest.raises(ValueError):
+        next(frames)
+
+
+async def test_timestamps_setting_must_match(tmp_path):
+    path = tmp_path / "streams.lvds"
+    DataStreamRecorder(path).close()
+
+    with pytest.raises(ValueError, match="timestamps"):
+        DataStreamRecorder(path, timestamps=False)
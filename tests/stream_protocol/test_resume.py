@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from langchain_vercel_adapters.stream_protocol.broadcast import FrameOffsetError
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    serialize_to_data_stream_protocol,
+)
+from langchain_vercel_adapters.stream_protocol.resume import ResumableStreams
+from tests.stream_protocol.conftest import RUN_ID, Upstream, collect
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_resume_mid_stream_by_message_id():
+    streams = ResumableStreams()
+    first = streams.record(serialize_to_data_stream_protocol(Upstream()()))
+
+    received = []
+    async for frame in first:
+        received.append(frame)
+        if len(received) == 5:
+            # the connection drops
+            break
+    await first.aclose()
+
+    assert RUN_ID in streams
+    rest = await collect(streams.resume(RUN_ID, len(received)))
+    full = await collect(streams.resume(RUN_ID))
+
+    assert received + rest == full
+    assert full[0].startswith("f:")
+    assert full[-1].startswith("e:")
+    await streams.aclose()
+
+
+async def test_resume_after_the_stream_finished_with_explicit_id():
+    streams = ResumableStreams()
+    frames = await collect(
+        streams.record(serialize_to_data_stream_protocol(Upstream()()), stream_id="chat-1")
+    )
+
+    assert await collect(streams.resume("chat-1", 3)) == frames[3:]
+    assert await collect(streams.resume("chat-1", len(frames))) == []
+    await streams.aclose()
+
+
+async def test_finished_streams_expire():
+    streams = ResumableStreams(ttl=0.01)
+    await collect(streams.record(serialize_to_data_stream_protocol(Upstream(2)()), "chat-1"))
+    assert "chat-1" in streams
+
+    await asyncio.sleep(0.02)
+
+    assert "chat-1" not in streams
+    assert RUN_ID not in streams
+    with pytest.raises(KeyError):
+        streams.resume("chat-1")
+
+
+async def test_oldest_finished_streams_are_evicted_first():
+    streams = ResumableStreams(max_streams=1)
+    await collect(streams.record(serialize_to_data_stream_protocol(Upstream(2)()), "chat-1"))
+    await collect(streams.record(serialize_to_data_stream_protocol(Upstream(2)()), "chat-2"))
+
+    assert "chat-1" not in streams
+    assert "chat-2" in streams
+    await streams.aclose()
+
+
+async def test_running_streams_count_against_max_streams():
+    streams = ResumableStreams(max_streams=1)
+    first = streams.record(serialize_to_data_stream_protocol(Upstream()()), "chat-1")
+    second = streams.record(serialize_to_data_stream_protocol(Upstream()()), "chat-2")
+
+    assert "chat-1" not in streams
+    assert "chat-2" in streams
+    # the evicted stream is still generated for its client
+    frames = await collect(first)
+    assert frames[-1].startswith("e:")
+    await collect(second)
+    assert "chat-1" not in streams
+    await streams.aclose()
+
+
+async def test_offset_no_longer_retained():
+    streams = ResumableStreams(max_frames=4)
+    frames = await collect(
+        streams.record(serialize_to_data_stream_protocol(Upstream()()), "chat-1")
+    )
+
+    assert await collect(streams.resume("chat-1", len(frames) - 4)) == frames[-4:]
+    with pytest.raises(FrameOffsetError):
+        await collect(streams.resume("chat-1", 1))
+    await streams.aclose()
@@ -0,0 +1,188 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+from langchain_core.tools import tool
+
+from langchain_vercel_adapters.stream_protocol.data_stream import (
+    serialize_to_data_stream_protocol,
+    serialize_to_data_stream_protocol_bytes,
+)
+from langchain_vercel_adapters.stream_protocol.tools import execute_tool_calls
+from tests.stream_protocol.conftest import collect
+
+pytestmark = pytest.mark.asyncio
+
+RUN_ID = "run-5e6f7a8b-9c0d-1e2f-3a4b-5c6d7e8f9a0b"
+
+
+async def _tool_calls(*calls: tuple[str, str, dict], between=None):
+    yield AIMessageChunk(content="", id=RUN_ID)
+    for index, (id, name, args) in enumerate(calls):
+        yield AIMessageChunk(
+            content="",
+            id=RUN_ID,
+            tool_call_chunks=[
+                {
+                    "name": name,
+                    "args": json.dumps(args),
+                    "id": id,
+                    "index": index,
+                    "type": "tool_call_chunk",
+                }
+            ],
+        )
+        if between is not None:
+            await between(index)
+    yield AIMessageChunk(content="", id=RUN_ID, response_metadata={"finish_reason": "tool_calls"})
+
+
+async def sleep(seconds: float) -> str:
+    await asyncio.sleep(seconds)
+    return f"slept {seconds}"
+
+
+@tool
+def weather(city: str) -> str:
+    """Returns the weather of a city."""
+    if city == "Atlantis":
+        raise ValueError("unknown city")
+    return f"Sunny in {city}"
+
+
+def _prefixes(frames: list[str]) -> list[str]:
+    return [frame[:2] for frame in frames]
+
+
+async def test_results_are_streamed_in_completion_order():
+    # every tool only returns once the next one returned, which requires them to run concurrently
+    returned = {id: asyncio.Event() for id in ("call_1", "call_2")}
+    unblocked = threading.Event()
+
+    async def first() -> str:
+        await returned["call_2"].wait()
+        return "first"
+
+    def second() -> dict:
+        unblocked.wait(timeout=5)
+        return {"thread": threading.current_thread() is not threading.main_thread()}
+
+    async def third() -> str:
+        unblocked.set()
+        return "third"
+
+    def on_result(message):
+        if message.tool_call_id in returned:
+            returned[message.tool_call_id].set()
+
+    stream = _tool_calls(("call_1", "first", {}), ("call_2", "second", {}), ("call_3", "third", {}))
+
+    frames = await collect(
+        execute_tool_calls(
+            serialize_to_data_stream_protocol(stream), [first, second, third], on_result=on_result
+        )
+    )
+
+    assert _prefixes(frames)[-4:] == ["a:", "a:", "a:", "e:"]
+    results = [json.loads(frame[2:]) for frame in frames[-4:-1]]
+    assert results == [
+        {"toolCallId": "call_3", "result": "third"},
+        {"toolCallId": "call_2", "result": {"thread": True}},
+        {"toolCallId": "call_1", "result": "first"},
+    ]
+
+
+async def test_tools_start_while_the_llm_is_streaming():
+    returned = asyncio.Event()
+
+    async def between(index: int) -> None:
+        # the LLM only finishes once the first tool returned
+        if index == 1:
+            await returned.wait()
+
+    stream = _tool_calls(
+        ("call_1", "sleep", {"seconds": 0}),
+        ("call_2", "sleep", {"seconds": 0}),
+        between=between,
+    )
+
+    frames = await collect(
+        execute_tool_calls(
+            serialize_to_data_stream_protocol_bytes(stream),
+            [sleep],
+            on_result=lambda message: returned.set(),
+        )
+    )
+
+    # a tool call is complete once the next one starts, its result arrives before the next one
+    # is complete
+    prefixes = _prefixes(frames)
+    first_call = prefixes.index(b"9:")
+    assert first_call < prefixes.index(b"a:") < prefixes.index(b"9:", first_call + 1)
+    assert prefixes.count(b"a:") == 2
+    assert prefixes[-1] == b"e:"
+
+
+async def test_errors_unknown_tools_and_on_result():
+    stream = _tool_calls(
+        ("call_1", "weather", {"city": "Zürich"}),
+        ("call_2", "weather", {"city": "Atlantis"}),
+        ("call_3", "ask_user", {"question": "Which city?"}),
+    )
+    messages = []
+
+    frames = [
+        frame
+        async for frame in execute_tool_calls(
+            serialize_to_data_stream_protocol(stream),
+            [weather],
+            max_concurrency=1,
+            on_result=messages.append,
+        )
+    ]
+
+    assert _prefixes(frames).count("a:") == 2
+    assert [(x.tool_call_id, x.status) for x in messages] == [
+        ("call_1", "success"),
+        ("call_2", "error"),
+    ]
+    assert messages[0].content == "Sunny in Zürich"
+    assert messages[1].content == "Error: ValueError('unknown city')"
+
+
+async def test_errors_can_fail_the_stream():
+    stream = _tool_calls(("call_1", "weather", {"city": "Atlantis"}))
+
+    with pytest.raises(ValueError, match="unknown city"):
+        async for _ in execute_tool_calls(
+            serialize_to_data_stream_protocol(stream), [weather], handle_errors=False
+        ):
+            pass
+
+
+async def test_closing_the_stream_waits_for_cancelled_tools():
+    started = asyncio.Event()
+    cleaned_up = []
+
+    async def slow() -> str:
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        finally:
+            await asyncio.sleep(0.01)
+            cleaned_up.append(True)
+        return "done"
+
+    frames = execute_tool_calls(
+        serialize_to_data_stream_protocol(_tool_calls(("call_1", "slow", {}))), [slow]
+    )
+    # the finish step part waits for the tool, cancel the stream while it does
+    read = asyncio.ensure_future(collect(frames))
+    await started.wait()
+    read.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await read
+
+    assert cleaned_up == [True]
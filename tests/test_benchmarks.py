@@ -0,0 +1,15 @@
+import pytest
+
+from benchmarks.streams import SCENARIOS, SIZES
+from benchmarks.suite import run_scenario
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+async def test_benchmark_scenarios_serialize(scenario: str):
+    result = await run_scenario(scenario, "bytes", SIZES["small"], repeat=1)
+
+    assert result["frames"] > 0
+    assert result["bytes"] > 0
+    assert result["chunk_latency_us"]["p99"] >= result["chunk_latency_us"]["p50"]